@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Batch Chart Rendering for Stock Analysis
+
+Renders the same chart type for many symbols from one pre-built figure
+template per chart type. The figure, axes, grid, legend, titles and theme
+styling are created once; for each symbol only the data of the lines,
+candles and bars is swapped and the axis limits are updated. The layout
+is fixed (no tight_layout or tight bounding box per figure), which makes
+galleries of thousands of symbols much cheaper than StockVisualizer.
+
+Usage:
+    python batch_render.py --input-dir indicators/ --output charts/
+    python batch_render.py --input-dir indicators/ --charts kline_ma,macd --theme dark
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+from panel import load_universe
+from visualize import (CHART_TYPES, DOWNSAMPLE_THRESHOLD, ChartManifest,
+                       StockVisualizer)
+
+# Chart type -> figure template. Each panel lists what it draws:
+#   candles: 'wicks' (wicks and bodies) or 'bodies'
+#   lines:   (column, label, style) tuples
+#   bars:    (column, colour key or None for up/down by sign, bucket aggregation)
+#   hlines:  (y, colour key, alpha, label) reference lines
+#   spans:   (ymin, ymax, colour key) shaded zones
+# Colour keys refer to the visualizer's theme colours ('up', 'down', 'grid').
+TEMPLATES = {
+    'kline_ma': {
+        'min_bars': 10,
+        'height_scale': 2,
+        'grid': {'nrows': 2, 'ncols': 1, 'height_ratios': [3, 1], 'hspace': 0.15},
+        'panels': [
+            {'slot': (0, 0), 'title': 'K-Line with Moving Averages', 'ylabel': 'Price',
+             'candles': 'wicks',
+             'lines': [('MA5', 'MA5', {'color': '#ff6b6b', 'alpha': 0.8}),
+                       ('MA10', 'MA10', {'color': '#4ecdc4', 'alpha': 0.8}),
+                       ('MA20', 'MA20', {'color': '#f1c40f', 'alpha': 0.8}),
+                       ('MA60', 'MA60', {'color': '#3498db', 'alpha': 0.8})]},
+            {'slot': (1, 0), 'ylabel': 'Volume', 'bars': ('volume', 'up', 'max')},
+        ],
+    },
+    'macd': {
+        'min_bars': 12,
+        'height_scale': 1,
+        'panels': [
+            {'slot': (0, 0), 'title': 'MACD (12, 26, 9)', 'ylabel': 'MACD',
+             'lines': [('MACD_DIF', 'DIF', {'color': '#ff6b6b'}),
+                       ('MACD_DEA', 'DEA', {'color': '#4ecdc4'})],
+             'bars': ('MACD_BAR', None, 'extreme'),
+             'hlines': [(0, 'grid', 0.5, None)]},
+        ],
+    },
+    'kdj': {
+        'min_bars': 9,
+        'height_scale': 1,
+        'panels': [
+            {'slot': (0, 0), 'title': 'KDJ (9, 3, 3)', 'ylabel': 'KDJ',
+             'lines': [('KDJ_K', 'K', {'color': '#f1c40f'}),
+                       ('KDJ_D', 'D', {'color': '#3498db'}),
+                       ('KDJ_J', 'J', {'color': '#e74c3c'})],
+             'hlines': [(80, 'down', 0.3, 'Overbought (80)'),
+                        (20, 'up', 0.3, 'Oversold (20)')]},
+        ],
+    },
+    'rsi': {
+        'min_bars': 6,
+        'height_scale': 1,
+        'panels': [
+            {'slot': (0, 0), 'title': 'RSI (6, 12, 24)', 'ylabel': 'RSI', 'ylim': (0, 100),
+             'lines': [('RSI6', 'RSI6', {'color': '#f1c40f', 'alpha': 0.7}),
+                       ('RSI12', 'RSI12', {'color': '#3498db'}),
+                       ('RSI24', 'RSI24', {'color': '#00aa00', 'alpha': 0.7})],
+             'spans': [(70, 100, 'down'), (0, 30, 'up')],
+             'hlines': [(70, 'down', 0.3, 'Overbought (70)'),
+                        (30, 'up', 0.3, 'Oversold (30)')]},
+        ],
+    },
+    'boll': {
+        'min_bars': 20,
+        'height_scale': 2,
+        'grid': {'nrows': 2, 'ncols': 1, 'height_ratios': [3, 1], 'hspace': 0.15},
+        'panels': [
+            {'slot': (0, 0), 'title': 'K-Line with Bollinger Bands (20, 2)', 'ylabel': 'Price',
+             'candles': 'bodies',
+             'lines': [('BOLL_UPPER', 'BOLL Upper', {'color': '#e74c3c', 'alpha': 0.6}),
+                       ('BOLL_MID', 'BOLL Mid', {'color': '#3498db', 'alpha': 0.6}),
+                       ('BOLL_LOWER', 'BOLL Lower', {'color': '#00aa00', 'alpha': 0.6})]},
+            {'slot': (1, 0), 'ylabel': 'Volume', 'bars': ('volume', 'up', 'max')},
+        ],
+    },
+    'composite': {
+        'min_bars': 30,
+        'height_scale': 2,
+        'fontsize': 8,
+        'grid': {'nrows': 3, 'ncols': 2, 'hspace': 0.3, 'wspace': 0.2},
+        'panels': [
+            {'slot': (0, slice(None)), 'title': 'K-Line with MA', 'candles': 'bodies',
+             'lines': [('MA20', 'MA20', {'color': '#f1c40f'}),
+                       ('MA60', 'MA60', {'color': '#3498db'})]},
+            {'slot': (1, 0), 'title': 'MACD',
+             'lines': [('MACD_DIF', 'DIF', {'color': '#ff6b6b'}),
+                       ('MACD_DEA', 'DEA', {'color': '#4ecdc4'})],
+             'hlines': [(0, 'grid', 0.5, None)]},
+            {'slot': (1, 1), 'title': 'KDJ',
+             'lines': [('KDJ_K', 'K', {'color': '#f1c40f'}),
+                       ('KDJ_J', 'J', {'color': '#e74c3c'})],
+             'hlines': [(80, 'down', 0.3, None), (20, 'up', 0.3, None)]},
+            {'slot': (2, 0), 'title': 'RSI', 'ylim': (0, 100),
+             'lines': [('RSI12', 'RSI12', {'color': '#3498db'})],
+             'spans': [(70, 100, 'down'), (0, 30, 'up')],
+             'hlines': [(70, 'down', 0.3, None), (30, 'up', 0.3, None)]},
+            {'slot': (2, 1), 'title': 'Volume', 'bars': ('volume', 'up', 'max')},
+        ],
+    },
+}
+
+# Fixed figure margins (fractions of the figure), by figure height scale
+MARGINS = {
+    1: {'left': 0.07, 'right': 0.98, 'bottom': 0.08, 'top': 0.93},
+    2: {'left': 0.07, 'right': 0.98, 'bottom': 0.04, 'top': 0.965},
+}
+
+
+class BatchRenderer:
+    """Render one chart type for many symbols by reusing a styled figure."""
+
+    def __init__(self, visualizer: StockVisualizer, chart_type: str):
+        """Build the figure template for chart_type in the visualizer's theme."""
+        if chart_type not in TEMPLATES:
+            raise ValueError(f"Unknown chart type: {chart_type}")
+
+        self.visualizer = visualizer
+        self.chart_type = chart_type
+        self.template = TEMPLATES[chart_type]
+        self.panels = []
+        self._build()
+
+    def _color(self, key: str) -> str:
+        """Resolve a theme colour key ('up', 'down', 'grid')."""
+        return getattr(self.visualizer, f'{key}_color')
+
+    def _build(self):
+        """Create the figure, axes, artists and styling once."""
+        vis = self.visualizer
+        template = self.template
+        fontsize = template.get('fontsize')
+
+        self.fig = vis._new_figure(height_scale=template['height_scale'])
+        grid = dict(template.get('grid', {'nrows': 1, 'ncols': 1}))
+        grid.update(MARGINS[template['height_scale']])
+        gs = self.fig.add_gridspec(**grid)
+
+        for spec in template['panels']:
+            ax = self.fig.add_subplot(gs[spec['slot']])
+            panel = {'spec': spec, 'ax': ax, 'lines': [], 'wicks': None,
+                     'bodies': None, 'bars': None}
+
+            for ymin, ymax, key in spec.get('spans', []):
+                ax.axhspan(ymin=ymin, ymax=ymax, color=self._color(key), alpha=0.1)
+
+            if spec.get('candles'):
+                if spec['candles'] == 'wicks':
+                    panel['wicks'] = LineCollection([], linewidths=1)
+                    ax.add_collection(panel['wicks'], autolim=False)
+                panel['bodies'] = PolyCollection([], edgecolors='none', alpha=0.8)
+                ax.add_collection(panel['bodies'], autolim=False)
+
+            for column, label, style in spec.get('lines', []):
+                line, = ax.plot([], [], label=label, linewidth=1.5, **style)
+                panel['lines'].append((column, line))
+
+            if spec.get('bars'):
+                panel['bars'] = PolyCollection([], edgecolors='none', alpha=0.5)
+                ax.add_collection(panel['bars'], autolim=False)
+
+            for y, key, alpha, label in spec.get('hlines', []):
+                ax.axhline(y=y, color=self._color(key), linestyle='--', alpha=alpha,
+                           label=label)
+
+            if spec.get('title'):
+                ax.set_title(spec['title'], color=vis.text_color)
+            if spec.get('ylabel'):
+                ax.set_ylabel(spec['ylabel'], color=vis.text_color)
+            if panel['lines']:
+                ax.legend(loc='upper left', fontsize=fontsize)
+            ax.grid(True, color=vis.grid_color, alpha=0.3)
+            ax.tick_params(colors=vis.text_color, labelsize=fontsize)
+            ax.xaxis_date()
+            if grid['ncols'] > 1 and not isinstance(spec['slot'][1], slice):
+                # Half-width panels: fewer date ticks so the labels don't collide
+                locator = mdates.AutoDateLocator(minticks=3, maxticks=6)
+                ax.xaxis.set_major_locator(locator)
+                ax.xaxis.set_major_formatter(mdates.AutoDateFormatter(locator))
+
+            self.panels.append(panel)
+
+    def _update_panel(self, panel: dict, df):
+        """Swap one panel's artist data for df and rescale its axes."""
+        vis = self.visualizer
+        spec = panel['spec']
+        ax = panel['ax']
+        x_values, y_values = [], []
+        zero_based = False
+
+        if panel['bodies'] is not None:
+            segments, verts, colors = vis._candle_geometry(df)
+            if panel['wicks'] is not None:
+                panel['wicks'].set_segments(segments)
+                panel['wicks'].set_color(colors)
+            panel['bodies'].set_verts(verts)
+            panel['bodies'].set_facecolor(colors)
+            x_values.append(verts[..., 0])
+            y_values.append(segments[..., 1] if panel['wicks'] is not None else verts[..., 1])
+
+        for column, line in panel['lines']:
+            dates, values = vis._line_points(df, column)
+            x = mdates.date2num(dates)
+            line.set_data(x, values)
+            x_values.append(x)
+            y_values.append(values)
+
+        if panel['bars'] is not None:
+            column, color_key, how = spec['bars']
+            colors = self._color(color_key) if color_key else None
+            verts, colors = vis._bar_geometry(df, column, colors, how=how)
+            panel['bars'].set_verts(verts)
+            panel['bars'].set_facecolor(colors)
+            x_values.append(verts[..., 0])
+            y_values.append(verts[..., 1])
+            zero_based = True
+
+        ax.set_xlim(*_padded_limits(x_values))
+        if spec.get('ylim'):
+            ax.set_ylim(*spec['ylim'])
+        else:
+            ax.set_ylim(*_padded_limits(y_values, sticky_zero=zero_based))
+
+    def render(self, df, output_path: str) -> str:
+        """
+        Draw df into the template and save it.
+
+        Returns: output_path, or None if df has too few rows for the chart
+        """
+        if len(df) < self.template['min_bars']:
+            return None
+
+        for panel in self.panels:
+            self._update_panel(panel, df)
+
+        self.fig.savefig(output_path, facecolor=self.visualizer.bg_color, dpi=150)
+        return output_path
+
+
+def _padded_limits(arrays: list, margin: float = 0.05, sticky_zero: bool = False) -> tuple:
+    """
+    Axis limits spanning all finite values plus matplotlib's default margin.
+
+    With sticky_zero (bar charts) a limit of exactly 0 is not padded, like
+    the sticky edge of ax.bar().
+    """
+    values = np.concatenate([np.ravel(a) for a in arrays]) if arrays else np.array([])
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return 0.0, 1.0
+
+    lo, hi = float(values.min()), float(values.max())
+    if sticky_zero:
+        lo, hi = min(lo, 0.0), max(hi, 0.0)
+    pad = (hi - lo) * margin or 0.5
+    new_lo = lo if sticky_zero and lo == 0 else lo - pad
+    new_hi = hi if sticky_zero and hi == 0 else hi + pad
+    return new_lo, new_hi
+
+
+def render_universe(universe: dict, chart_types: list, output_dir: str,
+                    visualizer: StockVisualizer, force: bool = False) -> dict:
+    """
+    Render chart_types for every symbol into output_dir/<symbol>/.
+
+    Charts that are unchanged according to each symbol directory's chart
+    manifest are skipped unless force is set.
+
+    Returns:
+        Dictionary with 'rendered', 'skipped' and 'failed' counts
+    """
+    settings = {
+        'theme': visualizer.theme,
+        'width': visualizer.width,
+        'height': visualizer.height,
+        'downsample_threshold': visualizer.downsample_threshold,
+        'renderer': 'batch',
+    }
+    renderers = {chart_type: BatchRenderer(visualizer, chart_type)
+                 for chart_type in chart_types}
+    summary = {'rendered': 0, 'skipped': 0, 'failed': 0}
+
+    for symbol, df in universe.items():
+        symbol_dir = os.path.join(output_dir, symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        manifest = ChartManifest(symbol_dir)
+
+        for chart_type, renderer in renderers.items():
+            fingerprint = ChartManifest.fingerprint(df, chart_type, settings)
+            if not force and manifest.is_current(chart_type, fingerprint):
+                summary['skipped'] += 1
+                continue
+
+            output_path = os.path.join(symbol_dir, CHART_TYPES[chart_type][1])
+            try:
+                path = renderer.render(df, output_path)
+            except Exception as e:
+                print(f"❌ Error generating {chart_type} for {symbol}: {e}")
+                path = None
+
+            if path is None:
+                summary['failed'] += 1
+                continue
+
+            manifest.record(chart_type, fingerprint)
+            summary['rendered'] += 1
+
+        manifest.save()
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render charts for a whole universe of symbols",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of indicator CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='charts',
+        help='Output directory; charts go to <output>/<symbol>/ (default: charts/)'
+    )
+
+    parser.add_argument(
+        '--charts',
+        type=str,
+        default='all',
+        help='Comma-separated list of charts (default: all)'
+    )
+
+    parser.add_argument(
+        '--theme',
+        type=str,
+        default='light',
+        choices=['light', 'dark'],
+        help='Chart theme (default: light)'
+    )
+
+    parser.add_argument(
+        '--width',
+        type=int,
+        default=1200,
+        help='Chart width in pixels (default: 1200)'
+    )
+
+    parser.add_argument(
+        '--height',
+        type=int,
+        default=600,
+        help='Chart height in pixels (default: 600)'
+    )
+
+    parser.add_argument(
+        '--downsample',
+        type=int,
+        default=DOWNSAMPLE_THRESHOLD,
+        help=f'Downsample charts with more bars than this, 0 to disable '
+             f'(default: {DOWNSAMPLE_THRESHOLD})'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Redraw all charts, even those that are already up to date'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    if args.charts == 'all':
+        charts = list(TEMPLATES)
+    else:
+        charts = [c.strip() for c in args.charts.split(',')]
+        unknown = [c for c in charts if c not in TEMPLATES]
+        if unknown:
+            print(f"❌ Error: Unknown chart type(s): {', '.join(unknown)}")
+            sys.exit(1)
+
+    print(f"📥 Loading universe from {args.input_dir}")
+    universe = load_universe(args.input_dir)
+    if not universe:
+        print("❌ Error: No data files found")
+        sys.exit(1)
+    print(f"✅ Loaded {len(universe)} symbols")
+
+    visualizer = StockVisualizer(
+        theme=args.theme,
+        width=args.width,
+        height=args.height,
+        downsample_threshold=args.downsample
+    )
+
+    start = time.perf_counter()
+    summary = render_universe(universe, charts, args.output, visualizer, force=args.force)
+    elapsed = time.perf_counter() - start
+
+    print("\n✅ Batch rendering complete!")
+    print(f"   Output directory: {args.output}")
+    print(f"   Charts rendered: {summary['rendered']} ({elapsed:.1f}s)")
+    if summary['skipped']:
+        print(f"   Charts up to date: {summary['skipped']} (use --force to redraw)")
+    if summary['failed']:
+        print(f"   Charts failed or skipped for too little data: {summary['failed']}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for Stock Analysis
+
+Times every stage of the pipeline on synthetic OHLCV data of increasing
+length: fetch_stock_data against a local AkShare stand-in, each
+calculate_* indicator function, the incremental indicator states of
+streaming.py (one bar at a time), StockScorer, and each StockVisualizer
+plot_* method (with every bar drawn and with the default downsampling).
+Results can be saved as JSON and compared against an earlier run.
+
+The startup suite checks that `--help` and argument errors of the CLI
+scripts exit as argparse does (0 with the usage, 2) and stay within
+STARTUP_BUDGET; the exit status is 1 if they do not.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --bars 250,2500,10000 --repeat 3 --output benchmark.json
+    python benchmark.py --suites indicators,scoring --compare benchmark.json
+    python benchmark.py --suites startup
+"""
+
+import argparse
+import contextlib
+import inspect
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from indicators import calculate_all_indicators
+from synthetic import local_akshare, make_ohlcv
+
+SUITES = ['startup', 'fetch', 'indicators', 'incremental', 'scoring', 'render']
+
+# Scripts whose --help and argument errors must return within STARTUP_BUDGET
+STARTUP_SCRIPTS = ['fetch_data.py', 'indicators.py', 'scoring.py', 'visualize.py']
+
+# Seconds
+STARTUP_BUDGET = 0.1
+
+
+def _best_time(func, repeat: int, setup=None) -> float:
+    """Best wall time of repeat calls of func(setup()), with output silenced."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            args = (setup(),) if setup else ()
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _record(results: list, suite: str, name: str, bars: int, seconds: float, **extra):
+    results.append({'suite': suite, 'name': name, 'bars': bars,
+                    'seconds': round(seconds, 5), **extra})
+    size = f"{bars:>7,} bars" if bars is not None else ' ' * 12
+    print(f"  {name:<28} {size}  {extra.get('mode', ''):<12} {seconds:9.4f}s")
+
+
+def benchmark_startup(bar_counts: list, repeat: int = 1) -> list:
+    """
+    Time `--help` and an invalid argument of each CLI script in a fresh
+    interpreter (best of at least 3 runs), against STARTUP_BUDGET.
+
+    A run only passes if it also behaves: `--help` must exit 0 and print
+    the usage, an invalid argument must exit 2 (argparse's usage error),
+    so a script that crashes on import cannot pass as fast.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    cases = (('--help', ['--help'], 0, 'stdout'), ('bad argument', ['--no-such-option'], 2, 'stderr'))
+    results = []
+    for script in STARTUP_SCRIPTS:
+        for case, argv, expected_code, usage_stream in cases:
+            timings = []
+            failure = None
+            for _ in range(max(3, repeat)):
+                start = time.perf_counter()
+                process = subprocess.run([sys.executable, os.path.join(script_dir, script), *argv],
+                                         capture_output=True, text=True)
+                timings.append(time.perf_counter() - start)
+                if process.returncode != expected_code:
+                    failure = f"exit status {process.returncode}, expected {expected_code}"
+                elif 'usage:' not in getattr(process, usage_stream):
+                    failure = f"no usage in {usage_stream}"
+
+            seconds = min(timings)
+            _record(results, 'startup', f'{script} {case}', None, seconds,
+                    over_budget=seconds > STARTUP_BUDGET, failed=failure is not None)
+            if failure:
+                print(f"  ❌ {failure}")
+            elif seconds > STARTUP_BUDGET:
+                print(f"  ⚠️  Over the {STARTUP_BUDGET * 1000:.0f} ms startup budget")
+    return results
+
+
+def benchmark_fetch(bar_counts: list, repeat: int = 1) -> list:
+    """Time fetch_stock_data against the local AkShare stand-in."""
+    from fetch_data import fetch_stock_data
+
+    results = []
+    for bars in bar_counts:
+        universe = {'600000': make_ohlcv(bars)}
+        last_date = universe['600000']['date'].iloc[-1].strftime('%Y%m%d')
+        with local_akshare(universe):
+            seconds = _best_time(
+                lambda: fetch_stock_data('600000', start_date='20000101',
+                                         end_date=last_date),
+                repeat)
+        _record(results, 'fetch', 'fetch_stock_data', bars, seconds)
+    return results
+
+
+def benchmark_indicators(bar_counts: list, repeat: int = 1) -> list:
+    """Time every calculate_* function of indicators.py on a fresh copy of the data."""
+    functions = [(name, func) for name, func in inspect.getmembers(indicators, inspect.isfunction)
+                 if name.startswith('calculate_') and func.__module__ == indicators.__name__]
+
+    results = []
+    for bars in bar_counts:
+        raw = make_ohlcv(bars)
+        for name, func in functions:
+            seconds = _best_time(func, repeat, setup=raw.copy)
+            _record(results, 'indicators', name, bars, seconds)
+    return results
+
+
+def benchmark_incremental(bar_counts: list, repeat: int = 1) -> list:
+    """
+    Time the incremental indicator states of streaming.py, fed one bar at a
+    time over the whole history; results carry the cost per bar.
+    """
+    from streaming import (AverageTrueRange, Bar, DirectionalMovement,
+                           IncrementalIndicators, ParabolicSAR)
+
+    states = {
+        'AverageTrueRange': (AverageTrueRange, lambda state, bar: state.push(bar.high, bar.low, bar.close)),
+        'DirectionalMovement': (DirectionalMovement, lambda state, bar: state.push(bar.high, bar.low, bar.close)),
+        'ParabolicSAR': (ParabolicSAR, lambda state, bar: state.push(bar.high, bar.low)),
+        'IncrementalIndicators': (IncrementalIndicators, lambda state, bar: state.update(bar)),
+    }
+
+    results = []
+    for bars in bar_counts:
+        raw = make_ohlcv(bars)
+        stream = [Bar('600000', None, *values) for values in
+                  raw[['open', 'high', 'low', 'close', 'volume']].itertuples(index=False)]
+        for name, (factory, push) in states.items():
+            def run(state):
+                for bar in stream:
+                    push(state, bar)
+
+            seconds = _best_time(run, repeat, setup=factory)
+            _record(results, 'incremental', name, bars, seconds,
+                    per_bar_us=round(seconds / bars * 1e6, 2))
+    return results
+
+
+def benchmark_scoring(bar_counts: list, repeat: int = 1) -> list:
+    """Time StockScorer.calculate_total_score on full indicator data."""
+    from scoring import StockScorer
+
+    scorer = StockScorer()
+    results = []
+    for bars in bar_counts:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = calculate_all_indicators(make_ohlcv(bars))
+        seconds = _best_time(lambda: scorer.calculate_total_score(df), repeat)
+        _record(results, 'scoring', 'calculate_total_score', bars, seconds)
+    return results
+
+
+def benchmark_render(bar_counts: list, repeat: int = 1) -> list:
+    """
+    Time every StockVisualizer.plot_* method for each bar count, with every
+    bar drawn and with the visualizer's default downsampling.
+
+    Returns:
+        List of result dicts (best of `repeat` runs); render results carry
+        the downsample threshold used
+    """
+    from visualize import DOWNSAMPLE_THRESHOLD, StockVisualizer
+
+    methods = sorted(name for name in dir(StockVisualizer) if name.startswith('plot_'))
+    modes = [(None, 'full'), (DOWNSAMPLE_THRESHOLD, 'downsampled')]
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, 'chart.png')
+        for bars in bar_counts:
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = calculate_all_indicators(make_ohlcv(bars))
+
+            for threshold, label in modes:
+                if threshold is not None and bars <= threshold:
+                    continue
+
+                visualizer = StockVisualizer(downsample_threshold=threshold)
+                for method in methods:
+                    plot = getattr(visualizer, method)
+                    seconds = _best_time(lambda: plot(df, output_path), repeat)
+                    _record(results, 'render', method, bars, seconds,
+                            downsample=threshold, mode=label)
+
+    return results
+
+
+BENCHMARKS = {
+    'startup': benchmark_startup,
+    'fetch': benchmark_fetch,
+    'indicators': benchmark_indicators,
+    'incremental': benchmark_incremental,
+    'scoring': benchmark_scoring,
+    'render': benchmark_render,
+}
+
+
+def environment() -> dict:
+    """Library versions and platform of this run."""
+    import matplotlib
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def _result_key(result: dict) -> tuple:
+    return (result['suite'], result['name'], result['bars'], result.get('downsample'))
+
+
+def compare_results(results: list, baseline: list):
+    """Print each timing next to the matching one of a baseline run."""
+    previous = {_result_key(r): r['seconds'] for r in baseline}
+
+    print("\n📊 Comparison with baseline (new / old):")
+    for result in results:
+        old = previous.get(_result_key(result))
+        if old is None:
+            continue
+        ratio = result['seconds'] / old if old else float('inf')
+        marker = '⚠️ ' if ratio > 1.2 else '  '
+        size = f"{result['bars']:>7,} bars" if result['bars'] is not None else ' ' * 12
+        print(f"{marker}{result['suite']:<11} {result['name']:<28} {size}  "
+              f"{old:9.4f}s -> {result['seconds']:9.4f}s  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the stock analysis pipeline",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--bars',
+        type=str,
+        default='250,2500,10000',
+        help='Comma-separated bar counts (default: 250,2500,10000)'
+    )
+
+    parser.add_argument(
+        '--suites',
+        type=str,
+        default='all',
+        help=f"Comma-separated suites: {','.join(SUITES)} (default: all)"
+    )
+
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Runs per measurement, best time is reported (default: 1)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save results to a JSON file'
+    )
+
+    parser.add_argument(
+        '--compare',
+        type=str,
+        default=None,
+        help='Compare against the results JSON of an earlier run'
+    )
+
+    args = parser.parse_args()
+
+    bar_counts = [int(b) for b in args.bars.split(',')]
+    if args.suites == 'all':
+        suites = SUITES
+    else:
+        suites = [s.strip() for s in args.suites.split(',')]
+        unknown = [s for s in suites if s not in BENCHMARKS]
+        if unknown:
+            print(f"❌ Error: Unknown suite(s): {', '.join(unknown)}")
+            sys.exit(1)
+
+    results = []
+    for suite in suites:
+        print(f"⏱️  {suite.capitalize()} benchmark")
+        results.extend(BENCHMARKS[suite](bar_counts, repeat=args.repeat))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(results, json.load(f).get('results', []))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': environment(), 'bars': bar_counts,
+                       'repeat': args.repeat, 'results': results}, f, indent=2)
+        print(f"\n✅ Results saved to: {args.output}")
+
+    if any(r.get('failed') for r in results):
+        print("\n❌ A CLI script failed its startup check")
+        return 1
+    if any(r.get('over_budget') for r in results):
+        print(f"\n❌ Startup exceeded the {STARTUP_BUDGET * 1000:.0f} ms budget")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Chart Downsampling for Stock Analysis
+
+Reduces long price histories to about one point per pixel before plotting.
+Line series use LTTB (Largest-Triangle-Three-Buckets), which keeps the
+visual shape including peaks and troughs. Candlesticks and bars are
+aggregated per bucket of consecutive rows (OHLC, peak or summed volume,
+or the most extreme value for oscillator histograms such as MACD).
+
+Usage:
+    from downsample import lttb_indices, ohlc_buckets
+    idx = lttb_indices(x, y, 1200)
+    candles = ohlc_buckets(df, 1200)
+"""
+
+from __future__ import annotations
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+def bucket_starts(n: int, n_buckets: int) -> np.ndarray:
+    """Start offsets of n_buckets contiguous, near-equal buckets over n rows."""
+    n_buckets = max(1, min(n, n_buckets))
+    return np.unique(np.linspace(0, n, n_buckets + 1).astype(int)[:-1])
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Select n_out points of a line with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Each bucket in between
+    keeps the point forming the largest triangle with the previously kept
+    point and the average of the next bucket. NaN points are dropped
+    (matplotlib does not draw them either).
+
+    Args:
+        x: Ascending x values (e.g. matplotlib date numbers)
+        y: Series values
+        n_out: Number of points to keep (at least 3)
+
+    Returns:
+        Sorted indices into x/y of the kept points
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    index = np.flatnonzero(~(np.isnan(x) | np.isnan(y)))
+    n = len(index)
+    if n_out < 3 or n <= n_out:
+        return index
+
+    xs, ys = x[index], y[index]
+
+    # n_out - 2 buckets over the interior points 1 .. n-2
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(xs[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(ys[1:n - 1], edges[:-1] - 1) / counts
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            cx, cy = avg_x[i + 1], avg_y[i + 1]
+        else:
+            cx, cy = xs[-1], ys[-1]
+
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a])
+                      - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return index[selected]
+
+
+def ohlc_buckets(df: pd.DataFrame, n_buckets: int) -> pd.DataFrame:
+    """
+    Aggregate consecutive bars into at most n_buckets OHLC bars.
+
+    Args:
+        df: DataFrame with date, open, high, low, close (and optionally
+            volume) columns, sorted by date
+        n_buckets: Maximum number of output bars
+
+    Returns:
+        DataFrame with date (first date of the bucket), date_end (last
+        date), open (first), high (max), low (min), close (last) and
+        volume (sum)
+    """
+    starts = bucket_starts(len(df), n_buckets)
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(df))))
+
+    agg = {'date': 'first', 'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
+    if 'volume' in df.columns:
+        agg['volume'] = 'sum'
+
+    grouped = df[list(agg)].groupby(bucket)
+    result = grouped.agg(agg)
+    result.insert(1, 'date_end', grouped['date'].last())
+    return result.reset_index(drop=True)
+
+
+def bar_buckets(x, values, n_buckets: int, how: str = 'sum') -> tuple:
+    """
+    Aggregate a bar series into at most n_buckets bars.
+
+    Args:
+        x: Ascending x values of the bars
+        values: Bar heights
+        n_buckets: Maximum number of output bars
+        how: 'max' (tallest bar, what overlapping volume bars show),
+            'sum' (total volume) or 'extreme' (value furthest from zero,
+            e.g. MACD histogram)
+
+    Returns:
+        Tuple of (first x, last x, aggregated value) arrays per bucket;
+        buckets without any valid value are NaN
+    """
+    x = np.asarray(x, dtype=float)
+    values = np.asarray(values, dtype=float)
+    starts = bucket_starts(len(values), n_buckets)
+    ends = np.append(starts[1:], len(values)) - 1
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    if how == 'max':
+        result = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+    elif how == 'sum':
+        result = np.add.reduceat(filled, starts)
+    elif how == 'extreme':
+        high = np.maximum.reduceat(filled, starts)
+        low = np.minimum.reduceat(filled, starts)
+        result = np.where(high >= -low, high, low)
+    else:
+        raise ValueError(f"Unknown bucket aggregation: {how}")
+
+    result[np.add.reduceat(valid, starts) == 0] = np.nan
+    return x[starts], x[ends], result
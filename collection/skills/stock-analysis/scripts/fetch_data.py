@@ -3,35 +3,48 @@
 Stock Data Fetching Script for Stock Analysis
 
 Fetches historical stock data from AkShare API and saves to CSV format.
-Supports daily, weekly, and monthly data with forward adjustment.
+Supports daily, weekly, monthly and N-day data with forward adjustment;
+longer timeframes are resampled locally from the daily bars.
 
 Usage:
     python fetch_data.py --code 600519 --period 60 --adjust qfq
     python fetch_data.py --code 600519 --start 20240101 --end 20260204
+    python fetch_data.py --code 600519 --period 60 --timeframe weekly
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 from datetime import datetime, timedelta
 
-import pandas as pd
+from lazy import lazy_import
+
+pd = lazy_import('pandas')
 
 
 def fetch_stock_data(code: str, period: int = 60, adjust: str = "qfq",
-                   start_date: str = None, end_date: str = None) -> pd.DataFrame:
+                   start_date: str = None, end_date: str = None,
+                   timeframe: str = "daily") -> pd.DataFrame:
     """
     Fetch stock data from AkShare.
 
     Args:
         code: Stock code (e.g., "600519")
-        period: Number of trading days to fetch (default: 60)
+        period: Number of bars of the timeframe to fetch (default: 60)
         adjust: Price adjustment - "qfq" (forward), "hfq" (backward), "" (none)
         start_date: Start date in YYYYMMDD format (overrides period)
         end_date: End date in YYYYMMDD format (default: today)
+        timeframe: "daily", "weekly", "monthly" or "Nd" (e.g. "3d"); daily
+            bars are fetched and resampled locally
 
     Returns:
         DataFrame with stock data
     """
+    from timeframes import parse_timeframe, resample_bars, trading_days
+
+    timeframe = parse_timeframe(timeframe)
+
     try:
         import akshare as ak
     except ImportError:
@@ -46,7 +59,7 @@ def fetch_stock_data(code: str, period: int = 60, adjust: str = "qfq",
 
     if start_date is None and period:
         # Calculate start date from period (roughly period * 1.5 for calendar days)
-        start_date_obj = datetime.now() - timedelta(days=period * 1.5)
+        start_date_obj = datetime.now() - timedelta(days=period * trading_days(timeframe) * 1.5)
         start_date = start_date_obj.strftime("%Y%m%d")
 
     # Convert code format (AkShare expects leading 0 for Shanghai)
@@ -112,6 +125,11 @@ def fetch_stock_data(code: str, period: int = 60, adjust: str = "qfq",
         # Remove rows with missing values in required columns
         df = df.dropna(subset=required_cols)
 
+        if timeframe != "daily":
+            daily_count = len(df)
+            df = resample_bars(df, timeframe)
+            print(f"   Resampled {daily_count} daily bars to {len(df)} {timeframe} bars")
+
         print(f"✅ Successfully fetched {len(df)} records")
         print(f"   Date range: {df['date'].min()} to {df['date'].max()}")
         print(f"   Latest price: {df['close'].iloc[-1]:.2f}")
@@ -123,7 +141,7 @@ def fetch_stock_data(code: str, period: int = 60, adjust: str = "qfq",
         return pd.DataFrame()
 
 
-def save_to_csv(df: pd.DataFrame, code: str, output_dir: str = "."):
+def save_to_csv(df: pd.DataFrame, code: str, output_dir: str = ".", timeframe: str = "daily"):
     """Save DataFrame to CSV file."""
     if df.empty:
         print("❌ No data to save")
@@ -131,7 +149,8 @@ def save_to_csv(df: pd.DataFrame, code: str, output_dir: str = "."):
 
     # Create output filename
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"stock_data_{code}_{timestamp}.csv"
+    tag = "" if timeframe == "daily" else f"{timeframe}_"
+    filename = f"stock_data_{code}_{tag}{timestamp}.csv"
     filepath = f"{output_dir}/{filename}"
 
     try:
@@ -182,7 +201,14 @@ def main():
         '--period',
         type=int,
         default=60,
-        help='Number of trading days to fetch (default: 60)'
+        help='Number of bars to fetch (default: 60)'
+    )
+
+    parser.add_argument(
+        '--timeframe',
+        type=str,
+        default='daily',
+        help='Bar timeframe: daily, weekly, monthly or Nd, e.g. 3d (default: daily)'
     )
 
     parser.add_argument(
@@ -235,17 +261,26 @@ def main():
         print("❌ Error: End date must be in YYYYMMDD format")
         sys.exit(1)
 
+    from timeframes import parse_timeframe
+
+    try:
+        timeframe = parse_timeframe(args.timeframe)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
     # Fetch data
     df = fetch_stock_data(
         code=args.code,
         period=args.period,
         adjust=args.adjust,
         start_date=args.start,
-        end_date=args.end
+        end_date=args.end,
+        timeframe=timeframe
     )
 
     # Save to CSV
-    save_to_csv(df, code=args.code, output_dir=args.output)
+    save_to_csv(df, code=args.code, output_dir=args.output, timeframe=timeframe)
 
     # Print summary if requested
     if args.summary and not args.quiet:
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Universe Gallery for Stock Analysis
+
+Builds one multi-page PDF contact sheet of the top-scored symbols of a
+universe: every cell holds a mini K-line with MA20/MA60, the MACD below it
+and a score badge. Symbols are scored one file at a time, and each page is
+written to the PDF as soon as it is drawn. Only one page of data is held in
+memory, so this stays bounded for universes of any size.
+
+Usage:
+    python gallery.py --input-dir indicators/ --output gallery.pdf
+    python gallery.py --input-dir indicators/ --top 100 --rows 4 --cols 3
+    python gallery.py --input-dir indicators/ --bars 60 --theme dark
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+try:
+    import matplotlib.dates as mdates
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    from visualize import MA_COLORS, StockVisualizer
+except ImportError as e:
+    print(f"❌ Error: Required library not installed: {e}")
+    print("   Run: pip install numpy pandas matplotlib")
+    sys.exit(1)
+
+from panel import load_symbol, universe_files
+from scoring import IndicatorSnapshot, StockScorer, parse_weights
+
+# Page size in inches (A4 landscape)
+PAGE_SIZE = (11.69, 8.27)
+
+# Badge colour per minimum total score
+BADGE_COLORS = [(80, 'up'), (60, '#f1c40f'), (40, '#95a5a6'), (0, 'down')]
+
+
+def rank_universe(files: dict, scorer: StockScorer) -> list:
+    """
+    Score the latest row of every symbol, loading one file at a time.
+
+    Args:
+        files: {symbol: CSV path} as returned by panel.universe_files()
+        scorer: Configured StockScorer
+
+    Returns:
+        List of (symbol, score dict) sorted by total score, best first
+    """
+    ranked = []
+    for symbol, path in files.items():
+        try:
+            df = load_symbol(path)
+        except Exception as e:
+            print(f"⚠️  Warning: Skipping {path}: {e}")
+            continue
+        if df.empty:
+            continue
+        ranked.append((symbol, scorer.score_snapshot(IndicatorSnapshot.from_frame(df))))
+
+    ranked.sort(key=lambda item: item[1]['total_score'], reverse=True)
+    return ranked
+
+
+class GalleryWriter:
+    """Draws gallery pages cell by cell and streams them into a PDF."""
+
+    def __init__(self, visualizer: StockVisualizer, rows: int = 3, cols: int = 2,
+                 bars: int = 120):
+        """
+        Args:
+            visualizer: StockVisualizer providing theme and drawing helpers
+            rows, cols: Cells per page
+            bars: Most recent bars shown per symbol
+        """
+        self.visualizer = visualizer
+        self.rows = rows
+        self.cols = cols
+        self.bars = bars
+
+    @property
+    def per_page(self) -> int:
+        return self.rows * self.cols
+
+    def _badge_color(self, total: float) -> str:
+        """Badge colour of a total score; 'up'/'down' are the theme colours."""
+        theme = {'up': self.visualizer.up_color, 'down': self.visualizer.down_color}
+        for minimum, color in BADGE_COLORS:
+            if total >= minimum:
+                return theme.get(color, color)
+        return self.visualizer.down_color
+
+    def _draw_cell(self, fig, spec, rank: int, symbol: str, result: dict, df):
+        """Mini K-line over MACD with a score badge in one grid cell."""
+        vis = self.visualizer
+        ax_price, ax_macd = spec.subgridspec(2, 1, height_ratios=[3, 1],
+                                             hspace=0.05).subplots(sharex=True)
+
+        vis._draw_candles(ax_price, df, wicks=True)
+        for column in ('MA20', 'MA60'):
+            if column in df.columns:
+                vis._plot_line(ax_price, df, column, color=MA_COLORS[column], linewidth=1)
+
+        if 'MACD_BAR' in df.columns:
+            vis._draw_bars(ax_macd, df, 'MACD_BAR', alpha=0.5, how='extreme')
+        for column, color in (('MACD_DIF', '#ff6b6b'), ('MACD_DEA', '#4ecdc4')):
+            if column in df.columns:
+                vis._plot_line(ax_macd, df, column, color=color, linewidth=0.8)
+
+        ax_price.set_title(f"{rank}. {symbol}", color=vis.text_color, fontsize=9,
+                           loc='left')
+        badge = (f"{result['total_score']:.1f}  {result['level']}\n"
+                 f"T{result['trend_score']:.0f} M{result['momentum_score']:.0f} "
+                 f"F{result['money_flow_score']:.0f} S{result['sentiment_score']:.0f}")
+        ax_price.text(0.99, 0.97, badge, transform=ax_price.transAxes, ha='right',
+                      va='top', fontsize=7, color='#ffffff',
+                      bbox={'boxstyle': 'round,pad=0.3', 'linewidth': 0,
+                            'facecolor': self._badge_color(result['total_score'])})
+
+        locator = mdates.AutoDateLocator(minticks=3, maxticks=6)
+        ax_macd.xaxis.set_major_locator(locator)
+        ax_macd.xaxis.set_major_formatter(mdates.AutoDateFormatter(locator))
+        for ax in (ax_price, ax_macd):
+            ax.set_facecolor(vis.bg_color)
+            ax.grid(True, color=vis.grid_color, alpha=0.3)
+            ax.tick_params(colors=vis.text_color, labelsize=6)
+        ax_price.tick_params(labelbottom=False)
+
+    def write_page(self, pdf: PdfPages, cells: list, page: int, pages: int, title: str):
+        """
+        Draw one page of (rank, symbol, result, DataFrame) cells and append
+        it to the PDF. The figure is released once the page is written.
+        """
+        vis = self.visualizer
+        fig = vis._new_figure()
+        fig.set_size_inches(*PAGE_SIZE)
+        fig.subplots_adjust(left=0.05, right=0.98, top=0.92, bottom=0.05)
+        fig.suptitle(f"{title}  ({page}/{pages})", color=vis.text_color, fontsize=11)
+
+        grid = fig.add_gridspec(self.rows, self.cols, hspace=0.35, wspace=0.15)
+        for i, (rank, symbol, result, df) in enumerate(cells):
+            self._draw_cell(fig, grid[i // self.cols, i % self.cols], rank, symbol,
+                            result, df)
+
+        pdf.savefig(fig, facecolor=vis.bg_color)
+
+    def write(self, ranked: list, files: dict, output_path: str, title: str) -> int:
+        """
+        Write the gallery of ranked symbols, loading each page's data just
+        before the page is drawn.
+
+        Returns:
+            Number of pages written
+        """
+        pages = -(-len(ranked) // self.per_page)
+        with PdfPages(output_path, metadata={'Title': title}) as pdf:
+            for page in range(pages):
+                cells = []
+                start = page * self.per_page
+                for rank, (symbol, result) in enumerate(ranked[start:start + self.per_page],
+                                                        start=start + 1):
+                    df = load_symbol(files[symbol]).tail(self.bars)
+                    cells.append((rank, symbol, result, df))
+                self.write_page(pdf, cells, page + 1, pages, title)
+                print(f"  📄 Page {page + 1}/{pages}")
+        return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a multi-page PDF gallery of the top-scored symbols",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of indicator CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='gallery.pdf',
+        help='Output PDF file (default: gallery.pdf)'
+    )
+
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=60,
+        help='Number of top-scored symbols to include, 0 for all (default: 60)'
+    )
+
+    parser.add_argument(
+        '--rows',
+        type=int,
+        default=3,
+        help='Rows of cells per page (default: 3)'
+    )
+
+    parser.add_argument(
+        '--cols',
+        type=int,
+        default=2,
+        help='Columns of cells per page (default: 2)'
+    )
+
+    parser.add_argument(
+        '--bars',
+        type=int,
+        default=120,
+        help='Most recent bars shown per symbol (default: 120)'
+    )
+
+    parser.add_argument(
+        '--theme',
+        type=str,
+        default='light',
+        choices=['light', 'dark'],
+        help='Chart theme (default: light)'
+    )
+
+    parser.add_argument(
+        '--weights',
+        type=str,
+        default=None,
+        help='Custom weights (format: trend=0.4,momentum=0.3,money_flow=0.2,sentiment=0.1)'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    files = universe_files(args.input_dir)
+    if not files:
+        print("❌ Error: No data files found")
+        sys.exit(1)
+
+    weights = parse_weights(args.weights)
+    scorer = StockScorer(
+        trend_weight=weights['trend'],
+        momentum_weight=weights['momentum'],
+        money_flow_weight=weights['money_flow'],
+        sentiment_weight=weights['sentiment']
+    )
+
+    print(f"📊 Scoring {len(files)} symbols")
+    ranked = rank_universe(files, scorer)
+    if args.top:
+        ranked = ranked[:args.top]
+    if not ranked:
+        print("❌ Error: No symbols could be scored")
+        sys.exit(1)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    title = f"Top {len(ranked)} by score - {datetime.now().strftime('%Y-%m-%d')}"
+    writer = GalleryWriter(StockVisualizer(theme=args.theme), rows=args.rows,
+                           cols=args.cols, bars=args.bars)
+    pages = writer.write(ranked, files, args.output, title)
+
+    print(f"✅ Gallery saved: {args.output} ({len(ranked)} symbols, {pages} pages)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,18 +3,24 @@
 Technical Indicators Calculation Script for Stock Analysis
 
 Calculates comprehensive technical indicators including trend, oscillator,
-volume, and momentum indicators from stock price data.
+volume, volatility and momentum indicators from stock price data.
 
 Usage:
     python indicators.py --input stock_data.csv --output indicators.csv
     python indicators.py --input stock_data.csv --indicators ma,macd,kdj,rsi
+    python indicators.py --input stock_data.csv --indicators atr,dmi,sar
+    python indicators.py --input stock_data.csv --timeframe weekly --output indicators_weekly.csv
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 
-import numpy as np
-import pandas as pd
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
 
 
 def calculate_ma(df: pd.DataFrame, periods: list = [5, 10, 20, 30, 60, 120]) -> pd.DataFrame:
@@ -290,6 +296,185 @@ def calculate_cr(df: pd.DataFrame, period: int = 26) -> pd.DataFrame:
     return df
 
 
+def true_range(df: pd.DataFrame) -> pd.Series:
+    """True range: the largest of high - low, |high - prev close| and |low - prev close|."""
+    prev_close = df['close'].shift(1)
+    return pd.concat([df['high'] - df['low'],
+                      (df['high'] - prev_close).abs(),
+                      (df['low'] - prev_close).abs()], axis=1).max(axis=1)
+
+
+def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    """Calculate Average True Range (ATR)."""
+    print(f"📥 Calculating ATR (period={period})")
+
+    df['TR'] = true_range(df)
+    if len(df) >= period:
+        # ATR = MA(TR, N)
+        df['ATR'] = df['TR'].rolling(window=period).mean()
+    else:
+        df['ATR'] = np.nan
+
+    return df
+
+
+def calculate_dmi(df: pd.DataFrame, n: int = 14, m: int = 6) -> pd.DataFrame:
+    """Calculate Directional Movement Index (PDI, MDI, ADX, ADXR)."""
+    print(f"📥 Calculating DMI (N={n}, M={m})")
+
+    if len(df) >= n:
+        # Directional movements; only the larger of the two counts
+        up_move = df['high'] - df['high'].shift(1)
+        down_move = df['low'].shift(1) - df['low']
+        plus_dm = up_move.where((up_move > 0) & (up_move > down_move), 0)
+        minus_dm = down_move.where((down_move > 0) & (down_move > up_move), 0)
+
+        # Sums over N days
+        tr_sum = true_range(df).rolling(window=n).sum()
+        df['PDI'] = plus_dm.rolling(window=n).sum() * 100 / tr_sum
+        df['MDI'] = minus_dm.rolling(window=n).sum() * 100 / tr_sum
+
+        # ADX = MA(|MDI - PDI| / (MDI + PDI) * 100, M), ADXR = (ADX + REF(ADX, M)) / 2
+        dx = (df['MDI'] - df['PDI']).abs() / (df['MDI'] + df['PDI']) * 100
+        df['ADX'] = dx.rolling(window=m).mean()
+        df['ADXR'] = (df['ADX'] + df['ADX'].shift(m)) / 2
+    else:
+        df['PDI'] = np.nan
+        df['MDI'] = np.nan
+        df['ADX'] = np.nan
+        df['ADXR'] = np.nan
+
+    return df
+
+
+def parabolic_sar(high, low, step: float = 0.02, maximum: float = 0.2) -> tuple:
+    """
+    Parabolic SAR of high/low arrays in one pass.
+
+    The first trend is up if the second bar's up move is at least its down
+    move. Each later stop moves towards the extreme point (EP) of the trend
+    by the acceleration factor, which grows by `step` (up to `maximum`) on
+    every new EP, and never enters the previous two bars' range. When a
+    bar crosses the stop, the trend reverses and the stop becomes the EP
+    (moved outside the range of the current and previous bar).
+
+    Returns:
+        (sar, trend) arrays; trend is 1 (up) or -1 (down), both NaN on the
+        first bar
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = len(high)
+    sar_out = np.full(n, np.nan)
+    trend_out = np.full(n, np.nan)
+    if n < 2:
+        return sar_out, trend_out
+
+    # Plain Python floats: path-dependent, so no vectorized form
+    highs, lows = high.tolist(), low.tolist()
+    sars, trends = sar_out.tolist(), trend_out.tolist()
+
+    up = highs[1] - highs[0] >= lows[0] - lows[1]
+    if up:
+        sar, ep = lows[0], max(highs[0], highs[1])
+    else:
+        sar, ep = highs[0], min(lows[0], lows[1])
+    af = step
+    sars[1], trends[1] = sar, 1.0 if up else -1.0
+
+    for i in range(2, n):
+        sar += af * (ep - sar)
+        if up:
+            sar = min(sar, lows[i - 1], lows[i - 2])
+            if lows[i] < sar:
+                up, sar, ep, af = False, max(ep, highs[i], highs[i - 1]), lows[i], step
+            elif highs[i] > ep:
+                ep, af = highs[i], min(af + step, maximum)
+        else:
+            sar = max(sar, highs[i - 1], highs[i - 2])
+            if highs[i] > sar:
+                up, sar, ep, af = True, min(ep, lows[i], lows[i - 1]), highs[i], step
+            elif lows[i] < ep:
+                ep, af = lows[i], min(af + step, maximum)
+        sars[i], trends[i] = sar, 1.0 if up else -1.0
+
+    return np.array(sars), np.array(trends)
+
+
+def calculate_sar(df: pd.DataFrame, step: float = 0.02, maximum: float = 0.2) -> pd.DataFrame:
+    """Calculate Parabolic SAR (SAR, SAR_TREND: 1 up, -1 down)."""
+    print(f"📥 Calculating SAR (step={step}, max={maximum})")
+
+    sar, trend = parabolic_sar(df['high'].to_numpy(), df['low'].to_numpy(), step, maximum)
+    df['SAR'] = sar
+    df['SAR_TREND'] = trend
+
+    return df
+
+
+def signed_streak(values, groups=None, window: int = None) -> np.ndarray:
+    """
+    Signed length of the current run of up/down moves for every row.
+
+    Positive values count consecutive rises, negative values consecutive
+    falls. Zero and NaN moves neither extend nor break a run. Rows of one
+    group (symbol) must be contiguous; the count restarts at each group.
+    If window is given, only the last `window` moves are counted.
+    """
+    moves = np.sign(np.nan_to_num(np.asarray(values, dtype=float)))
+    n = len(moves)
+    streak = np.zeros(n, dtype=np.int64)
+    nonzero_pos = np.flatnonzero(moves)
+    if nonzero_pos.size == 0:
+        return streak
+
+    positions = np.arange(n)
+    if groups is None:
+        group_ids = np.zeros(n, dtype=np.int64)
+    else:
+        group_ids = pd.factorize(np.asarray(groups))[0]
+    group_start = np.r_[True, group_ids[1:] != group_ids[:-1]]
+    group_first = np.maximum.accumulate(np.where(group_start, positions, 0))
+
+    # Run boundaries: sign change between successive moves, or new group
+    nonzero_sign = moves[nonzero_pos]
+    nonzero_group = group_ids[nonzero_pos]
+    run_break = np.r_[True, (nonzero_sign[1:] != nonzero_sign[:-1]) |
+                      (nonzero_group[1:] != nonzero_group[:-1])]
+    run_start = np.zeros(n, dtype=np.int64)
+    run_start[nonzero_pos] = np.maximum.accumulate(
+        np.where(run_break, nonzero_pos, 0))
+
+    # Carry the latest move (and its run start) across zero moves
+    last_move = np.maximum.accumulate(np.where(moves != 0, positions, -1))
+    has_move = last_move >= group_first
+    last_move = np.maximum(last_move, 0)
+    start = run_start[last_move]
+    if window is not None:
+        start = np.maximum(start, positions - window + 1)
+
+    # Number of moves in [start, row]
+    moves_seen = np.cumsum(moves != 0)
+    before = np.where(start > 0, moves_seen[np.maximum(start - 1, 0)], 0)
+    length = np.maximum(moves_seen - before, 0)
+
+    streak[has_move] = (length * moves[last_move])[has_move]
+    return streak
+
+
+def calculate_streak(df: pd.DataFrame) -> pd.DataFrame:
+    """Calculate consecutive up/down days (STREAK, positive = up)."""
+    print("📥 Calculating STREAK")
+
+    if 'symbol' in df.columns:
+        changes = df.groupby('symbol', sort=False)['close'].diff()
+        df['STREAK'] = signed_streak(changes, groups=df['symbol'])
+    else:
+        df['STREAK'] = signed_streak(df['close'].diff())
+
+    return df
+
+
 def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     """Calculate all technical indicators."""
     print("\n" + "="*50)
@@ -301,6 +486,8 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df = calculate_ema(df)
     df = calculate_boll(df)
     df = calculate_macd(df)
+    df = calculate_sar(df)
+    df = calculate_dmi(df)
 
     # Oscillators
     df = calculate_rsi(df)
@@ -313,12 +500,18 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     df = calculate_obv(df)
     df = calculate_vr(df)
 
+    # Volatility indicators
+    df = calculate_atr(df)
+
     # Momentum indicators
     df = calculate_mom(df)
     df = calculate_roc(df)
     df = calculate_arbr(df)
     df = calculate_cr(df)
 
+    # Sentiment indicators
+    df = calculate_streak(df)
+
     print("\n✅ All indicators calculated!")
     print(f"   Total indicators: {len(df.columns) - len(df.columns[:7])}")  # Subtract basic columns
 
@@ -387,6 +580,10 @@ def print_summary(df: pd.DataFrame):
     print(f"   MACD DIF: {last_row.get('MACD_DIF', 'N/A'):.2f}")
     print(f"   MACD DEA: {last_row.get('MACD_DEA', 'N/A'):.2f}")
     print(f"   MACD BAR: {last_row.get('MACD_BAR', 'N/A'):.2f}")
+    print(f"   SAR: {last_row.get('SAR', 'N/A'):.2f}")
+    print(f"   PDI: {last_row.get('PDI', 'N/A'):.2f}")
+    print(f"   MDI: {last_row.get('MDI', 'N/A'):.2f}")
+    print(f"   ADX: {last_row.get('ADX', 'N/A'):.2f}")
 
     # Oscillators
     print("\n📊 Oscillators:")
@@ -404,6 +601,10 @@ def print_summary(df: pd.DataFrame):
     print(f"   OBV: {last_row.get('OBV', 'N/A'):,.0f}")
     print(f"   VR: {last_row.get('VR', 'N/A'):.2f}")
 
+    # Volatility indicators
+    print("\n📉 Volatility Indicators:")
+    print(f"   ATR: {last_row.get('ATR', 'N/A'):.2f}")
+
     # Momentum indicators
     print("\n🚀 Momentum Indicators:")
     print(f"   MOM10: {last_row.get('MOM', 'N/A'):.2f}")
@@ -440,6 +641,13 @@ def main():
         help='Comma-separated list of indicators (default: all)'
     )
 
+    parser.add_argument(
+        '--timeframe',
+        type=str,
+        default='daily',
+        help='Resample daily input to weekly, monthly or Nd bars first (default: daily)'
+    )
+
     parser.add_argument(
         '--summary',
         action='store_true',
@@ -467,6 +675,16 @@ def main():
     if df.empty:
         sys.exit(1)
 
+    if args.timeframe != 'daily':
+        from timeframes import resample_bars
+
+        try:
+            df = resample_bars(df, args.timeframe)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        print(f"✅ Resampled to {len(df)} {args.timeframe} bars")
+
     # Calculate indicators
     if args.indicators == 'all':
         df = calculate_all_indicators(df)
@@ -485,6 +703,10 @@ def main():
                 df = calculate_boll(df)
             elif indicator == 'macd':
                 df = calculate_macd(df)
+            elif indicator == 'sar':
+                df = calculate_sar(df)
+            elif indicator in ('dmi', 'adx'):
+                df = calculate_dmi(df)
             elif indicator == 'rsi':
                 df = calculate_rsi(df)
             elif indicator == 'kdj':
@@ -499,6 +721,8 @@ def main():
                 df = calculate_obv(df)
             elif indicator == 'vr':
                 df = calculate_vr(df)
+            elif indicator == 'atr':
+                df = calculate_atr(df)
             elif indicator == 'mom':
                 df = calculate_mom(df)
             elif indicator == 'roc':
@@ -507,6 +731,8 @@ def main():
                 df = calculate_arbr(df)
             elif indicator == 'cr':
                 df = calculate_cr(df)
+            elif indicator == 'streak':
+                df = calculate_streak(df)
             else:
                 print(f"⚠️  Unknown indicator: {indicator}")
 
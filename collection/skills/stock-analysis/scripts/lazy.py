@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Deferred Imports for Stock Analysis
+
+Importing numpy and pandas takes several hundred milliseconds, which made
+`--help` and argument errors of every script slow. lazy_import() returns
+the module right away and only executes it on first attribute access, so
+the import cost is paid on the code paths that actually use it.
+
+Modules using it need `from __future__ import annotations`, so type hints
+such as `pd.DataFrame` are not evaluated at definition time.
+
+Usage:
+    from lazy import lazy_import
+    np = lazy_import('numpy')
+    pd = lazy_import('pandas')
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """
+    Import a top-level module lazily.
+
+    Args:
+        name: Module name, e.g. 'pandas'
+
+    Returns:
+        The module; it is loaded on first attribute access, or immediately
+        returned if it was already imported
+
+    Raises:
+        ImportError: If the module is not installed
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
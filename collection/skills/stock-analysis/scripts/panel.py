@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Symbol Universe Helpers for Stock Analysis
+
+Loads a directory of per-symbol CSV files (as written by fetch_data.py or
+indicators.py) into a {symbol: DataFrame} universe, and converts between
+that universe and a long symbol/date panel.
+
+Usage:
+    from panel import load_universe, to_panel
+    universe = load_universe("data/")
+    panel = to_panel(universe)
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import re
+
+from lazy import lazy_import
+
+pd = lazy_import('pandas')
+
+SYMBOL_PATTERN = re.compile(r'(?<!\d)(\d{6})(?!\d)')
+
+
+def symbol_from_path(path: str) -> str:
+    """
+    Derive the stock code from a data file name.
+
+    "stock_data_600519_20260204_213000.csv" -> "600519". Files without a
+    6-digit code fall back to the file name without extension.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = SYMBOL_PATTERN.search(stem)
+    return match.group(1) if match else stem
+
+
+def load_symbol(path: str) -> pd.DataFrame:
+    """Load one symbol's CSV file with parsed dates, sorted ascending."""
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date').reset_index(drop=True)
+
+
+def universe_files(input_dir: str, pattern: str = "*.csv") -> dict:
+    """
+    Map every symbol in input_dir to its CSV file without loading it.
+
+    If several files map to the same symbol, the last one in name order
+    wins, as in load_universe().
+    """
+    files = {}
+    for path in sorted(glob.glob(os.path.join(input_dir, pattern))):
+        files[symbol_from_path(path)] = path
+    return files
+
+
+def load_universe(input_dir: str, pattern: str = "*.csv") -> dict:
+    """
+    Load every CSV file in input_dir into a {symbol: DataFrame} dict.
+
+    Dates are parsed and rows sorted ascending. If several files map to the
+    same symbol, the last one in name order wins (timestamped files from
+    fetch_data.py sort chronologically).
+    """
+    universe = {}
+    for path in sorted(glob.glob(os.path.join(input_dir, pattern))):
+        try:
+            df = load_symbol(path)
+        except Exception as e:
+            print(f"⚠️  Warning: Skipping {path}: {e}")
+            continue
+
+        universe[symbol_from_path(path)] = df
+
+    return universe
+
+
+def to_panel(universe: dict) -> pd.DataFrame:
+    """Stack a {symbol: DataFrame} universe into one symbol/date panel."""
+    if not universe:
+        return pd.DataFrame()
+
+    frames = [df.assign(symbol=symbol) for symbol, df in universe.items()]
+    panel = pd.concat(frames, ignore_index=True)
+    columns = ['symbol'] + [c for c in panel.columns if c != 'symbol']
+    return panel[columns].sort_values(['symbol', 'date'], kind='stable').reset_index(drop=True)
+
+
+def split_panel(panel: pd.DataFrame) -> dict:
+    """Split a symbol/date panel back into a {symbol: DataFrame} universe."""
+    return {
+        symbol: group.drop(columns='symbol').reset_index(drop=True)
+        for symbol, group in panel.groupby('symbol', sort=False)
+    }
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+End-to-End Stock Analysis Pipeline
+
+Runs fetch -> indicators -> scoring -> charts on one in-memory DataFrame,
+without the CSV round trips between the individual scripts. Writing the
+intermediate CSV files is optional.
+
+Usage:
+    python pipeline.py --code 600519 --period 120 --output analysis/
+    python pipeline.py --code 600519 --charts kline_ma,macd --save-data
+    python pipeline.py --input stock_data.csv --charts none
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from fetch_data import fetch_stock_data, save_to_csv
+from indicators import calculate_all_indicators, save_data
+from panel import symbol_from_path
+from scoring import StockScorer, parse_weights, print_score_report, save_scores
+
+
+def run_pipeline(code: str = None, period: int = 60, adjust: str = "qfq",
+                 start_date: str = None, end_date: str = None,
+                 df: pd.DataFrame = None, charts: list = None,
+                 output_dir: str = ".", theme: str = "light",
+                 width: int = 1200, height: int = 600,
+                 weights: dict = None, save_intermediates: bool = False) -> dict:
+    """
+    Run the full analysis for one stock in memory.
+
+    Args:
+        code: Stock code to fetch (ignored when df is given)
+        period, adjust, start_date, end_date: Passed to fetch_stock_data()
+        df: Already loaded OHLCV data to analyze instead of fetching
+        charts: Chart types to render (see visualize.CHART_TYPES); None or
+            an empty list skips plotting and the matplotlib import
+        output_dir: Directory for charts and optional intermediate files
+        theme, width, height: StockVisualizer settings
+        weights: Scoring weights dict as returned by scoring.parse_weights()
+        save_intermediates: Also write the raw data, indicators and scores CSV
+
+    Returns:
+        Dictionary with 'data' (indicator DataFrame), 'result' (score dict)
+        and 'charts' (list of chart paths); empty dict if no data
+    """
+    if df is None:
+        df = fetch_stock_data(code=code, period=period, adjust=adjust,
+                              start_date=start_date, end_date=end_date)
+    if df.empty:
+        return {}
+
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+    os.makedirs(output_dir, exist_ok=True)
+    label = code or "input"
+
+    if save_intermediates:
+        save_to_csv(df, code=label, output_dir=output_dir)
+
+    df = calculate_all_indicators(df)
+    if save_intermediates:
+        save_data(df, os.path.join(output_dir, f"indicators_{label}.csv"))
+
+    weights = weights or parse_weights(None)
+    scorer = StockScorer(
+        trend_weight=weights['trend'],
+        momentum_weight=weights['momentum'],
+        money_flow_weight=weights['money_flow'],
+        sentiment_weight=weights['sentiment']
+    )
+    result = scorer.calculate_total_score(df)
+    if save_intermediates:
+        save_scores(result, df, os.path.join(output_dir, f"scores_{label}.csv"))
+
+    chart_paths = []
+    if charts:
+        from visualize import StockVisualizer, render_chart
+
+        visualizer = StockVisualizer(theme=theme, width=width, height=height)
+        for chart_type in charts:
+            path = render_chart(visualizer, chart_type, df, output_dir)
+            if path:
+                chart_paths.append(path)
+
+    return {'data': df, 'result': result, 'charts': chart_paths}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the full stock analysis pipeline in memory",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+
+    source.add_argument(
+        '--code',
+        type=str,
+        help='Stock code to fetch (e.g., 600519)'
+    )
+
+    source.add_argument(
+        '--input',
+        type=str,
+        help='Analyze an existing OHLCV CSV file instead of fetching'
+    )
+
+    parser.add_argument(
+        '--period',
+        type=int,
+        default=60,
+        help='Number of trading days to fetch (default: 60)'
+    )
+
+    parser.add_argument(
+        '--adjust',
+        type=str,
+        default='qfq',
+        choices=['qfq', 'hfq', ''],
+        help='Price adjustment (default: qfq)'
+    )
+
+    parser.add_argument(
+        '--start',
+        type=str,
+        help='Start date in YYYYMMDD format'
+    )
+
+    parser.add_argument(
+        '--end',
+        type=str,
+        help='End date in YYYYMMDD format'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='.',
+        help='Output directory for charts and saved files (default: current directory)'
+    )
+
+    parser.add_argument(
+        '--charts',
+        type=str,
+        default='all',
+        help='Comma-separated list of charts, "all" or "none" (default: all)'
+    )
+
+    parser.add_argument(
+        '--theme',
+        type=str,
+        default='light',
+        choices=['light', 'dark'],
+        help='Chart theme (default: light)'
+    )
+
+    parser.add_argument(
+        '--weights',
+        type=str,
+        default=None,
+        help='Custom weights (format: trend=0.4,momentum=0.3,...)'
+    )
+
+    parser.add_argument(
+        '--save-data',
+        action='store_true',
+        help='Also save raw data, indicators and scores as CSV files'
+    )
+
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Suppress the score report'
+    )
+
+    args = parser.parse_args()
+
+    if args.charts == 'none':
+        charts = []
+    elif args.charts == 'all':
+        charts = ['kline_ma', 'macd', 'kdj', 'rsi', 'boll', 'composite']
+    else:
+        charts = [c.strip() for c in args.charts.split(',')]
+
+    df = None
+    if args.input:
+        if not os.path.exists(args.input):
+            print(f"❌ Error: Input file not found: {args.input}")
+            sys.exit(1)
+        df = pd.read_csv(args.input)
+
+    output = run_pipeline(
+        code=args.code or symbol_from_path(args.input),
+        period=args.period,
+        adjust=args.adjust,
+        start_date=args.start,
+        end_date=args.end,
+        df=df,
+        charts=charts,
+        output_dir=args.output,
+        theme=args.theme,
+        weights=parse_weights(args.weights),
+        save_intermediates=args.save_data
+    )
+
+    if not output:
+        sys.exit(1)
+
+    if not args.quiet:
+        print_score_report(output['result'], output['data'])
+        if output['charts']:
+            print(f"\n📊 Charts: {', '.join(output['charts'])}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
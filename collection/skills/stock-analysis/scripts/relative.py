@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Relative Indicators for Stock Analysis
+
+Indicators of every symbol relative to a benchmark or to each other,
+computed with matrix operations over a (date x symbol) return panel
+instead of one symbol at a time:
+
+    RS          Close / benchmark close, rebased to 100 at the symbol's first date
+    RS{n}       Out-performance of the benchmark over n days, in percent
+    BETA{w}     Rolling beta to the benchmark over w days
+    CORR{w}     Rolling correlation with the benchmark over w days
+
+Rolling beta and correlation come from rolling window sums (cumulative
+sums, differenced w rows apart), so every window is an O(1) update.
+The pairwise correlation matrix of the whole universe at one date is
+computed in blocks of columns and written into a float32 matrix (or a
+.npy memory map), so 5,000 names need 100 MB for the result plus one
+block of work space.
+
+Returns are close-to-close returns between consecutive rows of a symbol,
+so the first bar after a suspension carries the whole gap. Without a
+--benchmark, the equal-weighted mean return of the universe is used.
+
+Usage:
+    python relative.py --input-dir data/ --benchmark 000300 --output relative.csv
+    python relative.py --input-dir data/ --window 120 --rs-period 60 --output relative.csv
+    python relative.py --input-dir data/ --correlation corr.npy --pairs peers.csv --top 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Columns of the return panel processed at once by the rolling statistics
+# and rows of the correlation matrix computed per block
+BLOCK_SIZE = 1024
+
+
+def return_panel(panel: pd.DataFrame, column: str = 'close') -> tuple:
+    """
+    Pivot a symbol/date panel into (date x symbol) price and return matrices.
+
+    Returns:
+        (prices, returns) DataFrames on the same date index and symbol
+        columns; a return is relative to the symbol's previous row
+    """
+    panel = panel.assign(date=pd.to_datetime(panel['date']))
+    panel = panel.sort_values(['symbol', 'date'], kind='stable')
+
+    price = panel[column].to_numpy(dtype=float)
+    symbols = panel['symbol'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = price / np.r_[np.nan, price[:-1]] - 1
+    returns[np.r_[True, symbols[1:] != symbols[:-1]]] = np.nan
+
+    long = pd.DataFrame({'date': panel['date'].to_numpy(), 'symbol': symbols,
+                         'price': price, 'return': returns})
+    prices = long.pivot(index='date', columns='symbol', values='price')
+    return prices, long.pivot(index='date', columns='symbol', values='return')
+
+
+def equal_weight_benchmark(returns: pd.DataFrame) -> tuple:
+    """(prices, returns) Series of the equal-weighted mean return of all symbols."""
+    mean = returns.mean(axis=1, skipna=True).fillna(0.0)
+    prices = 100 * (1 + mean).cumprod()
+    return prices, mean
+
+
+def calculate_relative_strength(prices: pd.DataFrame, benchmark, period: int = 20) -> dict:
+    """
+    Relative strength of every symbol against a benchmark.
+
+    Args:
+        prices: (date x symbol) closes
+        benchmark: Benchmark closes on the same dates (Series or array)
+        period: Days of the RS{period} out-performance
+
+    Returns:
+        {'RS': DataFrame, f'RS{period}': DataFrame}
+    """
+    values = prices.to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = values / np.asarray(benchmark, dtype=float)[:, None]
+
+        # Rebase each symbol's ratio line to 100 at its first valid date
+        has_value = ~np.isnan(ratio)
+        first = np.argmax(has_value, axis=0)
+        rs = 100 * ratio / ratio[first, np.arange(ratio.shape[1])]
+
+        lagged = np.full_like(ratio, np.nan)
+        lagged[period:] = ratio[:-period]
+        rs_n = 100 * (ratio / lagged - 1)
+
+    return {
+        'RS': pd.DataFrame(rs, index=prices.index, columns=prices.columns),
+        f'RS{period}': pd.DataFrame(rs_n, index=prices.index, columns=prices.columns),
+    }
+
+
+def _window_sums(values, window: int):
+    """Sums over the last `window` rows for every row, from one cumulative sum."""
+    cumulative = np.cumsum(values, axis=0)
+    sums = cumulative.copy()
+    sums[window:] -= cumulative[:-window]
+    return sums
+
+
+def calculate_rolling_beta(returns: pd.DataFrame, benchmark_returns, window: int = 60,
+                           min_periods: int = None, block_size: int = BLOCK_SIZE) -> dict:
+    """
+    Rolling beta and correlation of every symbol with a benchmark.
+
+    Window sums of x, y, xy, xx and yy over the rows where both returns
+    exist are kept with cumulative sums, in blocks of symbols to bound
+    memory. Returns are centered on their column mean first, which leaves
+    covariances unchanged and keeps the sums small.
+
+    Args:
+        returns: (date x symbol) returns
+        benchmark_returns: Benchmark returns on the same dates
+        window: Rows per window
+        min_periods: Paired returns needed for a value (default: window)
+
+    Returns:
+        {f'BETA{window}': DataFrame, f'CORR{window}': DataFrame}
+    """
+    min_periods = window if min_periods is None else min_periods
+    x_all = returns.to_numpy(dtype=float)
+    bench = np.asarray(benchmark_returns, dtype=float)[:, None]
+    beta = np.full_like(x_all, np.nan)
+    corr = np.full_like(x_all, np.nan)
+
+    for start in range(0, x_all.shape[1], block_size):
+        x = x_all[:, start:start + block_size]
+        valid = ~np.isnan(x) & ~np.isnan(bench)
+        with np.errstate(invalid='ignore'):
+            x = np.where(valid, x - np.nanmean(np.where(valid, x, np.nan), axis=0), 0.0)
+            y = np.where(valid, bench - np.nanmean(bench), 0.0)
+
+        n = _window_sums(valid.astype(float), window)
+        sx, sy = _window_sums(x, window), _window_sums(y, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = _window_sums(x * y, window) - sx * sy / n
+            var_x = _window_sums(x * x, window) - sx * sx / n
+            var_y = _window_sums(y * y, window) - sy * sy / n
+            enough = n >= min_periods
+            beta[:, start:start + block_size] = np.where(enough, cov / var_y, np.nan)
+            corr[:, start:start + block_size] = np.where(
+                enough, cov / np.sqrt(np.maximum(var_x, 0) * np.maximum(var_y, 0)), np.nan)
+
+    return {
+        f'BETA{window}': pd.DataFrame(beta, index=returns.index, columns=returns.columns),
+        f'CORR{window}': pd.DataFrame(corr, index=returns.index, columns=returns.columns),
+    }
+
+
+def correlation_matrix(returns: pd.DataFrame, window: int = 60, end=None,
+                       min_periods: int = None, block_size: int = BLOCK_SIZE, out=None):
+    """
+    Pairwise correlation of all symbols over the `window` rows up to `end`.
+
+    Each symbol's returns in the window are standardized with its own mean
+    and deviation, missing returns count as the mean (contribute zero),
+    and the (symbols x symbols) product is computed one block of rows at a
+    time, using symmetry for the blocks below the diagonal.
+
+    Args:
+        returns: (date x symbol) returns
+        window: Rows in the window
+        end: Last date of the window (default: the last date)
+        min_periods: Returns a symbol needs in the window (default: window // 2);
+            rows and columns of other symbols are NaN
+        out: Optional (symbols x symbols) array to fill, e.g. a memory map
+
+    Returns:
+        float32 correlation matrix (out if given)
+    """
+    min_periods = window // 2 if min_periods is None else min_periods
+    values = returns if end is None else returns.loc[:pd.Timestamp(end)]
+    x = values.to_numpy(dtype=float)[-window:]
+
+    valid = ~np.isnan(x)
+    count = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(valid, x - np.nanmean(np.where(valid, x, np.nan), axis=0), 0.0)
+        norm = np.sqrt((z * z).sum(axis=0))
+        z = z / norm
+    z[:, (count < min_periods) | ~(norm > 0)] = np.nan
+
+    size = x.shape[1]
+    matrix = out if out is not None else np.empty((size, size), dtype=np.float32)
+    for i in range(0, size, block_size):
+        block = z[:, i:i + block_size]
+        # Columns from the diagonal on; the rest is the transpose of earlier blocks
+        product = block.T @ z[:, i:]
+        matrix[i:i + block.shape[1], i:] = product
+        matrix[i:, i:i + block.shape[1]] = product.T
+    return matrix
+
+
+def _smallest(values, k: int):
+    """Column indices of the k smallest values of every row, ascending."""
+    part = np.argpartition(values, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(values, part, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1)
+
+
+def top_pairs(matrix, symbols: list, top: int = 5) -> pd.DataFrame:
+    """
+    Most and least correlated peers of every symbol, for clustering and hedging.
+
+    Returns:
+        DataFrame with symbol, peer, correlation and rank (1 = most
+        correlated; -1 = most negatively correlated)
+    """
+    symbols = np.asarray(symbols, dtype=object)
+    top = min(top, len(symbols) - 1)
+    frames = []
+    for start in range(0, len(symbols), BLOCK_SIZE):
+        block = np.array(matrix[start:start + BLOCK_SIZE], dtype=float)
+        rows = np.arange(block.shape[0])
+        block[rows, start + rows] = np.nan
+        best = _smallest(np.where(np.isnan(block), np.inf, -block), top)
+        worst = _smallest(np.where(np.isnan(block), np.inf, block), top)
+        for peers, ranks in ((best, np.arange(1, top + 1)), (worst, -np.arange(1, top + 1))):
+            frames.append(pd.DataFrame({
+                'symbol': np.repeat(symbols[start + rows], top),
+                'peer': symbols[peers.ravel()],
+                'correlation': block[rows[:, None], peers].ravel(),
+                'rank': np.tile(ranks, len(rows)),
+            }))
+    pairs = pd.concat(frames, ignore_index=True).dropna(subset=['correlation'])
+    return pairs.sort_values(['symbol', 'rank'], ascending=[True, False], kind='stable').reset_index(drop=True)
+
+
+def to_long(frames: dict) -> pd.DataFrame:
+    """Stack {column: (date x symbol) DataFrame} into a symbol/date panel."""
+    stacked = {name: frame.stack(future_stack=True) for name, frame in frames.items()}
+    result = pd.DataFrame(stacked).reset_index()
+    result = result.rename(columns={result.columns[0]: 'date', result.columns[1]: 'symbol'})
+    values = [c for c in result.columns if c not in ('date', 'symbol')]
+    result = result.dropna(subset=values, how='all')
+    return result[['symbol', 'date'] + values].sort_values(['symbol', 'date'], kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Relative strength, beta and correlation over a universe",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of daily CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--benchmark',
+        type=str,
+        default=None,
+        help='Benchmark symbol in --input-dir or CSV file (default: equal-weighted universe)'
+    )
+
+    parser.add_argument(
+        '--window',
+        type=int,
+        default=60,
+        help='Rolling beta/correlation window in days (default: 60)'
+    )
+
+    parser.add_argument(
+        '--rs-period',
+        type=int,
+        default=20,
+        help='Days of the RS out-performance column (default: 20)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save RS, beta and correlation columns of every symbol and date to a CSV file'
+    )
+
+    parser.add_argument(
+        '--correlation',
+        type=str,
+        default=None,
+        help='Save the pairwise correlation matrix (float32) to a .npy file'
+    )
+
+    parser.add_argument(
+        '--as-of',
+        type=str,
+        default=None,
+        help='Last date of the correlation window (default: latest)'
+    )
+
+    parser.add_argument(
+        '--pairs',
+        type=str,
+        default=None,
+        help='Save the most and least correlated peers of every symbol to a CSV file'
+    )
+
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=5,
+        help='Peers per symbol and direction for --pairs (default: 5)'
+    )
+
+    args = parser.parse_args()
+
+    if not (args.output or args.correlation or args.pairs):
+        parser.error('nothing to do: give --output, --correlation or --pairs')
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    from panel import load_symbol, load_universe, to_panel
+
+    universe = load_universe(args.input_dir)
+    benchmark_frame = None
+    if args.benchmark:
+        if os.path.isfile(args.benchmark):
+            benchmark_frame = load_symbol(args.benchmark)
+        elif args.benchmark in universe:
+            benchmark_frame = universe.pop(args.benchmark)
+        else:
+            print(f"❌ Error: Benchmark not found: {args.benchmark}")
+            sys.exit(1)
+    if not universe:
+        print(f"❌ Error: No CSV files found in {args.input_dir}")
+        sys.exit(1)
+
+    prices, returns = return_panel(to_panel(universe))
+    if benchmark_frame is None:
+        bench_prices, bench_returns = equal_weight_benchmark(returns)
+        print(f"📊 {returns.shape[1]} symbols x {returns.shape[0]} dates, "
+              f"benchmark: equal-weighted universe")
+    else:
+        bench = benchmark_frame.set_index('date')['close'].astype(float)
+        bench_returns = bench.pct_change(fill_method=None).reindex(prices.index)
+        bench_prices = bench.reindex(prices.index)
+        print(f"📊 {returns.shape[1]} symbols x {returns.shape[0]} dates, benchmark: {args.benchmark}")
+
+    if args.output:
+        columns = calculate_relative_strength(prices, bench_prices, args.rs_period)
+        columns.update(calculate_rolling_beta(returns, bench_returns, args.window))
+        result = to_long(columns)
+        result.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"✅ Relative indicators saved to: {args.output} ({len(result):,} rows)")
+
+    if args.correlation or args.pairs:
+        size = returns.shape[1]
+        if args.correlation:
+            out = np.lib.format.open_memmap(args.correlation, mode='w+', dtype=np.float32,
+                                            shape=(size, size))
+        else:
+            out = None
+        matrix = correlation_matrix(returns, args.window, end=args.as_of, out=out)
+        symbols = returns.columns.tolist()
+
+        if args.correlation:
+            matrix.flush()
+            with open(os.path.splitext(args.correlation)[0] + '.symbols.json', 'w', encoding='utf-8') as f:
+                json.dump(symbols, f)
+            print(f"✅ Correlation matrix ({size} x {size}) saved to: {args.correlation}")
+
+        if args.pairs:
+            pairs = top_pairs(matrix, symbols, args.top)
+            pairs.to_csv(args.pairs, index=False, encoding='utf-8-sig')
+            print(f"✅ Correlated peers saved to: {args.pairs}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
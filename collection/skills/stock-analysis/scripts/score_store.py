@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Score History Store for Stock Analysis
+
+Append-only history of daily scores in a local SQLite database, keyed by
+(symbol, date). Supports fast per-symbol score trends and whole-universe
+snapshots for one date, with batched writes from universe runs.
+
+Usage:
+    python score_store.py --db scores.db --symbol 600519
+    python score_store.py --db scores.db --date 2026-02-04 --top 20
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pandas as pd
+
+SCORE_FIELDS = [
+    'close', 'total_score', 'trend_score', 'momentum_score',
+    'money_flow_score', 'sentiment_score', 'trend_weight',
+    'momentum_weight', 'money_flow_weight', 'sentiment_weight',
+    'level', 'level_emoji',
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    close REAL,
+    total_score REAL,
+    trend_score REAL,
+    momentum_score REAL,
+    money_flow_score REAL,
+    sentiment_score REAL,
+    trend_weight REAL,
+    momentum_weight REAL,
+    money_flow_weight REAL,
+    sentiment_weight REAL,
+    level TEXT,
+    level_emoji TEXT,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_scores_date ON scores (date, total_score);
+
+CREATE TRIGGER IF NOT EXISTS scores_no_update BEFORE UPDATE ON scores
+BEGIN
+    SELECT RAISE(ABORT, 'score history is append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS scores_no_delete BEFORE DELETE ON scores
+BEGIN
+    SELECT RAISE(ABORT, 'score history is append-only');
+END;
+"""
+
+
+def _date_key(value) -> str:
+    """Normalize a date value to YYYY-MM-DD."""
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _sql_value(value):
+    """Convert NumPy scalars to plain Python values for sqlite3."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+class ScoreHistoryStore:
+    """Append-only (symbol, date) score history backed by SQLite."""
+
+    def __init__(self, db_path: str):
+        """Open (and create if needed) the history database."""
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def append(self, rows: list) -> int:
+        """
+        Append score rows in one transaction.
+
+        Each row is a dict with 'symbol', 'date' and the SCORE_FIELDS (as
+        produced by scoring.score_row()). Rows for a (symbol, date) that is
+        already stored are ignored, never overwritten.
+
+        Returns: Number of rows actually inserted
+        """
+        recorded_at = datetime.now().isoformat(timespec='seconds')
+        records = [
+            (str(row['symbol']), _date_key(row['date']),
+             *(_sql_value(row.get(field)) for field in SCORE_FIELDS), recorded_at)
+            for row in rows
+        ]
+
+        columns = ['symbol', 'date'] + SCORE_FIELDS + ['recorded_at']
+        placeholders = ', '.join('?' * len(columns))
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f"INSERT OR IGNORE INTO scores ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                records
+            )
+            return self.conn.total_changes - before
+
+    def symbol_trend(self, symbol: str, start: str = None, end: str = None) -> pd.DataFrame:
+        """Score history of one symbol, oldest first."""
+        query = "SELECT * FROM scores WHERE symbol = ?"
+        params = [str(symbol)]
+        if start:
+            query += " AND date >= ?"
+            params.append(_date_key(start))
+        if end:
+            query += " AND date <= ?"
+            params.append(_date_key(end))
+        query += " ORDER BY date"
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def on_date(self, date: str, top: int = None) -> pd.DataFrame:
+        """Scores of all symbols on one date, best first."""
+        query = "SELECT * FROM scores WHERE date = ? ORDER BY total_score DESC"
+        params = [_date_key(date)]
+        if top:
+            query += " LIMIT ?"
+            params.append(int(top))
+        return pd.read_sql_query(query, self.conn, params=params)
+
+    def latest_date(self) -> str:
+        """Most recent date in the history, or None if empty."""
+        row = self.conn.execute("SELECT MAX(date) FROM scores").fetchone()
+        return row[0]
+
+    def count(self) -> int:
+        """Number of stored score rows."""
+        return self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Query the stock score history",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--db',
+        type=str,
+        required=True,
+        help='Score history database file'
+    )
+
+    query = parser.add_mutually_exclusive_group()
+
+    query.add_argument(
+        '--symbol',
+        type=str,
+        help='Show the score trend of one symbol'
+    )
+
+    query.add_argument(
+        '--date',
+        type=str,
+        help='Show all symbols on one date (YYYY-MM-DD, default: latest)'
+    )
+
+    parser.add_argument(
+        '--top',
+        type=int,
+        default=None,
+        help='Limit the per-date listing to the N best scores'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save the query result to a CSV file'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"❌ Error: Database not found: {args.db}")
+        sys.exit(1)
+
+    with ScoreHistoryStore(args.db) as store:
+        if args.symbol:
+            result = store.symbol_trend(args.symbol)
+        else:
+            date = args.date or store.latest_date()
+            if date is None:
+                print("❌ Error: Score history is empty")
+                sys.exit(1)
+            result = store.on_date(date, top=args.top)
+
+    if result.empty:
+        print("⚠️  No scores found")
+        return 0
+
+    columns = ['symbol', 'date', 'close', 'total_score', 'trend_score',
+               'momentum_score', 'money_flow_score', 'sentiment_score', 'level']
+    print(result[columns].to_string(index=False))
+
+    if args.output:
+        result.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"\n✅ Query result saved to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
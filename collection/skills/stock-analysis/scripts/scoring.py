@@ -11,13 +11,265 @@ Calculates comprehensive stock score from 4 dimensions:
 Usage:
     python scoring.py --input indicators.csv --output scores.csv
     python scoring.py --input indicators.csv --weights trend=0.5,momentum=0.3
+    python scoring.py --input-dir indicators/ --state .score_state.json
+    python scoring.py --input indicators.csv --history scores.db --symbol 600519
+    python scoring.py --input stock_data.csv --as-of 2024-03-29,2024-06-28 --output as_of.csv
+    python scoring.py --input stock_data.csv --timeframe weekly
+    python scoring.py --input stock_data.csv --blend daily=0.5,weekly=0.3,monthly=0.2
 """
 
+from __future__ import annotations
+
 import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import os
 import sys
+import warnings
+from collections import OrderedDict
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Columns read by StockScorer, and the longest window any dimension looks at
+SCORE_COLUMNS = [
+    'close', 'high', 'low', 'volume',
+    'MA5', 'MA10', 'MA20', 'MA60',
+    'MACD_DIF', 'MACD_DEA', 'MACD_BAR',
+    'BOLL_UPPER', 'BOLL_MID', 'BOLL_LOWER',
+    'RSI12', 'KDJ_J', 'MOM', 'ROC12', 'OBV', 'VR',
+]
+SCORE_WINDOW = 60
+
+
+# Sentiment points for streaks of -3 (or fewer) ... +3 (or more) days
+STREAK_POINTS = (0.0, 10.0, 20.0, 25.0, 30.0, 40.0, 50.0)
+
+
+def score_streak(streak):
+    """
+    Map signed consecutive-day streaks to the sentiment points (0-50).
+
+    Works on scalars and arrays alike: +3 or more up days scores 50,
+    3 or more down days scores 0, and no movement scores 25.
+    """
+    if isinstance(streak, (int, np.integer)):
+        return STREAK_POINTS[min(max(int(streak), -3), 3) + 3]
+    return np.asarray(STREAK_POINTS)[np.clip(np.asarray(streak), -3, 3) + 3]
+
+
+class IndicatorSnapshot:
+    """
+    Latest indicator values and window aggregates that StockScorer reads.
+
+    A snapshot replaces the per-dimension df.tail() copies and label
+    lookups: it is built once per symbol (or for a whole panel at once
+    with from_panel()) and every dimension reads plain attributes. Values
+    of missing columns are None and score like the missing column did.
+    """
+
+    __slots__ = (
+        'rows', 'money_flow_lookback', 'sentiment_lookback',
+        'close', 'ma5', 'ma10', 'ma20', 'ma60',
+        'macd_dif', 'macd_dea', 'macd_bar',
+        'boll_upper', 'boll_mid', 'boll_lower',
+        'rsi12', 'kdj_j', 'mom', 'roc12', 'vr',
+        'obv_start', 'obv_end', 'volume_last', 'volume_mean', 'volume_prev_mean',
+        'high_max', 'low_min', 'close_start', 'streak',
+    )
+
+    # Snapshot attribute -> indicator column holding its latest value
+    LATEST_COLUMNS = {
+        'close': 'close', 'ma5': 'MA5', 'ma10': 'MA10', 'ma20': 'MA20', 'ma60': 'MA60',
+        'macd_dif': 'MACD_DIF', 'macd_dea': 'MACD_DEA', 'macd_bar': 'MACD_BAR',
+        'boll_upper': 'BOLL_UPPER', 'boll_mid': 'BOLL_MID', 'boll_lower': 'BOLL_LOWER',
+        'rsi12': 'RSI12', 'kdj_j': 'KDJ_J', 'mom': 'MOM', 'roc12': 'ROC12', 'vr': 'VR',
+        'obv_end': 'OBV', 'volume_last': 'volume',
+    }
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, money_flow_lookback: int = 20,
+                   sentiment_lookback: int = 10) -> 'IndicatorSnapshot':
+        """Build the snapshot of the last row of one symbol's indicators."""
+        if df.empty:
+            return cls(rows=0, money_flow_lookback=money_flow_lookback,
+                       sentiment_lookback=sentiment_lookback)
+        return cls.from_panel(df, money_flow_lookback, sentiment_lookback,
+                              single=True)[0]
+
+    @classmethod
+    def from_panel(cls, panel: pd.DataFrame, money_flow_lookback: int = 20,
+                   sentiment_lookback: int = 10, single: bool = False) -> list:
+        """
+        Build one snapshot per symbol of a symbol/date panel.
+
+        Rows of each symbol must be contiguous and sorted by date. All
+        values are gathered with array indexing, without a per-symbol loop
+        over pandas objects. Returns snapshots in order of appearance.
+        """
+        if panel.empty:
+            return []
+        if single or 'symbol' not in panel.columns:
+            ends = np.array([len(panel) - 1])
+        else:
+            groups = panel['symbol'].to_numpy()
+            ends = np.flatnonzero(np.r_[groups[1:] != groups[:-1], True])
+
+        starts = np.r_[0, ends[:-1] + 1]
+        rows = ends - starts + 1
+
+        def column(name):
+            if name not in panel.columns:
+                return None
+            return panel[name].to_numpy(dtype=float)
+
+        return cls.from_columns(column, ends, rows, money_flow_lookback, sentiment_lookback)
 
-import numpy as np
-import pandas as pd
+    @classmethod
+    def from_columns(cls, column, ends, rows, money_flow_lookback: int = 20,
+                     sentiment_lookback: int = 10) -> list:
+        """
+        Build one snapshot per symbol from indicator column arrays.
+
+        Args:
+            column: Callable returning the float array of an indicator
+                column, or None if the column is missing
+            ends: Array of the index of each symbol's last row
+            rows: Array of the number of rows of each symbol
+
+        Returns:
+            List of snapshots, one per entry of ends
+        """
+        def window(values, length):
+            # (symbols, length) matrix of the last `length` values
+            idx = np.maximum(ends[:, None] - np.arange(length - 1, -1, -1), 0)
+            return values[idx]
+
+        def nan_reduce(func, matrix):
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', category=RuntimeWarning)
+                return func(matrix, axis=1)
+
+        values = {'rows': rows.tolist()}
+        for attr, name in cls.LATEST_COLUMNS.items():
+            data = column(name)
+            values[attr] = None if data is None else data[ends].tolist()
+
+        obv = column('OBV')
+        volume = column('volume')
+        if obv is not None:
+            values['obv_start'] = obv[np.maximum(ends - money_flow_lookback + 1, 0)].tolist()
+        if volume is not None:
+            volumes = window(volume, money_flow_lookback)
+            values['volume_mean'] = nan_reduce(np.nanmean, volumes).tolist()
+            values['volume_prev_mean'] = nan_reduce(np.nanmean, volumes[:, :-1]).tolist()
+
+        high, low, close = column('high'), column('low'), column('close')
+        if high is not None:
+            values['high_max'] = nan_reduce(np.nanmax, window(high, sentiment_lookback)).tolist()
+        if low is not None:
+            values['low_min'] = nan_reduce(np.nanmin, window(low, sentiment_lookback)).tolist()
+        if close is not None:
+            closes = window(close, sentiment_lookback)
+            values['close_start'] = closes[:, 0].tolist()
+            from indicators import signed_streak
+
+            changes = np.diff(closes, axis=1)
+            symbol_ids = np.repeat(np.arange(len(ends)), changes.shape[1])
+            streaks = signed_streak(changes.ravel(), groups=symbol_ids)
+            values['streak'] = streaks.reshape(changes.shape)[:, -1].tolist() \
+                if changes.shape[1] else [0] * len(ends)
+
+        count = len(ends)
+        values['money_flow_lookback'] = [money_flow_lookback] * count
+        values['sentiment_lookback'] = [sentiment_lookback] * count
+        names = [name for name in cls.__slots__ if values.get(name) is not None]
+        missing = [name for name in cls.__slots__ if values.get(name) is None]
+
+        snapshots = []
+        for row in zip(*(values[name] for name in names)):
+            snapshot = object.__new__(cls)
+            for name, value in zip(names, row):
+                setattr(snapshot, name, value)
+            for name in missing:
+                setattr(snapshot, name, None)
+            snapshots.append(snapshot)
+
+        return snapshots
+
+
+def _div(a, b):
+    """Divide like NumPy floats do: x/0 gives inf or NaN instead of raising."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        return math.copysign(math.inf, a) if a else math.nan
+
+
+def as_of_rows(dates, as_of, groups=None) -> tuple:
+    """
+    Find the last row on or before each as-of date by binary search.
+
+    Args:
+        dates: Bar dates, ascending within each symbol
+        as_of: Dates to look up
+        groups: Symbol of every row, or None for a single symbol; rows of a
+            symbol must be contiguous
+
+    Returns:
+        (starts, rows): the first row of every symbol, and a (symbols,
+        as_of) array of row positions, -1 where a symbol has no bar on or
+        before the date
+
+    Raises:
+        ValueError: If dates are not sorted within a symbol
+    """
+    days = pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]').astype(np.int64)
+    targets = pd.to_datetime(pd.Series(as_of)).to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    if groups is None:
+        group_start = np.arange(len(days)) == 0
+    else:
+        groups = np.asarray(groups)
+        group_start = np.r_[True, groups[1:] != groups[:-1]]
+    starts = np.flatnonzero(group_start)
+    ids = np.cumsum(group_start) - 1
+
+    # One ascending key over all symbols (symbol, then day), so a single
+    # searchsorted call answers every (symbol, date) pair
+    first = days.min()
+    stride = days.max() - first + 2
+    keys = ids * stride + (days - first)
+    if np.any(np.diff(keys) < 0):
+        raise ValueError("Dates must be sorted ascending within each symbol")
+
+    offsets = np.clip(targets - first, -1, stride - 2)
+    queries = np.arange(len(starts))[:, None] * stride + offsets[None, :]
+    rows = np.searchsorted(keys, queries, side='right') - 1
+    rows[rows < starts[:, None]] = -1
+    return starts, rows
+
+
+def score_level(total: float) -> tuple:
+    """Recommendation level and emoji of a total score."""
+    if total >= 90:
+        return "强烈买入", "🟢🟢"
+    elif total >= 80:
+        return "买入", "🟢"
+    elif total >= 60:
+        return "持有可能", "🟡"
+    elif total >= 40:
+        return "观望", "🟡"
+    return "卖出", "🔴"
 
 
 class StockScorer:
@@ -36,78 +288,76 @@ class StockScorer:
         if abs(total - 1.0) > 0.01:
             print(f"⚠️  Warning: Weights don't sum to 1.0 (sum={total:.2f})")
 
-    def calculate_trend_score(self, df: pd.DataFrame, lookback: int = 60) -> float:
+    @staticmethod
+    def _snapshot(data, **lookbacks) -> IndicatorSnapshot:
+        """Accept a DataFrame or an IndicatorSnapshot built for the same windows."""
+        if not isinstance(data, IndicatorSnapshot):
+            return IndicatorSnapshot.from_frame(data, **lookbacks)
+
+        for name, value in lookbacks.items():
+            if getattr(data, name) != value:
+                raise ValueError(f"Snapshot was built with {name}={getattr(data, name)}, not {value}")
+        return data
+
+    def calculate_trend_score(self, df, lookback: int = 60) -> float:
         """
         Calculate trend score based on MA alignment, MACD, BOLL.
 
+        Accepts an indicator DataFrame or an IndicatorSnapshot.
+
         Returns: Score 0-100
         """
-        if len(df) < lookback:
+        snap = self._snapshot(df)
+        if snap.rows < lookback:
             return 50.0
 
-        recent = df.tail(lookback)
-
         # 1. MA Alignment Score (40 points)
-        ma_score = 0.0
-        try:
-            # Check if MA5 > MA10 > MA20 > MA60 (bullish)
-            ma5 = recent['MA5'].iloc[-1]
-            ma10 = recent['MA10'].iloc[-1]
-            ma20 = recent['MA20'].iloc[-1]
-            ma60 = recent['MA60'].iloc[-1]
-
-            if ma5 > ma10 > ma20 > ma60:
-                ma_score = 40  # Perfect bullish alignment
-            elif ma5 > ma10 > ma20:
-                ma_score = 30  # Medium bullish
-            elif ma5 > ma10:
-                ma_score = 20  # Slight bullish
-            elif ma5 < ma10 < ma20 < ma60:
-                ma_score = 0   # Perfect bearish alignment
-            elif ma5 < ma10 < ma20:
-                ma_score = 10  # Medium bearish
-            elif ma5 < ma10:
-                ma_score = 20  # Slight bearish
-            else:
-                ma_score = 25  # Mixed/sideways
-        except (KeyError, ValueError):
+        ma5, ma10, ma20, ma60 = snap.ma5, snap.ma10, snap.ma20, snap.ma60
+        if None in (ma5, ma10, ma20, ma60):
             ma_score = 20.0
+        # Check if MA5 > MA10 > MA20 > MA60 (bullish)
+        elif ma5 > ma10 > ma20 > ma60:
+            ma_score = 40  # Perfect bullish alignment
+        elif ma5 > ma10 > ma20:
+            ma_score = 30  # Medium bullish
+        elif ma5 > ma10:
+            ma_score = 20  # Slight bullish
+        elif ma5 < ma10 < ma20 < ma60:
+            ma_score = 0   # Perfect bearish alignment
+        elif ma5 < ma10 < ma20:
+            ma_score = 10  # Medium bearish
+        elif ma5 < ma10:
+            ma_score = 20  # Slight bearish
+        else:
+            ma_score = 25  # Mixed/sideways
 
         # 2. MACD Score (30 points)
-        macd_score = 0.0
-        try:
-            dif = recent['MACD_DIF'].iloc[-1]
-            dea = recent['MACD_DEA'].iloc[-1]
-            macd_bar = recent['MACD_BAR'].iloc[-1]
-
-            if dif > dea and macd_bar > 0:
-                # Golden cross or bullish
-                macd_score = 30
-            elif dif < dea and macd_bar < 0:
-                # Death cross or bearish
-                macd_score = 5
-            elif dif > dea:
-                # Above signal but bearish momentum
-                macd_score = 20
-            elif dif < dea:
-                # Below signal but bullish momentum
-                macd_score = 15
-            else:
-                macd_score = 20  # Neutral
-        except (KeyError, ValueError):
+        dif, dea, macd_bar = snap.macd_dif, snap.macd_dea, snap.macd_bar
+        if None in (dif, dea, macd_bar):
             macd_score = 20.0
+        elif dif > dea and macd_bar > 0:
+            # Golden cross or bullish
+            macd_score = 30
+        elif dif < dea and macd_bar < 0:
+            # Death cross or bearish
+            macd_score = 5
+        elif dif > dea:
+            # Above signal but bearish momentum
+            macd_score = 20
+        elif dif < dea:
+            # Below signal but bullish momentum
+            macd_score = 15
+        else:
+            macd_score = 20  # Neutral
 
         # 3. BOLL Position Score (30 points)
-        boll_score = 0.0
-        try:
-            close = recent['close'].iloc[-1]
-            boll_upper = recent['BOLL_UPPER'].iloc[-1]
-            boll_mid = recent['BOLL_MID'].iloc[-1]
-            boll_lower = recent['BOLL_LOWER'].iloc[-1]
-
+        close, boll_upper, boll_lower = snap.close, snap.boll_upper, snap.boll_lower
+        if None in (close, boll_upper, snap.boll_mid, boll_lower):
+            boll_score = 20.0
+        else:
             # Calculate position within bands (0-100)
             band_width = boll_upper - boll_lower
-            position = (close - boll_lower) / band_width * 100
+            position = _div(close - boll_lower, band_width) * 100
 
             if position > 80:
                 boll_score = 30  # Near upper band - bullish
@@ -119,116 +369,105 @@ class StockScorer:
                 boll_score = 15  # Lower region
             else:
                 boll_score = 10  # Near lower band - bearish
-        except (KeyError, ValueError):
-            boll_score = 20.0
 
         trend_score = ma_score + macd_score + boll_score
         return min(max(trend_score, 0), 100)
 
-    def calculate_momentum_score(self, df: pd.DataFrame, lookback: int = 30) -> float:
+    def calculate_momentum_score(self, df, lookback: int = 30) -> float:
         """
         Calculate momentum score based on RSI, KDJ, MOM, ROC.
 
+        Accepts an indicator DataFrame or an IndicatorSnapshot.
+
         Returns: Score 0-100
         """
-        if len(df) < lookback:
+        snap = self._snapshot(df)
+        if snap.rows < lookback:
             return 50.0
 
-        recent = df.tail(lookback)
-
         # 1. RSI Score (40 points)
-        rsi_score = 0.0
-        try:
-            rsi12 = recent['RSI12'].iloc[-1]
-
-            # Convert RSI to 0-100 score
-            # RSI 50 = neutral (50 points)
-            # RSI > 70 = overbought (reduce points)
-            # RSI < 30 = oversold (reduce points slightly)
-            # RSI 50-70 = strong (more points)
-            if rsi12 > 70:
-                # Overbought - reduce score
-                rsi_score = 40 - (rsi12 - 70) * 1.5
-            elif rsi12 < 30:
-                # Oversold - slightly reduce
-                rsi_score = 40 - (30 - rsi12) * 0.5
-            elif rsi12 >= 50 and rsi12 <= 70:
-                # Strong zone - increase score
-                rsi_score = 40 + (rsi12 - 50) * 1.0
-            elif rsi12 >= 40 and rsi12 < 50:
-                # Slightly bullish
-                rsi_score = 35 + (rsi12 - 40) * 0.5
-            else:
-                # Neutral to weak
-                rsi_score = rsi12 * 0.7
-        except (KeyError, ValueError):
+        rsi12 = snap.rsi12
+        # Convert RSI to 0-100 score
+        # RSI 50 = neutral (50 points)
+        # RSI > 70 = overbought (reduce points)
+        # RSI < 30 = oversold (reduce points slightly)
+        # RSI 50-70 = strong (more points)
+        if rsi12 is None:
             rsi_score = 20.0
+        elif rsi12 > 70:
+            # Overbought - reduce score
+            rsi_score = 40 - (rsi12 - 70) * 1.5
+        elif rsi12 < 30:
+            # Oversold - slightly reduce
+            rsi_score = 40 - (30 - rsi12) * 0.5
+        elif rsi12 >= 50 and rsi12 <= 70:
+            # Strong zone - increase score
+            rsi_score = 40 + (rsi12 - 50) * 1.0
+        elif rsi12 >= 40 and rsi12 < 50:
+            # Slightly bullish
+            rsi_score = 35 + (rsi12 - 40) * 0.5
+        else:
+            # Neutral to weak
+            rsi_score = rsi12 * 0.7
 
         rsi_score = min(max(rsi_score, 0), 40)
 
         # 2. KDJ Score (30 points)
-        kdj_score = 0.0
-        try:
-            kdj_j = recent['KDJ_J'].iloc[-1]
-
-            # J-value analysis
-            if kdj_j > 100:
-                kdj_score = 10  # Overheated - bearish
-            elif kdj_j > 80:
-                kdj_score = 25  # Strong momentum - good
-            elif kdj_j > 50:
-                kdj_score = 30  # Strong - very good
-            elif kdj_j > 20:
-                kdj_score = 25  # Moderate
-            elif kdj_j > 0:
-                kdj_score = 15  # Weak
-            else:
-                kdj_score = 5   # Very weak - bearish
-        except (KeyError, ValueError):
+        kdj_j = snap.kdj_j
+        # J-value analysis
+        if kdj_j is None:
             kdj_score = 20.0
+        elif kdj_j > 100:
+            kdj_score = 10  # Overheated - bearish
+        elif kdj_j > 80:
+            kdj_score = 25  # Strong momentum - good
+        elif kdj_j > 50:
+            kdj_score = 30  # Strong - very good
+        elif kdj_j > 20:
+            kdj_score = 25  # Moderate
+        elif kdj_j > 0:
+            kdj_score = 15  # Weak
+        else:
+            kdj_score = 5   # Very weak - bearish
 
         kdj_score = min(max(kdj_score, 0), 30)
 
         # 3. MOM/ROC Score (30 points)
-        mom_score = 0.0
-        try:
-            mom = recent['MOM'].iloc[-1]
-            roc12 = recent['ROC12'].iloc[-1]
-
+        mom, roc12 = snap.mom, snap.roc12
+        if mom is None or roc12 is None:
+            mom_score = 15.0
+        else:
             # Normalize MOM and ROC
-            mom_score_adj = np.clip(mom / 10.0 * 15, -10, 15) + 10
-            roc_score_adj = np.clip(roc12 / 2.0 * 15, -10, 15) + 10
+            mom_score_adj = min(max(mom / 10.0 * 15, -10), 15) + 10
+            roc_score_adj = min(max(roc12 / 2.0 * 15, -10), 15) + 10
 
             mom_score = (mom_score_adj + roc_score_adj) / 2
-        except (KeyError, ValueError):
-            mom_score = 15.0
 
         momentum_score = rsi_score + kdj_score + mom_score
         return min(max(momentum_score, 0), 100)
 
-    def calculate_money_flow_score(self, df: pd.DataFrame, lookback: int = 20) -> float:
+    def calculate_money_flow_score(self, df, lookback: int = 20) -> float:
         """
         Calculate money flow score based on OBV, VR, volume.
 
+        Accepts an indicator DataFrame or an IndicatorSnapshot.
+
         Returns: Score 0-100
         """
-        if len(df) < lookback:
+        snap = self._snapshot(df, money_flow_lookback=lookback)
+        if snap.rows < lookback:
             return 50.0
 
-        recent = df.tail(lookback)
-
         # 1. OBV Trend Score (50 points)
-        obv_score = 0.0
-        try:
-            obv_start = recent['OBV'].iloc[0]
-            obv_end = recent['OBV'].iloc[-1]
-            obv_change = obv_end - obv_start
+        if None in (snap.obv_start, snap.obv_end, snap.volume_mean):
+            obv_score = 25.0
+        else:
+            obv_change = snap.obv_end - snap.obv_start
 
             # Normalize OBV change
             # Significant inflow = high score
             # Significant outflow = low score
-            avg_volume = recent['volume'].mean()
-            normalized_change = obv_change / (avg_volume * 100)  # Normalize by volume
+            normalized_change = _div(obv_change, snap.volume_mean * 100)  # Normalize by volume
 
             if normalized_change > 2.0:
                 obv_score = 50  # Strong inflow
@@ -242,34 +481,27 @@ class StockScorer:
                 obv_score = 10  # Moderate outflow
             else:
                 obv_score = 0   # Strong outflow
-        except (KeyError, ValueError):
-            obv_score = 25.0
 
         # 2. VR Score (30 points)
-        vr_score = 0.0
-        try:
-            vr = recent['VR'].iloc[-1]
-
-            if vr > 150:
-                vr_score = 30  # High VR - strong inflow
-            elif vr > 100:
-                vr_score = 25  # Moderate
-            elif vr > 70:
-                vr_score = 20  # Neutral
-            elif vr > 50:
-                vr_score = 15  # Slight outflow
-            else:
-                vr_score = 10  # Strong outflow
-        except (KeyError, ValueError):
+        vr = snap.vr
+        if vr is None:
             vr_score = 20.0
+        elif vr > 150:
+            vr_score = 30  # High VR - strong inflow
+        elif vr > 100:
+            vr_score = 25  # Moderate
+        elif vr > 70:
+            vr_score = 20  # Neutral
+        elif vr > 50:
+            vr_score = 15  # Slight outflow
+        else:
+            vr_score = 10  # Strong outflow
 
         # 3. Volume Change Score (20 points)
-        volume_score = 0.0
-        try:
-            recent_volume = recent['volume'].iloc[-1]
-            avg_volume = recent['volume'].iloc[:-1].mean()
-
-            volume_ratio = recent_volume / avg_volume
+        if snap.volume_last is None or snap.volume_prev_mean is None:
+            volume_score = 10.0
+        else:
+            volume_ratio = _div(snap.volume_last, snap.volume_prev_mean)
 
             if volume_ratio > 2.0:
                 volume_score = 20  # High volume spike
@@ -281,67 +513,34 @@ class StockScorer:
                 volume_score = 10  # Normal
             else:
                 volume_score = 5   # Low volume
-        except (KeyError, ValueError):
-            volume_score = 10.0
 
         money_flow_score = obv_score + vr_score + volume_score
         return min(max(money_flow_score, 0), 100)
 
-    def calculate_sentiment_score(self, df: pd.DataFrame, lookback: int = 10) -> float:
+    def calculate_sentiment_score(self, df, lookback: int = 10) -> float:
         """
         Calculate sentiment score based on consecutive days, amplitude.
 
+        Accepts an indicator DataFrame or an IndicatorSnapshot.
+
         Returns: Score 0-100
         """
-        if len(df) < lookback:
+        snap = self._snapshot(df, sentiment_lookback=lookback)
+        if snap.rows < lookback:
             return 50.0
 
-        recent = df.tail(lookback)
-
         # 1. Consecutive Up/Down Days Score (50 points)
-        consecutive_score = 0.0
-        try:
-            # Count consecutive up/down days
-            changes = df['close'].diff().tail(lookback - 1)
-
-            consecutive_up = 0
-            consecutive_down = 0
-
-            # Count from most recent
-            for change in reversed(changes):
-                if change > 0:
-                    consecutive_up += 1
-                    if consecutive_down > 0:
-                        break
-                elif change < 0:
-                    consecutive_down += 1
-                    if consecutive_up > 0:
-                        break
-
-            # Score based on consecutive movement
-            if consecutive_up >= 3:
-                consecutive_score = 50  # Strong bullish sentiment
-            elif consecutive_up >= 2:
-                consecutive_score = 40
-            elif consecutive_up == 1:
-                consecutive_score = 30
-            elif consecutive_down >= 3:
-                consecutive_score = 0   # Strong bearish sentiment
-            elif consecutive_down >= 2:
-                consecutive_score = 10
-            elif consecutive_down == 1:
-                consecutive_score = 20
-            else:
-                consecutive_score = 25  # Mixed/sideways
-        except (KeyError, ValueError):
+        # Signed streak over the last lookback-1 daily changes
+        if snap.streak is None:
             consecutive_score = 25.0
+        else:
+            consecutive_score = score_streak(snap.streak)
 
         # 2. Amplitude Score (30 points)
-        amplitude_score = 0.0
-        try:
-            high = recent['high'].max()
-            low = recent['low'].min()
-            amplitude = (high - low) / recent['close'].iloc[0] * 100
+        if None in (snap.high_max, snap.low_min, snap.close_start):
+            amplitude_score = 20.0
+        else:
+            amplitude = _div(snap.high_max - snap.low_min, snap.close_start) * 100
 
             # High amplitude means volatile
             if amplitude > 10:
@@ -354,15 +553,14 @@ class StockScorer:
                 amplitude_score = 15
             else:
                 amplitude_score = 10  # Low volatility - stable
-        except (KeyError, ValueError):
-            amplitude_score = 20.0
 
         # 3. Recent Performance Score (20 points)
-        performance_score = 0.0
-        try:
-            start_price = recent['close'].iloc[0]
-            end_price = recent['close'].iloc[-1]
-            return_pct = (end_price - start_price) / start_price * 100
+        if snap.close_start is None:
+            performance_score = 10.0
+        else:
+            start_price = snap.close_start
+            end_price = snap.close
+            return_pct = _div(end_price - start_price, start_price) * 100
 
             if return_pct > 10:
                 performance_score = 20  # Strong recent performance
@@ -376,27 +574,91 @@ class StockScorer:
                 performance_score = 5
             else:
                 performance_score = 0   # Very poor performance
-        except (KeyError, ValueError):
-            performance_score = 10.0
 
         sentiment_score = consecutive_score + amplitude_score + performance_score
         return min(max(sentiment_score, 0), 100)
 
-    def calculate_total_score(self, df: pd.DataFrame) -> dict:
+    def calculate_sentiment_series(self, df: pd.DataFrame, lookback: int = 10) -> pd.Series:
+        """
+        Calculate the sentiment score for every row at once.
+
+        Each value equals calculate_sentiment_score() on the history up to
+        that row. If df has a 'symbol' column, it is treated as a panel:
+        rows of each symbol must be contiguous and sorted by date.
+
+        Returns: Series of scores 0-100 aligned with df
+        """
+        if df.empty:
+            return pd.Series(dtype=float, name='sentiment_score')
+
+        close = df['close'].to_numpy(dtype=float)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        positions = np.arange(len(df))
+
+        if 'symbol' in df.columns:
+            groups = df['symbol'].to_numpy()
+            group_start = np.r_[True, groups[1:] != groups[:-1]]
+        else:
+            groups = None
+            group_start = positions == 0
+        group_first = np.maximum.accumulate(np.where(group_start, positions, 0))
+        enough = positions - group_first + 1 >= lookback
+
+        from indicators import signed_streak
+
+        # 1. Consecutive up/down days over the last lookback-1 changes
+        changes = np.r_[np.nan, np.diff(close)]
+        changes[group_start] = np.nan
+        consecutive_score = score_streak(
+            signed_streak(changes, groups=groups, window=lookback - 1))
+
+        # 2. Amplitude over the last lookback rows
+        window_high = pd.Series(high).rolling(lookback).max().to_numpy()
+        window_low = pd.Series(low).rolling(lookback).min().to_numpy()
+        start_close = pd.Series(close).shift(lookback - 1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            amplitude = (window_high - window_low) / start_close * 100
+            return_pct = (close - start_close) / start_close * 100
+        amplitude_score = np.select(
+            [amplitude > 10, amplitude > 7, amplitude > 5, amplitude > 3],
+            [30.0, 25.0, 20.0, 15.0], default=10.0)
+
+        # 3. Recent performance over the same window
+        performance_score = np.select(
+            [return_pct > 10, return_pct > 5, return_pct > 0,
+             return_pct > -5, return_pct > -10],
+            [20.0, 18.0, 15.0, 10.0, 5.0], default=0.0)
+
+        sentiment = np.clip(consecutive_score + amplitude_score + performance_score, 0, 100)
+        return pd.Series(np.where(enough, sentiment, 50.0), index=df.index,
+                         name='sentiment_score')
+
+    def calculate_total_score(self, df) -> dict:
         """
         Calculate comprehensive stock score.
 
+        Accepts an indicator DataFrame or an IndicatorSnapshot.
+
         Returns: Dictionary with all scores
         """
         print("\n" + "="*50)
         print("📊 CALCULATING STOCK SCORE")
         print("="*50)
 
+        return self.score_snapshot(self._snapshot(df))
+
+    def score_snapshot(self, snap: IndicatorSnapshot) -> dict:
+        """
+        Calculate the comprehensive score from a snapshot, without output.
+
+        Returns: Dictionary with all scores
+        """
         # Calculate individual dimension scores
-        trend = self.calculate_trend_score(df)
-        momentum = self.calculate_momentum_score(df)
-        money_flow = self.calculate_money_flow_score(df)
-        sentiment = self.calculate_sentiment_score(df)
+        trend = self.calculate_trend_score(snap)
+        momentum = self.calculate_momentum_score(snap)
+        money_flow = self.calculate_money_flow_score(snap)
+        sentiment = self.calculate_sentiment_score(snap)
 
         # Calculate weighted total
         total = (
@@ -407,21 +669,7 @@ class StockScorer:
         )
 
         # Determine level
-        if total >= 90:
-            level = "强烈买入"
-            level_emoji = "🟢🟢"
-        elif total >= 80:
-            level = "买入"
-            level_emoji = "🟢"
-        elif total >= 60:
-            level = "持有可能"
-            level_emoji = "🟡"
-        elif total >= 40:
-            level = "观望"
-            level_emoji = "🟡"
-        else:
-            level = "卖出"
-            level_emoji = "🔴"
+        level, level_emoji = score_level(total)
 
         result = {
             'total_score': total,
@@ -441,6 +689,309 @@ class StockScorer:
 
         return result
 
+    def score_panel(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score the latest row of every symbol in a symbol/date panel.
+
+        Rows of each symbol must be contiguous and sorted by date.
+
+        Returns: DataFrame with one row of scores per symbol
+        """
+        snapshots = IndicatorSnapshot.from_panel(panel)
+        if 'symbol' in panel.columns:
+            symbols = panel['symbol'].to_numpy()
+            symbols = symbols[np.r_[symbols[1:] != symbols[:-1], True]]
+        else:
+            symbols = [None] * len(snapshots)
+
+        rows = []
+        for symbol, snap in zip(symbols, snapshots):
+            result = self.score_snapshot(snap)
+            rows.append({
+                'symbol': symbol,
+                'total_score': result['total_score'],
+                'trend_score': result['trend_score'],
+                'momentum_score': result['momentum_score'],
+                'money_flow_score': result['money_flow_score'],
+                'sentiment_score': result['sentiment_score'],
+                'level': result['level'],
+            })
+
+        return pd.DataFrame(rows)
+
+    def score_as_of(self, df: pd.DataFrame, as_of) -> pd.DataFrame:
+        """
+        Score a symbol (or every symbol of a panel) as of past dates.
+
+        The indicators of indicators.py only look backwards (rolling
+        windows, EMAs, cumulative sums), so a bar's indicator row is the
+        same whether computed from the full history or from the history up
+        to that bar. Each date is located by binary search and scored from
+        the rows up to it, so all dates share one indicator computation and
+        nothing after a date is used.
+
+        Args:
+            df: Indicator DataFrame of one symbol, or a symbol/date panel
+                with rows of each symbol contiguous and sorted by date
+            as_of: Dates to score; each uses the last bar on or before it
+
+        Returns: DataFrame with one row per (symbol, as-of date) with data,
+            including the date of the bar that was scored
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        symbols = df['symbol'].to_numpy() if 'symbol' in df.columns else None
+        starts, rows = as_of_rows(df['date'], as_of, symbols)
+        group, order = np.nonzero(rows >= 0)
+        ends = rows[group, order]
+
+        def column(name):
+            if name not in df.columns:
+                return None
+            return df[name].to_numpy(dtype=float)
+
+        snapshots = IndicatorSnapshot.from_columns(column, ends, ends - starts[group] + 1)
+        targets = pd.to_datetime(pd.Series(as_of)).to_numpy()
+        dates = df['date'].to_numpy()
+        closes = df['close'].to_numpy()
+
+        records = []
+        for i, end, snap in zip(order, ends, snapshots):
+            result = self.score_snapshot(snap)
+            record = {} if symbols is None else {'symbol': symbols[end]}
+            record.update({
+                'as_of': targets[i],
+                'date': dates[end],
+                'close': closes[end],
+                'total_score': result['total_score'],
+                'trend_score': result['trend_score'],
+                'momentum_score': result['momentum_score'],
+                'money_flow_score': result['money_flow_score'],
+                'sentiment_score': result['sentiment_score'],
+                'level': result['level'],
+                'level_emoji': result['level_emoji'],
+            })
+            records.append(record)
+
+        return pd.DataFrame(records)
+
+
+def _hash_frame(df: pd.DataFrame) -> str:
+    """Stable content hash of a DataFrame's values."""
+    hashed = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()
+
+
+def _date_key(value) -> str:
+    """Normalize a date value to YYYY-MM-DD."""
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class IncrementalScorer:
+    """
+    Rescore only the symbols whose scoring inputs changed.
+
+    For every symbol the state file keeps the last scored date, a
+    fingerprint of that bar, and a fingerprint of the last SCORE_WINDOW
+    rows of the scorer's input columns (which fully determine the score).
+    Each run classifies a symbol as:
+
+    - skipped: inputs unchanged, the cached result is reused
+    - rescored: new bars on top of an unchanged history
+    - invalidated: the previously scored bar was revised or removed
+      (e.g. re-adjusted prices), so the cached state is dropped
+    """
+
+    STATE_VERSION = 1
+
+    def __init__(self, scorer: StockScorer, state_file: str = None):
+        """Initialize with a scorer and an optional JSON state file."""
+        self.scorer = scorer
+        self.state_file = state_file
+        self.symbols = {}
+        self.summary = {'rescored': 0, 'skipped': 0, 'invalidated': 0}
+
+        if state_file and os.path.exists(state_file):
+            self._load_state()
+
+    def _weights(self) -> dict:
+        return {
+            'trend': self.scorer.trend_weight,
+            'momentum': self.scorer.momentum_weight,
+            'money_flow': self.scorer.money_flow_weight,
+            'sentiment': self.scorer.sentiment_weight
+        }
+
+    def _load_state(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Warning: Ignoring unreadable state file {self.state_file}: {e}")
+            return
+
+        # Cached results are only valid for the same model and weights
+        if (state.get('version') == self.STATE_VERSION
+                and state.get('weights') == self._weights()):
+            self.symbols = state.get('symbols', {})
+
+    def save_state(self):
+        """Write the per-symbol fingerprints and results to the state file."""
+        if not self.state_file:
+            return
+
+        state = {
+            'version': self.STATE_VERSION,
+            'weights': self._weights(),
+            'symbols': self.symbols
+        }
+        tmp_file = f"{self.state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_file, self.state_file)
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """Fingerprint of everything the scorer reads from df."""
+        columns = [c for c in SCORE_COLUMNS if c in df.columns]
+        window = df[columns].tail(SCORE_WINDOW)
+        return f"{min(len(df), SCORE_WINDOW)}:{','.join(columns)}:{_hash_frame(window)}"
+
+    def score(self, symbol: str, df: pd.DataFrame) -> tuple:
+        """
+        Score one symbol, reusing the cached result when possible.
+
+        Returns: (result dict, status) where status is 'skipped',
+        'rescored' or 'invalidated'
+        """
+        columns = [c for c in SCORE_COLUMNS if c in df.columns]
+        last_date = _date_key(df['date'].iloc[-1])
+        fingerprint = self.fingerprint(df)
+        cached = self.symbols.get(symbol)
+
+        if not cached:
+            status = 'rescored'
+        elif cached['last_date'] == last_date and cached['fingerprint'] == fingerprint:
+            status = 'skipped'
+        else:
+            # New bars are only an update if the bar scored last time is unchanged
+            previous = df[pd.to_datetime(df['date']) == pd.Timestamp(cached['last_date'])]
+            if (last_date <= cached['last_date'] or previous.empty
+                    or _hash_frame(previous[columns]) != cached['last_bar']):
+                status = 'invalidated'
+            else:
+                status = 'rescored'
+
+        self.summary[status] += 1
+        if status == 'skipped':
+            return cached['result'], status
+
+        result = self.scorer.score_snapshot(IndicatorSnapshot.from_frame(df))
+        self.symbols[symbol] = {
+            'last_date': last_date,
+            'rows': len(df),
+            'last_bar': _hash_frame(df[columns].tail(1)),
+            'fingerprint': fingerprint,
+            'result': result
+        }
+        return result, status
+
+    def score_universe(self, universe: dict) -> dict:
+        """
+        Score every symbol of a {symbol: DataFrame} universe.
+
+        Returns: {symbol: result dict}; counts are in self.summary
+        """
+        results = {}
+        for symbol, df in universe.items():
+            if df.empty:
+                continue
+            results[symbol], _ = self.score(symbol, df)
+
+        self.save_state()
+        return results
+
+
+class MultiTimeframeScorer:
+    """
+    Blend the scores of one daily history on several timeframes.
+
+    Each timeframe's bars are resampled from the daily bars (see
+    timeframes.py) and get their own indicators. The resampled indicator
+    frames are cached by timeframe and a hash of the daily OHLCV columns,
+    so scoring the same history again only rescores.
+    """
+
+    # Resampled indicator frames kept in the cache
+    CACHE_SIZE = 256
+
+    def __init__(self, scorer: StockScorer, timeframes: dict):
+        """
+        Initialize with a scorer and {timeframe: blend weight}.
+
+        Raises:
+            ValueError: If a timeframe is unknown or the weights do not sum
+                to a positive number
+        """
+        from timeframes import parse_timeframe
+
+        self.scorer = scorer
+        self.timeframes = {}
+        for timeframe, weight in timeframes.items():
+            self.timeframes[parse_timeframe(timeframe)] = weight
+        if sum(self.timeframes.values()) <= 0:
+            raise ValueError("Timeframe weights must sum to a positive number")
+        self.cache = OrderedDict()
+        self.summary = {'hits': 0, 'misses': 0}
+
+    def indicators(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """Indicators of df's daily bars resampled to timeframe, cached."""
+        from timeframes import AGGREGATIONS, resample_bars
+
+        columns = ['date'] + [c for c in AGGREGATIONS if c in df.columns]
+        key = (timeframe, _hash_frame(df[columns]))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.summary['hits'] += 1
+            return self.cache[key]
+
+        self.summary['misses'] += 1
+        bars = resample_bars(df[columns], timeframe).reset_index(drop=True)
+        result = with_indicators(bars)
+        self.cache[key] = result
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return result
+
+    def score(self, df: pd.DataFrame) -> dict:
+        """
+        Score daily bars on every timeframe and blend the results.
+
+        Returns: Dictionary like StockScorer.score_snapshot() with the
+        blended scores, plus 'timeframes': {timeframe: result dict}
+        """
+        results = {}
+        for timeframe in self.timeframes:
+            snapshot = IndicatorSnapshot.from_frame(self.indicators(df, timeframe))
+            results[timeframe] = self.scorer.score_snapshot(snapshot)
+
+        total_weight = sum(self.timeframes.values())
+        blended = {}
+        for key in ('total_score', 'trend_score', 'momentum_score',
+                    'money_flow_score', 'sentiment_score'):
+            blended[key] = sum(results[tf][key] * weight
+                               for tf, weight in self.timeframes.items()) / total_weight
+
+        level, level_emoji = score_level(blended['total_score'])
+        return {
+            **blended,
+            'level': level,
+            'level_emoji': level_emoji,
+            'weights': results[next(iter(results))]['weights'],
+            'timeframes': results,
+        }
+
 
 def load_data(input_file: str) -> pd.DataFrame:
     """Load indicators data from CSV file."""
@@ -465,27 +1016,30 @@ def load_data(input_file: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def score_row(result: dict, df: pd.DataFrame) -> dict:
+    """Flatten a score result and its latest bar into one output row."""
+    return {
+        'date': df['date'].iloc[-1],
+        'close': df['close'].iloc[-1],
+        'total_score': result['total_score'],
+        'trend_score': result['trend_score'],
+        'momentum_score': result['momentum_score'],
+        'money_flow_score': result['money_flow_score'],
+        'sentiment_score': result['sentiment_score'],
+        'trend_weight': result['weights']['trend'],
+        'momentum_weight': result['weights']['momentum'],
+        'money_flow_weight': result['weights']['money_flow'],
+        'sentiment_weight': result['weights']['sentiment'],
+        'level': result['level'],
+        'level_emoji': result['level_emoji']
+    }
+
+
 def save_scores(result: dict, df: pd.DataFrame, output_file: str):
     """Save scores to CSV file."""
     try:
         # Create scores DataFrame
-        scores_data = {
-            'date': df['date'].iloc[-1],
-            'close': df['close'].iloc[-1],
-            'total_score': result['total_score'],
-            'trend_score': result['trend_score'],
-            'momentum_score': result['momentum_score'],
-            'money_flow_score': result['money_flow_score'],
-            'sentiment_score': result['sentiment_score'],
-            'trend_weight': result['weights']['trend'],
-            'momentum_weight': result['weights']['momentum'],
-            'money_flow_weight': result['weights']['money_flow'],
-            'sentiment_weight': result['weights']['sentiment'],
-            'level': result['level'],
-            'level_emoji': result['level_emoji']
-        }
-
-        scores_df = pd.DataFrame([scores_data])
+        scores_df = pd.DataFrame([score_row(result, df)])
         scores_df.to_csv(output_file, index=False, encoding='utf-8-sig')
 
         print(f"\n✅ Scores saved to: {output_file}")
@@ -494,6 +1048,34 @@ def save_scores(result: dict, df: pd.DataFrame, output_file: str):
         print(f"❌ Error saving scores: {e}")
 
 
+def save_universe_scores(results: dict, universe: dict, output_file: str):
+    """Save one score row per symbol to CSV file, best first."""
+    try:
+        rows = [{'symbol': symbol, **score_row(result, universe[symbol])}
+                for symbol, result in results.items()]
+        scores_df = pd.DataFrame(rows)
+        if not scores_df.empty:
+            scores_df = scores_df.sort_values('total_score', ascending=False)
+        scores_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+
+        print(f"\n✅ Scores for {len(rows)} symbols saved to: {output_file}")
+
+    except Exception as e:
+        print(f"❌ Error saving scores: {e}")
+
+
+def append_history(db_path: str, rows: list):
+    """Append score rows to the score history database."""
+    from score_store import ScoreHistoryStore
+
+    try:
+        with ScoreHistoryStore(db_path) as store:
+            inserted = store.append(rows)
+        print(f"✅ Score history: {inserted} new, {len(rows) - inserted} already recorded ({db_path})")
+    except Exception as e:
+        print(f"❌ Error saving score history: {e}")
+
+
 def print_score_report(result: dict, df: pd.DataFrame):
     """Print detailed score report."""
     print("\n" + "="*50)
@@ -523,7 +1105,7 @@ def print_score_report(result: dict, df: pd.DataFrame):
     print(f"\n   综合评分 (Total Score): {result['total_score']:>6.1f}/100")
     print(f"   等级 (Level): {result['level_emoji']} {result['level']}")
     print(f"   当前价格: {df['close'].iloc[-1]:.2f}元")
-    print(f"   分析日期: {df['date'].iloc[-1]}")
+    print(f"   分析日期: {_date_key(df['date'].iloc[-1])}")
 
 
 def parse_weights(weights_str: str) -> dict:
@@ -552,19 +1134,164 @@ def parse_weights(weights_str: str) -> dict:
     return weights
 
 
+def score_universe_dir(args) -> int:
+    """Score every symbol in args.input_dir, skipping unchanged ones."""
+    from panel import load_universe
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    universe = load_universe(args.input_dir)
+    if not universe:
+        print(f"❌ Error: No CSV files found in {args.input_dir}")
+        sys.exit(1)
+
+    if args.timeframe != 'daily':
+        universe = {symbol: to_timeframe(df, args.timeframe) for symbol, df in universe.items()}
+
+    weights = parse_weights(args.weights)
+    scorer = StockScorer(
+        trend_weight=weights['trend'],
+        momentum_weight=weights['momentum'],
+        money_flow_weight=weights['money_flow'],
+        sentiment_weight=weights['sentiment']
+    )
+
+    incremental = IncrementalScorer(scorer, state_file=args.state)
+    results = incremental.score_universe(universe)
+
+    save_universe_scores(results, universe, args.output)
+
+    if args.history:
+        rows = [{'symbol': symbol, **score_row(result, universe[symbol])}
+                for symbol, result in results.items()]
+        append_history(args.history, rows)
+
+    summary = incremental.summary
+    print(f"\n📊 Symbols: {len(results)} | Rescored: {summary['rescored']} | "
+          f"Skipped: {summary['skipped']} | Invalidated: {summary['invalidated']}")
+
+    return 0
+
+
+def with_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Return df with indicators, calculating them (quietly) if it only has OHLCV data."""
+    if 'MA5' in df.columns:
+        return df
+    from indicators import calculate_all_indicators
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return calculate_all_indicators(df)
+
+
+def to_timeframe(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Resample daily bars to timeframe and calculate their indicators."""
+    from timeframes import resample_bars
+
+    if timeframe == 'daily':
+        return df
+    df = df.assign(date=pd.to_datetime(df['date'])).sort_values('date', kind='stable')
+    return with_indicators(resample_bars(df, timeframe).reset_index(drop=True))
+
+
+def parse_blend(blend_str: str) -> dict:
+    """
+    Parse timeframe blend weights ("daily=0.5,weekly=0.3,monthly=0.2").
+
+    Raises:
+        ValueError: If the format is invalid
+    """
+    from timeframes import parse_timeframe
+
+    blend = {}
+    for item in blend_str.split(','):
+        timeframe, sep, weight = item.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid blend item: {item} (expected timeframe=weight)")
+        blend[parse_timeframe(timeframe)] = float(weight)
+    return blend
+
+
+def score_as_of_dates(args) -> int:
+    """Score --input or every symbol of --input-dir as of the --as-of dates."""
+    from panel import load_universe, to_panel
+
+    dates = [d.strip() for d in args.as_of.split(',') if d.strip()]
+    try:
+        pd.to_datetime(pd.Series(dates))
+    except ValueError as e:
+        print(f"❌ Error: Invalid --as-of date: {e}")
+        sys.exit(1)
+
+    if args.input_dir:
+        if not os.path.isdir(args.input_dir):
+            print(f"❌ Error: Input directory not found: {args.input_dir}")
+            sys.exit(1)
+        universe = load_universe(args.input_dir)
+        if not universe:
+            print(f"❌ Error: No CSV files found in {args.input_dir}")
+            sys.exit(1)
+        data = to_panel({symbol: with_indicators(df) for symbol, df in universe.items()})
+    else:
+        if not os.path.exists(args.input):
+            print(f"❌ Error: Input file not found: {args.input}")
+            sys.exit(1)
+        data = load_data(args.input)
+        if data.empty:
+            sys.exit(1)
+        data['date'] = pd.to_datetime(data['date'])
+        data = with_indicators(data.sort_values('date', kind='stable').reset_index(drop=True))
+
+    weights = parse_weights(args.weights)
+    scorer = StockScorer(
+        trend_weight=weights['trend'],
+        momentum_weight=weights['momentum'],
+        money_flow_weight=weights['money_flow'],
+        sentiment_weight=weights['sentiment']
+    )
+
+    try:
+        scores = scorer.score_as_of(data, dates)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if scores.empty:
+        print(f"❌ Error: No data on or before {dates[0] if len(dates) == 1 else 'the --as-of dates'}")
+        sys.exit(1)
+
+    scores.to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"\n✅ {len(scores)} as-of scores saved to: {args.output}")
+
+    if not args.quiet:
+        columns = [c for c in ('symbol', 'as_of', 'date', 'close', 'total_score', 'level')
+                   if c in scores.columns]
+        print(scores[columns].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Calculate comprehensive stock score",
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
 
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+
+    source.add_argument(
         '--input',
         type=str,
-        required=True,
         help='Input CSV file with indicators'
     )
 
+    source.add_argument(
+        '--input-dir',
+        type=str,
+        help='Directory of per-symbol indicator CSV files (universe run)'
+    )
+
     parser.add_argument(
         '--output',
         type=str,
@@ -579,6 +1306,48 @@ def main():
         help='Custom weights (format: trend=0.4,momentum=0.3,...)'
     )
 
+    parser.add_argument(
+        '--state',
+        type=str,
+        default=None,
+        help='State file for incremental universe rescoring (with --input-dir)'
+    )
+
+    parser.add_argument(
+        '--history',
+        type=str,
+        default=None,
+        help='Append scores to this score history database (SQLite)'
+    )
+
+    parser.add_argument(
+        '--symbol',
+        type=str,
+        default=None,
+        help='Symbol for the history record (default: derived from --input)'
+    )
+
+    parser.add_argument(
+        '--timeframe',
+        type=str,
+        default='daily',
+        help='Score daily input resampled to weekly, monthly or Nd bars (default: daily)'
+    )
+
+    parser.add_argument(
+        '--blend',
+        type=str,
+        default=None,
+        help='Blend timeframe scores of --input (format: daily=0.5,weekly=0.3,monthly=0.2)'
+    )
+
+    parser.add_argument(
+        '--as-of',
+        type=str,
+        default=None,
+        help='Score as of past dates only (comma-separated YYYY-MM-DD), without look-ahead'
+    )
+
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -587,6 +1356,29 @@ def main():
 
     args = parser.parse_args()
 
+    from timeframes import parse_timeframe
+
+    try:
+        args.timeframe = parse_timeframe(args.timeframe)
+        blend = parse_blend(args.blend) if args.blend else None
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.timeframe != 'daily' or blend:
+        if args.history or args.as_of:
+            parser.error('--history and --as-of score daily bars only')
+    if blend and (args.input_dir or args.timeframe != 'daily'):
+        parser.error('--blend needs --input and daily bars')
+
+    if args.as_of:
+        if args.history or args.state:
+            parser.error('--as-of cannot be combined with --history or --state')
+        return score_as_of_dates(args)
+
+    if args.input_dir:
+        return score_universe_dir(args)
+
     # Validate input file
     try:
         open(args.input, 'r')
@@ -612,14 +1404,35 @@ def main():
     )
 
     # Calculate scores
-    result = scorer.calculate_total_score(df)
+    if blend:
+        try:
+            multi = MultiTimeframeScorer(scorer, blend)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        result = multi.score(df)
+    else:
+        df = to_timeframe(df, args.timeframe)
+        result = scorer.calculate_total_score(df)
 
     # Save scores
     save_scores(result, df, args.output)
 
+    if args.history:
+        from panel import symbol_from_path
+        symbol = args.symbol or symbol_from_path(args.input)
+        append_history(args.history, [{'symbol': symbol, **score_row(result, df)}])
+
     # Print report
     if not args.quiet:
         print_score_report(result, df)
+        if blend:
+            total_weight = sum(multi.timeframes.values())
+            print("\n📋 Timeframes:")
+            for timeframe, tf_result in result['timeframes'].items():
+                print(f"   {timeframe:<9} | Score: {tf_result['total_score']:>6.1f}/100 | "
+                      f"Weight: {multi.timeframes[timeframe] / total_weight * 100:>4.0f}% | "
+                      f"{tf_result['level_emoji']} {tf_result['level']}")
 
     return 0
 
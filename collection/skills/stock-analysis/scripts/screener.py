@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Indicator Screener for Stock Analysis
+
+Filters a symbol/date panel of indicators with an expression such as
+
+    RSI12 < 30 and MA5 > MA20 and VR > 150
+
+The expression is parsed with Python's grammar, checked against a small
+whitelist (column names, numbers, arithmetic, comparisons, and/or/not and
+the functions in FUNCTIONS) and compiled into NumPy operations over whole
+panel columns, so every symbol and date is evaluated at once.
+
+Missing values follow SQL's three-valued logic: a comparison with a
+missing value is unknown, `not` of an unknown is unknown, `and`/`or` are
+unknown unless the known operands decide them, and a row only matches if
+the whole expression is true. So `RSI12 != 50` and `not RSI12 > 45` do not
+match warm-up rows where RSI12 is missing.
+
+Functions:
+    abs(x)                Absolute value
+    prev(x, n=1)          Value n rows earlier for the same symbol
+    cross_above(a, b)     a crossed above b on this row
+    cross_below(a, b)     a crossed below b on this row
+
+Usage:
+    python screener.py --input-dir indicators/ --expr "RSI12 < 30 and MA5 > MA20 and VR > 150"
+    python screener.py --input-dir indicators/ --expr "cross_above(MACD_DIF, MACD_DEA)" --latest
+    python screener.py --input panel.csv --expr "KDJ_J < 0" --since 2024-01-01 --output matches.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import sys
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Function name -> (minimum, maximum) number of arguments
+FUNCTIONS = {
+    'abs': (1, 1),
+    'prev': (1, 2),
+    'cross_above': (2, 2),
+    'cross_below': (2, 2),
+}
+
+# AST operator -> NumPy ufunc name, looked up when compiling so numpy stays lazy
+_COMPARISONS = {
+    ast.Lt: 'less', ast.LtE: 'less_equal', ast.Gt: 'greater',
+    ast.GtE: 'greater_equal', ast.Eq: 'equal', ast.NotEq: 'not_equal',
+}
+
+_ARITHMETIC = {
+    ast.Add: 'add', ast.Sub: 'subtract', ast.Mult: 'multiply',
+    ast.Div: 'divide', ast.Mod: 'mod', ast.Pow: 'power',
+}
+
+
+class PanelContext:
+    """Column arrays of a symbol/date panel, converted once and shared by all nodes."""
+
+    def __init__(self, panel: pd.DataFrame):
+        self.panel = panel
+        self.arrays = {}
+        self._position = None
+
+    def column(self, name: str):
+        if name not in self.arrays:
+            self.arrays[name] = self.panel[name].to_numpy(dtype=float)
+        return self.arrays[name]
+
+    @property
+    def position(self):
+        """Row number of every row within its symbol."""
+        if self._position is None:
+            n = len(self.panel)
+            rows = np.arange(n)
+            if 'symbol' in self.panel.columns:
+                symbols = self.panel['symbol'].to_numpy()
+                starts = np.r_[True, symbols[1:] != symbols[:-1]]
+            else:
+                starts = np.r_[True, np.zeros(max(n - 1, 0), dtype=bool)]
+            self._position = rows - np.maximum.accumulate(np.where(starts, rows, 0))
+        return self._position
+
+    def shift(self, values, periods: int):
+        """Values `periods` rows earlier within each symbol, NaN before its start."""
+        shifted = np.full(len(values), np.nan)
+        if periods < len(values):
+            shifted[periods:] = values[:len(values) - periods]
+        shifted[self.position < periods] = np.nan
+        return shifted
+
+
+def _logical(values):
+    """Truth values as floats: 1.0 true, 0.0 false, NaN unknown (numbers: non-zero is true)."""
+    if values.dtype == bool:
+        return values.astype(float)
+    return np.where(np.isnan(values), np.nan, values != 0)
+
+
+def _compare(func, a, b):
+    """Comparison as truth values, unknown where either operand is missing."""
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isnan(a) | np.isnan(b), np.nan, func(a, b))
+
+
+def _and(a, b):
+    """Three-valued and: false if either is false, else unknown if either is unknown."""
+    return np.where((a == 0) | (b == 0), 0.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 1.0))
+
+
+def _or(a, b):
+    """Three-valued or: true if either is true, else unknown if either is unknown."""
+    return np.where((a == 1) | (b == 1), 1.0, np.where(np.isnan(a) | np.isnan(b), np.nan, 0.0))
+
+
+def _truth(values):
+    """Boolean mask of the rows where values are true (unknown is not true)."""
+    if values.dtype == bool:
+        return values
+    return (values != 0) & ~np.isnan(values)
+
+
+class Screen:
+    """
+    A compiled screener expression.
+
+    Attributes:
+        expression: Source text
+        columns: Panel columns the expression reads
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.columns = set()
+        try:
+            tree = ast.parse(expression.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {e.msg}") from None
+        self._evaluate = self._compile(tree.body)
+
+    def _compile(self, node):
+        """Translate an AST node into a function of a PanelContext."""
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value) for value in node.values]
+            combine = _and if isinstance(node.op, ast.And) else _or
+
+            def boolean(ctx):
+                result = _logical(parts[0](ctx))
+                for part in parts[1:]:
+                    result = combine(result, _logical(part(ctx)))
+                return result
+            return boolean
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda ctx: 1.0 - _logical(operand(ctx))
+            if isinstance(node.op, ast.USub):
+                return lambda ctx: -operand(ctx)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+            left, right = self._compile(node.left), self._compile(node.right)
+            func = getattr(np, _ARITHMETIC[type(node.op)])
+
+            def arithmetic(ctx):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    return func(left(ctx), right(ctx))
+            return arithmetic
+
+        if isinstance(node, ast.Compare):
+            if not all(type(op) in _COMPARISONS for op in node.ops):
+                raise ValueError("Only <, <=, >, >=, == and != comparisons are allowed")
+            operands = [self._compile(node.left)] + [self._compile(c) for c in node.comparators]
+            funcs = [getattr(np, _COMPARISONS[type(op)]) for op in node.ops]
+
+            def compare(ctx):
+                # a < b < c is (a < b) and (b < c), as in Python
+                values = [operand(ctx) for operand in operands]
+                result = _compare(funcs[0], values[0], values[1])
+                for i, func in enumerate(funcs[1:], start=1):
+                    result = _and(result, _compare(func, values[i], values[i + 1]))
+                return result
+            return compare
+
+        if isinstance(node, ast.Name):
+            if node.id in FUNCTIONS:
+                raise ValueError(f"'{node.id}' is a function, call it with arguments")
+            self.columns.add(node.id)
+            return lambda ctx: ctx.column(node.id)
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            value = float(node.value)
+            return lambda ctx: np.full(len(ctx.panel), value)
+
+        if isinstance(node, ast.Call):
+            return self._compile_call(node)
+
+        raise ValueError(f"Unsupported syntax in expression: {ast.unparse(node)}")
+
+    def _compile_call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            name = ast.unparse(node.func)
+            raise ValueError(f"Unknown function: {name} (available: {', '.join(FUNCTIONS)})")
+        if node.keywords:
+            raise ValueError(f"{node.func.id}() takes positional arguments only")
+
+        name = node.func.id
+        low, high = FUNCTIONS[name]
+        if not low <= len(node.args) <= high:
+            raise ValueError(f"{name}() takes {low}" + (f"-{high}" if high != low else '')
+                             + f" arguments, got {len(node.args)}")
+
+        if name == 'prev':
+            periods = 1
+            if len(node.args) == 2:
+                arg = node.args[1]
+                if not (isinstance(arg, ast.Constant) and isinstance(arg.value, int)
+                        and arg.value >= 1):
+                    raise ValueError("prev() periods must be a positive integer")
+                periods = arg.value
+            values = self._compile(node.args[0])
+            return lambda ctx: ctx.shift(values(ctx), periods)
+
+        args = [self._compile(arg) for arg in node.args]
+        if name == 'abs':
+            return lambda ctx: np.abs(args[0](ctx))
+
+        above = name == 'cross_above'
+
+        def cross(ctx):
+            a, b = args[0](ctx), args[1](ctx)
+            a_prev, b_prev = ctx.shift(a, 1), ctx.shift(b, 1)
+            if above:
+                return _and(_compare(np.greater, a, b), _compare(np.less_equal, a_prev, b_prev))
+            return _and(_compare(np.less, a, b), _compare(np.greater_equal, a_prev, b_prev))
+        return cross
+
+    def evaluate(self, panel: pd.DataFrame):
+        """
+        Evaluate the expression on every row of a panel.
+
+        Rows of each symbol must be contiguous and sorted by date.
+
+        Returns:
+            Boolean NumPy array, one value per row
+
+        Raises:
+            ValueError: If the panel lacks a column the expression reads
+        """
+        missing = sorted(self.columns - set(panel.columns))
+        if missing:
+            raise ValueError(f"Unknown column(s): {', '.join(missing)}")
+        if panel.empty:
+            return np.zeros(0, dtype=bool)
+
+        return _truth(self._evaluate(PanelContext(panel)))
+
+    def matches(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """Rows of the panel that satisfy the expression."""
+        return panel[self.evaluate(panel)]
+
+
+def load_screen_panel(input_dir: str, columns: set, pattern: str = "*.csv") -> pd.DataFrame:
+    """
+    Load only the date and the given columns of every CSV in input_dir into
+    a symbol/date panel.
+    """
+    from panel import universe_files
+
+    frames = []
+    for symbol, path in universe_files(input_dir, pattern).items():
+        try:
+            df = pd.read_csv(path, usecols=lambda c: c == 'date' or c in columns)
+        except Exception as e:
+            print(f"⚠️  Warning: Skipping {path}: {e}")
+            continue
+        frames.append(df.assign(symbol=symbol))
+
+    if not frames:
+        return pd.DataFrame()
+
+    panel = pd.concat(frames, ignore_index=True)
+    panel['date'] = pd.to_datetime(panel['date'])
+    return panel.sort_values(['symbol', 'date'], kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Screen symbols and dates with an indicator expression",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    source = parser.add_mutually_exclusive_group(required=True)
+
+    source.add_argument(
+        '--input-dir',
+        type=str,
+        help='Directory of indicator CSV files, one per symbol'
+    )
+
+    source.add_argument(
+        '--input',
+        type=str,
+        help='Panel CSV file with symbol and date columns'
+    )
+
+    parser.add_argument(
+        '--expr',
+        type=str,
+        required=True,
+        help='Screen expression, e.g. "RSI12 < 30 and MA5 > MA20"'
+    )
+
+    parser.add_argument(
+        '--latest',
+        action='store_true',
+        help='Only screen the latest row of every symbol'
+    )
+
+    parser.add_argument(
+        '--since',
+        type=str,
+        default=None,
+        help='Only report matches on or after this date (YYYY-MM-DD)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save matches (symbol, date and the columns used) to a CSV file'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='Matches to print (default: 20)'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        screen = Screen(args.expr)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.input_dir:
+        if not os.path.isdir(args.input_dir):
+            print(f"❌ Error: Input directory not found: {args.input_dir}")
+            sys.exit(1)
+        panel = load_screen_panel(args.input_dir, screen.columns)
+    else:
+        if not os.path.exists(args.input):
+            print(f"❌ Error: Input file not found: {args.input}")
+            sys.exit(1)
+        panel = pd.read_csv(args.input, usecols=lambda c: c in ('symbol', 'date') or c in screen.columns)
+        panel['date'] = pd.to_datetime(panel['date'])
+        if 'symbol' in panel.columns:
+            panel = panel.sort_values(['symbol', 'date'], kind='stable').reset_index(drop=True)
+
+    if panel.empty:
+        print("❌ Error: No data files found")
+        sys.exit(1)
+
+    try:
+        mask = screen.evaluate(panel)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.latest:
+        if 'symbol' in panel.columns:
+            symbols = panel['symbol'].to_numpy()
+            mask &= np.r_[symbols[1:] != symbols[:-1], True]
+        else:
+            mask &= np.arange(len(panel)) == len(panel) - 1
+    if args.since:
+        mask &= (panel['date'] >= pd.Timestamp(args.since)).to_numpy()
+
+    columns = [c for c in ('symbol', 'date') if c in panel.columns] + sorted(screen.columns)
+    matches = panel.loc[mask, columns].reset_index(drop=True)
+
+    print(f"📊 {len(matches):,} matches in {len(panel):,} rows: {args.expr}")
+    if not matches.empty:
+        print(matches.head(args.limit).to_string(index=False))
+        if len(matches) > args.limit:
+            print(f"   ... {len(matches) - args.limit:,} more")
+
+    if args.output:
+        matches.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"✅ Matches saved to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Sector and Index Aggregates for Stock Analysis
+
+Builds one OHLCV series per sector (or index) from the daily bars of its
+constituents, so sectors can be run through the calculate_* functions and
+StockScorer like a single stock.
+
+Prices of constituents are not comparable, so a sector series is a chained
+index of weighted constituent returns: each day's close is the previous
+close times (1 + weighted mean return), and open, high and low are the
+weighted means of each constituent's open/high/low relative to its own
+previous close. Volume and amount are summed. All sums are grouped
+reductions over the whole symbol/date panel, one pass for every sector.
+
+Weighting:
+    equal      Every constituent with a return on that day counts the same
+    volume     Weighted by the constituent's volume on that day
+    cap        Weighted by market cap at the previous close; the mapping
+               needs a `shares` column, or a `cap` column with the cap at
+               the latest close
+
+The mapping is a CSV file with `symbol` and `sector` columns (a symbol may
+be listed under several sectors or indices), or a JSON {symbol: sector}.
+
+Usage:
+    python sectors.py --input-dir data/ --mapping sectors.csv --output-dir sectors/
+    python sectors.py --input-dir data/ --mapping sectors.csv --weighting cap --score
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+WEIGHTINGS = ['equal', 'volume', 'cap']
+
+# Starting level of every sector series
+BASE_LEVEL = 1000.0
+
+
+def load_mapping(path: str) -> pd.DataFrame:
+    """
+    Load a symbol -> sector mapping.
+
+    Returns:
+        DataFrame with symbol and sector columns, plus shares or cap if the
+        CSV has them
+
+    Raises:
+        ValueError: If the mapping has no symbol and sector columns
+    """
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+        return pd.DataFrame({'symbol': list(mapping), 'sector': list(mapping.values())},
+                            dtype=str)
+
+    mapping = pd.read_csv(path, dtype={'symbol': str, 'sector': str})
+    missing = [c for c in ('symbol', 'sector') if c not in mapping.columns]
+    if missing:
+        raise ValueError(f"Mapping {path} is missing column(s): {', '.join(missing)}")
+    columns = [c for c in ('symbol', 'sector', 'shares', 'cap') if c in mapping.columns]
+    return mapping[columns].dropna(subset=['symbol', 'sector']).drop_duplicates(['symbol', 'sector'])
+
+
+def constituent_weights(rows: pd.DataFrame, weighting: str):
+    """
+    Weight of every constituent row in its sector on its date (not normalized).
+
+    Args:
+        rows: Panel rows joined with the mapping, with prev_close and
+            last_close columns
+        weighting: 'equal', 'volume' or 'cap'
+
+    Raises:
+        ValueError: If the weighting is unknown or cap weights lack shares/cap
+    """
+    if weighting == 'equal':
+        return np.ones(len(rows))
+    if weighting == 'volume':
+        return rows['volume'].to_numpy(dtype=float)
+    if weighting != 'cap':
+        raise ValueError(f"Unknown weighting: {weighting} (use {', '.join(WEIGHTINGS)})")
+
+    if 'shares' in rows.columns:
+        shares = rows['shares'].to_numpy(dtype=float)
+    elif 'cap' in rows.columns:
+        # Cap at the latest close -> share count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shares = rows['cap'].to_numpy(dtype=float) / rows['last_close'].to_numpy(dtype=float)
+    else:
+        raise ValueError("Cap weighting needs a 'shares' or 'cap' column in the mapping")
+    return shares * rows['prev_close'].to_numpy(dtype=float)
+
+
+def build_sector_series(panel: pd.DataFrame, mapping: pd.DataFrame,
+                        weighting: str = 'volume') -> dict:
+    """
+    Aggregate a daily symbol/date panel into one OHLCV series per sector.
+
+    Args:
+        panel: Daily bars with symbol, date, open, high, low, close, volume
+            (amount optional)
+        mapping: Output of load_mapping()
+        weighting: 'equal', 'volume' or 'cap'
+
+    Returns:
+        {sector: DataFrame with date, open, high, low, close, volume,
+        [amount,] constituents}, dates ascending
+
+    Raises:
+        ValueError: If the weighting is unknown or cap weights lack shares/cap
+    """
+    panel = panel.assign(date=pd.to_datetime(panel['date']))
+    panel = panel.sort_values(['symbol', 'date'], kind='stable').reset_index(drop=True)
+
+    # Previous close of the same symbol (NaN on its first row) and its latest close
+    close = panel['close'].to_numpy(dtype=float)
+    symbols = panel['symbol'].to_numpy()
+    prev_close = np.r_[np.nan, close[:-1]]
+    prev_close[np.r_[True, symbols[1:] != symbols[:-1]]] = np.nan
+    last = np.flatnonzero(np.r_[symbols[1:] != symbols[:-1], True])
+    panel['prev_close'] = prev_close
+    panel['last_close'] = np.repeat(close[last], np.diff(np.r_[-1, last]))
+
+    # One row per (symbol, sector) membership
+    rows = panel.merge(mapping, on='symbol', how='inner', sort=False)
+    if rows.empty:
+        return {}
+    prev = rows['prev_close'].to_numpy()
+
+    weights = constituent_weights(rows, weighting)
+    valid = np.isfinite(prev) & (prev > 0) & np.isfinite(weights) & (weights > 0)
+    weights = np.where(valid, weights, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = {name: np.where(valid, rows[name].to_numpy(dtype=float) / prev, 0.0)
+                  for name in ('open', 'high', 'low', 'close')}
+
+    sums = pd.DataFrame({
+        'sector': rows['sector'].to_numpy(),
+        'date': rows['date'].to_numpy(),
+        'weight': weights,
+        'volume': rows['volume'].to_numpy(dtype=float),
+        'constituents': np.ones(len(rows)),
+        **{name: weights * ratio for name, ratio in ratios.items()},
+    })
+    if 'amount' in rows.columns:
+        sums['amount'] = rows['amount'].to_numpy(dtype=float)
+    grouped = sums.groupby(['sector', 'date'], sort=True).sum()
+
+    # Weighted mean ratios; a date without valid constituents is flat
+    weight = grouped['weight'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = {name: np.where(weight > 0, grouped[name].to_numpy() / weight, 1.0)
+                for name in ratios}
+
+    sectors = grouped.index.get_level_values('sector').to_numpy()
+    first = np.r_[True, sectors[1:] != sectors[:-1]]
+    segment = np.cumsum(first) - 1
+
+    # Chain the close ratios per sector: cumulative product within each segment
+    log_ratio = np.log(mean['close'])
+    cumulative = np.cumsum(log_ratio)
+    offset = np.repeat(cumulative[first] - log_ratio[first], np.bincount(segment))
+    index_close = BASE_LEVEL * np.exp(cumulative - offset)
+    index_prev = np.where(first, index_close / mean['close'], np.r_[np.nan, index_close[:-1]])
+
+    result = pd.DataFrame({
+        'sector': sectors,
+        'date': grouped.index.get_level_values('date'),
+        'open': index_prev * mean['open'],
+        'high': index_prev * mean['high'],
+        'low': index_prev * mean['low'],
+        'close': index_close,
+        'volume': grouped['volume'].to_numpy(),
+    })
+    if 'amount' in grouped.columns:
+        result['amount'] = grouped['amount'].to_numpy()
+    result['constituents'] = grouped['constituents'].to_numpy().astype(int)
+
+    # Means of ratios need not bracket the mean close ratio
+    ohlc = result[['open', 'high', 'low', 'close']].to_numpy()
+    result['high'] = ohlc.max(axis=1)
+    result['low'] = ohlc.min(axis=1)
+
+    return {sector: group.drop(columns='sector').reset_index(drop=True)
+            for sector, group in result.groupby('sector', sort=True)}
+
+
+def score_sectors(series: dict, scorer=None) -> pd.DataFrame:
+    """
+    Calculate indicators and scores of every sector series.
+
+    Returns: DataFrame with one row of scores per sector, best first
+    """
+    from indicators import calculate_all_indicators
+    from panel import to_panel
+    from scoring import StockScorer
+
+    scorer = scorer or StockScorer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        universe = {sector: calculate_all_indicators(df.copy()) for sector, df in series.items()}
+    scores = scorer.score_panel(to_panel(universe)).rename(columns={'symbol': 'sector'})
+    return scores.sort_values('total_score', ascending=False).reset_index(drop=True)
+
+
+def _file_name(sector: str) -> str:
+    """Filesystem-safe file name of a sector series."""
+    return 'sector_' + re.sub(r'[\\/:*?"<>|\s]+', '_', str(sector)) + '.csv'
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build sector/index series from constituent bars",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of daily OHLCV CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--mapping',
+        type=str,
+        required=True,
+        help='CSV (symbol, sector[, shares|cap]) or JSON {symbol: sector} mapping'
+    )
+
+    parser.add_argument(
+        '--weighting',
+        type=str,
+        default='volume',
+        choices=WEIGHTINGS,
+        help='Constituent weighting (default: volume)'
+    )
+
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default=None,
+        help='Write one sector_<name>.csv per sector to this directory'
+    )
+
+    parser.add_argument(
+        '--score',
+        action='store_true',
+        help='Calculate indicators and scores of every sector and print a ranking'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save the sector ranking to a CSV file (with --score)'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+    if not os.path.exists(args.mapping):
+        print(f"❌ Error: Mapping file not found: {args.mapping}")
+        sys.exit(1)
+
+    from panel import load_universe, to_panel
+
+    universe = load_universe(args.input_dir)
+    if not universe:
+        print(f"❌ Error: No CSV files found in {args.input_dir}")
+        sys.exit(1)
+
+    try:
+        mapping = load_mapping(args.mapping)
+        series = build_sector_series(to_panel(universe), mapping, args.weighting)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if not series:
+        print("❌ Error: No symbol of the mapping was found in the input directory")
+        sys.exit(1)
+
+    unmapped = len(set(universe) - set(mapping['symbol']))
+    print(f"✅ {len(series)} sectors from {len(universe) - unmapped} symbols "
+          f"({args.weighting}-weighted, {unmapped} unmapped)")
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        for sector, df in series.items():
+            df.to_csv(os.path.join(args.output_dir, _file_name(sector)), index=False, encoding='utf-8-sig')
+        print(f"✅ Sector series saved to: {args.output_dir}")
+
+    if args.score:
+        scores = score_sectors(series)
+        print("\n📊 Sector ranking:")
+        print(scores.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
+        if args.output:
+            scores.to_csv(args.output, index=False, encoding='utf-8-sig')
+            print(f"\n✅ Sector scores saved to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
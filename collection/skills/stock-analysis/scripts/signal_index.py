@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Signal Event Index for Stock Analysis
+
+Precomputes common signal conditions (MA crossovers, MACD DIF/DEA crosses,
+KDJ J extremes, BOLL band breaks, volume surges) for every symbol and date
+once, and stores them as bitmaps: one bit per (symbol, date), packed eight
+dates to a byte with np.packbits and saved compressed. Boolean combinations
+such as `macd_golden & volume_surge` are then bitwise operations on the
+packed bytes of the whole universe.
+
+Signals are screener.py expressions over indicator columns, so custom ones
+can be added with --signal NAME=EXPR. Updates only re-read the CSV files
+that changed since the last run; files without indicator columns are run
+through calculate_all_indicators first.
+
+Usage:
+    python signal_index.py --input-dir indicators/ --index signals.npz
+    python signal_index.py --index signals.npz --query "macd_golden & volume_surge" --since 2021-01-01
+    python signal_index.py --index signals.npz --query "kdj_oversold & ~ma20_ma60_death" --output events.csv
+    python signal_index.py --index signals.npz --list
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+SIGNALS = {
+    'ma5_ma20_golden': 'cross_above(MA5, MA20)',
+    'ma5_ma20_death': 'cross_below(MA5, MA20)',
+    'ma20_ma60_golden': 'cross_above(MA20, MA60)',
+    'ma20_ma60_death': 'cross_below(MA20, MA60)',
+    'macd_golden': 'cross_above(MACD_DIF, MACD_DEA)',
+    'macd_death': 'cross_below(MACD_DIF, MACD_DEA)',
+    'kdj_overbought': 'KDJ_J > 100',
+    'kdj_oversold': 'KDJ_J < 0',
+    'boll_break_upper': 'cross_above(close, BOLL_UPPER)',
+    'boll_break_lower': 'cross_below(close, BOLL_LOWER)',
+    # Volume more than twice the average of the previous 5 days
+    'volume_surge': 'volume > 0.4 * (prev(volume, 1) + prev(volume, 2) + prev(volume, 3)'
+                    ' + prev(volume, 4) + prev(volume, 5))',
+}
+
+
+def _popcount_table():
+    """Number of set bits of every byte value."""
+    return np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+def _file_stamp(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_signal_frame(path: str, columns: set) -> pd.DataFrame:
+    """
+    Load the date and the given columns of one symbol's CSV file, calculating
+    the indicators first if the file only has OHLCV data.
+    """
+    df = pd.read_csv(path, usecols=lambda c: c == 'date' or c in columns)
+    if not columns.issubset(df.columns):
+        from indicators import calculate_all_indicators
+        from panel import load_symbol
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = calculate_all_indicators(load_symbol(path))
+        missing = sorted(columns - set(df.columns))
+        if missing:
+            raise ValueError(f"Missing column(s): {', '.join(missing)}")
+        df = df[['date'] + sorted(columns)]
+
+    df['date'] = pd.to_datetime(df['date'])
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+class SignalIndex:
+    """
+    Packed (symbol x date) bitmaps of signal conditions.
+
+    Attributes:
+        signals: {name: screener expression}
+        symbols: Symbol of every bitmap row
+        dates: Sorted datetime64[D] calendar of the bitmap columns
+        bits: {name: uint8 array of shape (symbols, ceil(dates / 8))}
+        present: Bitmap of the (symbol, date) rows that exist in the data
+        files: {symbol: [mtime_ns, size]} of the CSV files last indexed
+    """
+
+    def __init__(self, signals: dict = None):
+        self.signals = {}
+        self.screens = {}
+        self.symbols = []
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.bits = {}
+        self.present = np.zeros((0, 0), dtype=np.uint8)
+        self.files = {}
+        for name, expr in (SIGNALS if signals is None else signals).items():
+            self.add_signal(name, expr)
+
+    def add_signal(self, name: str, expr: str):
+        """
+        Add a signal; it is filled in for every symbol on the next update().
+
+        Raises:
+            ValueError: If the name is not an identifier or the expression is invalid
+        """
+        from screener import Screen
+
+        if not name.isidentifier():
+            raise ValueError(f"Invalid signal name: {name}")
+        self.screens[name] = Screen(expr)
+        self.signals[name] = expr
+        self.bits[name] = np.zeros_like(self.present)
+        # Existing files have not been evaluated for this signal yet
+        self.files = {}
+
+    @property
+    def columns(self) -> set:
+        """Indicator columns read by the signals."""
+        return set().union(*(screen.columns for screen in self.screens.values()))
+
+    def _bitmaps(self):
+        return [self.present] + [self.bits[name] for name in self.signals]
+
+    def _set_calendar(self, dates):
+        """Extend the calendar to include dates, moving existing bits to their new columns."""
+        calendar = np.union1d(self.dates, dates)
+        if len(calendar) == len(self.dates):
+            return
+
+        columns = np.searchsorted(calendar, self.dates)
+
+        def remap(packed):
+            old = np.unpackbits(packed, axis=1, count=len(self.dates)).astype(bool)
+            new = np.zeros((len(packed), len(calendar)), dtype=bool)
+            new[:, columns] = old
+            return np.packbits(new, axis=1)
+
+        self.present = remap(self.present)
+        for name in self.signals:
+            self.bits[name] = remap(self.bits[name])
+        self.dates = calendar
+
+    def _set_symbols(self, symbols: list) -> np.ndarray:
+        """Bitmap rows of symbols, appending rows for new ones."""
+        rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+        new = [s for s in dict.fromkeys(symbols) if s not in rows]
+        if new:
+            pad = np.zeros((len(new), self.present.shape[1]), dtype=np.uint8)
+            self.present = np.vstack([self.present, pad])
+            for name in self.signals:
+                self.bits[name] = np.vstack([self.bits[name], pad])
+            for symbol in new:
+                rows[symbol] = len(self.symbols)
+                self.symbols.append(symbol)
+        return np.array([rows[s] for s in symbols], dtype=np.intp)
+
+    def index_panel(self, panel: pd.DataFrame):
+        """
+        Replace the bitmap rows of every symbol in a panel with its signals.
+
+        Args:
+            panel: Symbol/date panel with the signal columns, rows of each
+                symbol contiguous and sorted by date
+        """
+        if panel.empty:
+            return
+
+        dates = panel['date'].to_numpy().astype('datetime64[D]')
+        self._set_calendar(np.unique(dates))
+
+        symbols = panel['symbol'].to_numpy()
+        changed = list(dict.fromkeys(symbols))
+        rows = self._set_symbols(changed)
+        local = pd.Index(changed).get_indexer(symbols)
+        columns = np.searchsorted(self.dates, dates)
+
+        masks = [np.ones(len(panel), dtype=bool)]
+        masks += [self.screens[name].evaluate(panel) for name in self.signals]
+        for bitmap, mask in zip(self._bitmaps(), masks):
+            block = np.zeros((len(changed), len(self.dates)), dtype=bool)
+            block[local[mask], columns[mask]] = True
+            bitmap[rows] = np.packbits(block, axis=1)
+
+    def update(self, input_dir: str, pattern: str = "*.csv") -> int:
+        """
+        Index the CSV files of input_dir that are new or changed since the
+        last update.
+
+        Returns:
+            Number of files read
+        """
+        from panel import universe_files
+
+        columns = self.columns
+        frames = []
+        stamps = {}
+        for symbol, path in universe_files(input_dir, pattern).items():
+            stamp = _file_stamp(path)
+            if self.files.get(symbol) == stamp:
+                continue
+            try:
+                df = load_signal_frame(path, columns)
+            except Exception as e:
+                print(f"⚠️  Warning: Skipping {path}: {e}")
+                continue
+            frames.append(df.assign(symbol=symbol))
+            stamps[symbol] = stamp
+
+        if frames:
+            self.index_panel(pd.concat(frames, ignore_index=True))
+            self.files.update(stamps)
+        return len(frames)
+
+    def _compile(self, node):
+        """Translate a query AST node into a function returning a packed bitmap."""
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr, ast.BitXor)):
+            func = {ast.BitAnd: np.bitwise_and, ast.BitOr: np.bitwise_or,
+                    ast.BitXor: np.bitwise_xor}[type(node.op)]
+            left, right = self._compile(node.left), self._compile(node.right)
+            return lambda: func(left(), right())
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+            operand = self._compile(node.operand)
+            return lambda: np.invert(operand())
+        if isinstance(node, ast.Name):
+            if node.id not in self.bits:
+                raise ValueError(f"Unknown signal: {node.id} (available: {', '.join(self.signals)})")
+            return lambda: self.bits[node.id]
+        raise ValueError(f"Unsupported syntax in query: {ast.unparse(node)} (use signal names, &, |, ^, ~)")
+
+    def query(self, expr: str, since: str = None, until: str = None):
+        """
+        Evaluate a boolean combination of signals over the whole universe.
+
+        Args:
+            expr: Signal names combined with & (and), | (or), ^ (xor), ~ (not)
+            since: First date to include (YYYY-MM-DD)
+            until: Last date to include (YYYY-MM-DD)
+
+        Returns:
+            Packed uint8 bitmap of matching (symbol, date) rows, in the
+            layout of self.bits
+
+        Raises:
+            ValueError: If the query is invalid
+        """
+        try:
+            tree = ast.parse(expr.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid query: {e.msg}") from None
+
+        # ~ also sets the bits of dates a symbol has no data for
+        result = np.bitwise_and(self._compile(tree.body)(), self.present)
+        if since or until:
+            in_range = np.ones(len(self.dates), dtype=bool)
+            if since:
+                in_range &= self.dates >= np.datetime64(since, 'D')
+            if until:
+                in_range &= self.dates <= np.datetime64(until, 'D')
+            result &= np.packbits(in_range)
+        return result
+
+    def events(self, bitmap) -> pd.DataFrame:
+        """(symbol, date) rows set in a packed bitmap, ordered by symbol and date."""
+        rows = np.flatnonzero(bitmap.any(axis=1))
+        hits = np.unpackbits(bitmap[rows], axis=1, count=len(self.dates))
+        row, column = np.nonzero(hits)
+        return pd.DataFrame({
+            'symbol': np.asarray(self.symbols, dtype=object)[rows[row]],
+            'date': self.dates[column].astype('datetime64[ns]'),
+        })
+
+    def counts(self, bitmap) -> pd.Series:
+        """Number of set bits per symbol, for symbols with at least one."""
+        counts = _popcount_table()[bitmap].sum(axis=1)
+        series = pd.Series(counts, index=self.symbols, name='events')
+        return series[series > 0].sort_values(ascending=False, kind='stable')
+
+    def save(self, path: str):
+        """Write the index to a compressed .npz file (atomically)."""
+        arrays = {f'bits_{name}': self.bits[name] for name in self.signals}
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp_path,
+            symbols=np.array(self.symbols, dtype=str),
+            dates=self.dates,
+            present=self.present,
+            meta=np.array(json.dumps({'signals': self.signals, 'files': self.files})),
+            **arrays,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> SignalIndex:
+        """Read an index written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            index = cls(signals=meta['signals'])
+            index.symbols = data['symbols'].tolist()
+            index.dates = data['dates']
+            index.present = data['present']
+            index.bits = {name: data[f'bits_{name}'] for name in index.signals}
+        index.files = meta['files']
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and query a bitmap index of signal events",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--index',
+        type=str,
+        required=True,
+        help='Index file (.npz)'
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        default=None,
+        help='Index (or update the index with) the CSV files in this directory'
+    )
+
+    parser.add_argument(
+        '--pattern',
+        type=str,
+        default='*.csv',
+        help='Glob pattern for input files (default: *.csv)'
+    )
+
+    parser.add_argument(
+        '--signal',
+        type=str,
+        action='append',
+        default=[],
+        metavar='NAME=EXPR',
+        help='Add a custom signal, e.g. "rsi_low=RSI12 < 20" (repeatable)'
+    )
+
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Ignore an existing index and re-read every file'
+    )
+
+    parser.add_argument(
+        '--query',
+        type=str,
+        default=None,
+        help='Signals combined with & | ^ ~, e.g. "macd_golden & volume_surge"'
+    )
+
+    parser.add_argument(
+        '--since',
+        type=str,
+        default=None,
+        help='Only report events on or after this date (YYYY-MM-DD)'
+    )
+
+    parser.add_argument(
+        '--until',
+        type=str,
+        default=None,
+        help='Only report events on or before this date (YYYY-MM-DD)'
+    )
+
+    parser.add_argument(
+        '--list',
+        action='store_true',
+        help='List the indexed signals and their event counts'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Save query events to a CSV file'
+    )
+
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=20,
+        help='Events to print (default: 20)'
+    )
+
+    args = parser.parse_args()
+
+    if not (args.input_dir or args.query or args.list):
+        parser.error('nothing to do: give --input-dir, --query or --list')
+    if args.signal and not args.input_dir:
+        parser.error('--signal needs --input-dir to index the new signals')
+
+    if args.input_dir and not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    exists = os.path.exists(args.index) and not args.rebuild
+    if not exists and not args.input_dir:
+        print(f"❌ Error: Index not found: {args.index}")
+        sys.exit(1)
+
+    try:
+        index = SignalIndex.load(args.index) if exists else SignalIndex()
+        for spec in args.signal:
+            name, sep, expr = spec.partition('=')
+            if not sep:
+                raise ValueError(f"Expected NAME=EXPR: {spec}")
+            if index.signals.get(name.strip()) != expr.strip():
+                index.add_signal(name.strip(), expr.strip())
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.input_dir:
+        print(f"📥 Indexing {args.input_dir} ({len(index.signals)} signals)...")
+        start = time.perf_counter()
+        read = index.update(args.input_dir, args.pattern)
+        elapsed = time.perf_counter() - start
+        index.save(args.index)
+        print(f"✅ {read} file(s) indexed in {elapsed:.2f}s: {len(index.symbols)} symbols x "
+              f"{len(index.dates)} dates, saved to {args.index}")
+
+    if args.list:
+        popcount = _popcount_table()
+        print(f"\n📊 {len(index.signals)} signals, {len(index.symbols)} symbols, "
+              f"{len(index.dates)} dates")
+        for name, expr in index.signals.items():
+            print(f"   {name:<20} {int(popcount[index.bits[name]].sum()):>9,}  {expr}")
+
+    if args.query:
+        try:
+            start = time.perf_counter()
+            bitmap = index.query(args.query, since=args.since, until=args.until)
+            elapsed = time.perf_counter() - start
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        events = index.events(bitmap)
+        print(f"\n📊 {len(events):,} events in {events['symbol'].nunique():,} symbols: {args.query}")
+        print(f"⏱️  Query: {elapsed * 1000:.2f} ms")
+        if not events.empty:
+            print(events.head(args.limit).to_string(index=False))
+            if len(events) > args.limit:
+                print(f"   ... {len(events) - args.limit:,} more")
+
+        if args.output:
+            events.to_csv(args.output, index=False, encoding='utf-8-sig')
+            print(f"✅ Events saved to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
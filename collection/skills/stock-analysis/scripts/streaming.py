@@ -0,0 +1,1018 @@
+#!/usr/bin/env python3
+"""
+Streaming Bar Ingestion for Stock Analysis
+
+Intraday mode: consumes tick or bar events from a pluggable source,
+aggregates ticks into bars, updates the indicators StockScorer reads
+incrementally and rescores a symbol on every completed bar. Each symbol
+keeps fixed-size ring buffers, so memory does not grow with the stream.
+
+The incremental indicators apply the same update rules as the pandas
+rolling and EWM functions used by indicators.py, so after every bar they
+equal the last row of calculate_all_indicators() on all bars so far.
+
+A bar is completed by the first tick of a later interval, or at the
+latest --max-delay seconds after its interval ended (measured on the
+stream clock, which keeps running while the source is idle).
+
+Events are JSON lines, ticks or whole bars:
+    {"symbol": "600000", "time": "2024-01-02T09:30:01", "price": 10.52, "volume": 300}
+    {"symbol": "600000", "time": "2024-01-02", "open": 10.5, "high": 10.6,
+     "low": 10.4, "close": 10.52, "volume": 120000}
+
+Usage:
+    python streaming.py --source ticks.jsonl --bar-seconds 60
+    python streaming.py --source ticks.jsonl --follow --output scores.jsonl
+    python streaming.py --source tcp://127.0.0.1:9000 --bar-seconds 300
+    python streaming.py --replay data/ --quiet --output scores.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import math
+import os
+import select
+import socket
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+
+# Columns kept per symbol, in ring buffer order
+STREAM_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume',
+    'MA5', 'MA10', 'MA20', 'MA60',
+    'BOLL_MID', 'BOLL_STD', 'BOLL_UPPER', 'BOLL_LOWER',
+    'EMA_FAST', 'EMA_SLOW', 'MACD_DIF', 'MACD_DEA', 'MACD_BAR',
+    'RSI12', 'KDJ_K', 'KDJ_D', 'KDJ_J',
+    'MOM', 'ROC', 'OBV', 'VR',
+    'TR', 'ATR', 'PDI', 'MDI', 'ADX', 'ADXR', 'SAR', 'SAR_TREND',
+]
+
+# Default ring buffer length, the longest window StockScorer looks at
+DEFAULT_CAPACITY = 60
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class Tick:
+    """One trade: symbol, time (datetime), price and volume."""
+
+    __slots__ = ('symbol', 'time', 'price', 'volume')
+
+    def __init__(self, symbol: str, time: datetime, price: float, volume: float = 0.0):
+        self.symbol = symbol
+        self.time = time
+        self.price = price
+        self.volume = volume
+
+
+class Bar:
+    """One OHLCV bar; time is the start of its interval."""
+
+    __slots__ = ('symbol', 'time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol: str, time: datetime, open: float, high: float,
+                 low: float, close: float, volume: float):
+        self.symbol = symbol
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+
+def parse_event(line: str):
+    """
+    Parse one JSON line into a Tick or a Bar.
+
+    Returns:
+        Tick, Bar, or None for blank lines
+
+    Raises:
+        ValueError: If the line is not a valid event
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        data = json.loads(line)
+        symbol = str(data['symbol'])
+        stamp = data['time']
+        when = (EPOCH + timedelta(seconds=stamp) if isinstance(stamp, (int, float))
+                else datetime.fromisoformat(stamp))
+        if 'price' in data:
+            return Tick(symbol, when, float(data['price']), float(data.get('volume', 0)))
+        return Bar(symbol, when, float(data['open']), float(data['high']),
+                   float(data['low']), float(data['close']), float(data['volume']))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid event: {line[:80]}") from e
+
+
+def _parse_lines(lines):
+    """Parse lines into events, skipping invalid ones with a warning."""
+    for line in lines:
+        if line is None:
+            yield None
+            continue
+        try:
+            event = parse_event(line)
+        except ValueError as e:
+            print(f"⚠️  Warning: {e}", file=sys.stderr)
+            continue
+        if event is not None:
+            yield event
+
+
+class FileTailSource:
+    """
+    Events from a JSON lines file, optionally following it like `tail -f`.
+
+    Iterating yields Tick/Bar events, and None whenever no new data
+    arrived within poll_interval (only when following), so the consumer
+    can complete overdue bars while the file is idle.
+    """
+
+    def __init__(self, path: str, follow: bool = False, poll_interval: float = 0.5):
+        self.path = path
+        self.follow = follow
+        self.poll_interval = poll_interval
+
+    def _lines(self):
+        if self.path == '-':
+            yield from sys.stdin
+            return
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            partial = ''
+            while True:
+                line = f.readline()
+                if line.endswith('\n'):
+                    yield partial + line
+                    partial = ''
+                elif line:
+                    # Incomplete last line: keep it until the writer finishes it
+                    partial += line
+                elif not self.follow:
+                    if partial:
+                        yield partial
+                    return
+                else:
+                    yield None
+                    time.sleep(self.poll_interval)
+
+    def __iter__(self):
+        return _parse_lines(self._lines())
+
+
+class SocketSource:
+    """
+    Events from a TCP server sending JSON lines.
+
+    Iterating yields Tick/Bar events, and None whenever nothing arrived
+    within poll_interval. Iteration ends when the server closes the
+    connection.
+    """
+
+    def __init__(self, host: str, port: int, poll_interval: float = 0.5):
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+
+    def _lines(self):
+        with socket.create_connection((self.host, self.port)) as sock:
+            buffer = b''
+            while True:
+                ready, _, _ = select.select([sock], [], [], self.poll_interval)
+                if not ready:
+                    yield None
+                    continue
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    yield line.decode('utf-8')
+            if buffer:
+                yield buffer.decode('utf-8')
+
+    def __iter__(self):
+        return _parse_lines(self._lines())
+
+
+def replay_bars(files: dict):
+    """
+    Bars of {symbol: OHLCV CSV path} files, merged in time order.
+
+    Stands in for a live source when testing against daily data.
+    """
+    from panel import load_symbol
+
+    def bars(symbol, path):
+        df = load_symbol(path)
+        columns = [df[c].tolist() for c in ('date', 'open', 'high', 'low', 'close', 'volume')]
+        for when, *values in zip(*columns):
+            yield Bar(symbol, when.to_pydatetime(), *map(float, values))
+
+    streams = [bars(symbol, path) for symbol, path in files.items()]
+    yield from heapq.merge(*streams, key=lambda bar: bar.time)
+
+
+def open_source(spec: str, follow: bool = False, poll_interval: float = 0.5):
+    """
+    Create a source from a command line spec: 'tcp://host:port', '-' for
+    stdin, or the path of a JSON lines file.
+    """
+    if spec.startswith('tcp://'):
+        host, _, port = spec[len('tcp://'):].rpartition(':')
+        return SocketSource(host or '127.0.0.1', int(port), poll_interval)
+    return FileTailSource(spec, follow=follow, poll_interval=poll_interval)
+
+
+class TickAggregator:
+    """Aggregates ticks into fixed-interval bars per symbol."""
+
+    def __init__(self, bar_seconds: int = 60):
+        self.bar_seconds = bar_seconds
+        self.open_bars = {}
+        self.completed = {}
+        self.earliest = None
+        self.late_ticks = 0
+
+    def interval(self, when: datetime) -> int:
+        """Index of the interval a time falls into."""
+        return int((when - EPOCH).total_seconds() // self.bar_seconds)
+
+    def interval_end(self, index: int) -> float:
+        """End of an interval in seconds since the epoch."""
+        return (index + 1) * self.bar_seconds
+
+    def add(self, tick: Tick) -> list:
+        """
+        Add one tick.
+
+        Returns:
+            List with the bar this tick completed, if any. Ticks older than
+            the symbol's open bar, or of an interval already completed, are
+            counted in late_ticks and dropped.
+        """
+        index = self.interval(tick.time)
+        if index <= self.completed.get(tick.symbol, -math.inf):
+            self.late_ticks += 1
+            return []
+        entry = self.open_bars.get(tick.symbol)
+
+        if entry is not None and entry[0] == index:
+            bar = entry[1]
+            if tick.price > bar.high:
+                bar.high = tick.price
+            if tick.price < bar.low:
+                bar.low = tick.price
+            bar.close = tick.price
+            bar.volume += tick.volume
+            return []
+
+        if entry is not None and index < entry[0]:
+            self.late_ticks += 1
+            return []
+
+        start = EPOCH + timedelta(seconds=index * self.bar_seconds)
+        self.open_bars[tick.symbol] = (index, Bar(tick.symbol, start, tick.price, tick.price,
+                                                  tick.price, tick.price, tick.volume))
+        if self.earliest is None or index < self.earliest:
+            self.earliest = index
+        if entry is None:
+            return []
+        self.completed[tick.symbol] = entry[0]
+        return [entry[1]]
+
+    def flush_due(self, now: float, max_delay: float) -> list:
+        """Complete the bars whose interval ended max_delay seconds before now."""
+        # Only scan the open bars once the oldest of them is due
+        if self.earliest is None or self.interval_end(self.earliest) + max_delay > now:
+            return []
+
+        due = [symbol for symbol, (index, _) in self.open_bars.items()
+               if self.interval_end(index) + max_delay <= now]
+        bars = []
+        for symbol in due:
+            index, bar = self.open_bars.pop(symbol)
+            self.completed[symbol] = index
+            bars.append(bar)
+        self.earliest = min((index for index, _ in self.open_bars.values()), default=None)
+        return bars
+
+    def flush(self) -> list:
+        """Complete all open bars."""
+        bars = [bar for _, bar in self.open_bars.values()]
+        self.completed.update((symbol, index) for symbol, (index, _) in self.open_bars.items())
+        self.open_bars.clear()
+        self.earliest = None
+        return bars
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of float rows; the oldest row is overwritten."""
+
+    def __init__(self, capacity: int, width: int):
+        self.data = np.full((capacity, width), np.nan)
+        self.capacity = capacity
+        self.count = 0
+
+    def append(self, row):
+        self.data[self.count % self.capacity] = row
+        self.count += 1
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def window(self):
+        """Rows in insertion order, oldest first."""
+        if self.count <= self.capacity:
+            return self.data[:self.count]
+        split = self.count % self.capacity
+        return np.concatenate([self.data[split:], self.data[:split]])
+
+
+def _divide(a: float, b: float) -> float:
+    """IEEE division like NumPy's: x/0 gives a signed inf, 0/0 NaN."""
+    if b == 0:
+        if a == 0 or a != a:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class RollingSum:
+    """Rolling sum updated like pandas' rolling().sum()."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nobs = 0
+        self.total = 0.0
+        self.add_compensation = 0.0
+        self.remove_compensation = 0.0
+        self.same_count = 0
+        self.previous = math.nan
+
+    def _remove(self, value: float):
+        if value == value:
+            self.nobs -= 1
+            y = -value - self.remove_compensation
+            t = self.total + y
+            self.remove_compensation = t - self.total - y
+            self.total = t
+
+    def _add(self, value: float):
+        if value == value:
+            self.nobs += 1
+            y = value - self.add_compensation
+            t = self.total + y
+            self.add_compensation = t - self.total - y
+            self.total = t
+            self.same_count = self.same_count + 1 if value == self.previous else 1
+            self.previous = value
+
+    def push(self, value: float) -> float:
+        """Add the newest value and return the statistic of the window."""
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._add(value)
+        return self.result()
+
+    def result(self) -> float:
+        if self.nobs < self.window:
+            return math.nan
+        if self.same_count >= self.nobs:
+            return self.previous * self.nobs
+        return self.total
+
+
+class RollingMean(RollingSum):
+    """Rolling mean updated like pandas' rolling().mean()."""
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.negatives = 0
+
+    def _remove(self, value: float):
+        super()._remove(value)
+        if value == value and math.copysign(1.0, value) < 0:
+            self.negatives -= 1
+
+    def _add(self, value: float):
+        super()._add(value)
+        if value == value and math.copysign(1.0, value) < 0:
+            self.negatives += 1
+
+    def result(self) -> float:
+        if self.nobs < self.window or self.nobs == 0:
+            return math.nan
+        if self.same_count >= self.nobs:
+            return self.previous
+        mean = self.total / self.nobs
+        if self.negatives == 0 and mean < 0:
+            return 0.0
+        if self.negatives == self.nobs and mean > 0:
+            return 0.0
+        return mean
+
+
+class RollingStd:
+    """Rolling standard deviation (ddof=1) updated like pandas' rolling().std()."""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.nobs = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.add_compensation = 0.0
+        self.remove_compensation = 0.0
+        self.same_count = 0
+        self.previous = math.nan
+
+    def push(self, value: float) -> float:
+        """Add the newest value and return the statistic of the window."""
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old == old:
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean - self.remove_compensation
+                    y = old - self.remove_compensation
+                    t = y - self.mean
+                    self.remove_compensation = t + self.mean - y
+                    self.mean -= t / self.nobs
+                    self.squares -= (old - prev_mean) * (old - self.mean)
+                else:
+                    self.mean = 0.0
+                    self.squares = 0.0
+        self.values.append(value)
+
+        if value == value:
+            self.same_count = self.same_count + 1 if value == self.previous else 1
+            self.previous = value
+            self.nobs += 1
+            prev_mean = self.mean - self.add_compensation
+            y = value - self.add_compensation
+            t = y - self.mean
+            self.add_compensation = t + self.mean - y
+            self.mean = self.mean + t / self.nobs
+            self.squares += (value - prev_mean) * (value - self.mean)
+
+        if self.nobs < self.window or self.nobs <= 1:
+            return math.nan
+        if self.same_count >= self.nobs:
+            return 0.0
+        return math.sqrt(max(self.squares / (self.nobs - 1), 0.0))
+
+
+class RollingExtreme:
+    """Rolling max (or min) over a monotonic deque."""
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.candidates = deque()
+        self.observed = deque(maxlen=window)
+        self.nobs = 0
+        self.index = 0
+
+    def push(self, value: float) -> float:
+        """Add the newest value and return the statistic of the window."""
+        observation = value == value
+        if len(self.observed) == self.window:
+            self.nobs -= self.observed[0]
+        self.observed.append(observation)
+        self.nobs += observation
+        if observation:
+            while self.candidates and (self.candidates[-1][1] <= value if self.maximum
+                                       else self.candidates[-1][1] >= value):
+                self.candidates.pop()
+            self.candidates.append((self.index, value))
+        while self.candidates and self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+        self.index += 1
+
+        if self.nobs < self.window:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class ExponentialMean:
+    """EWM mean with adjust=False, updated like pandas' ewm().mean()."""
+
+    def __init__(self, span: float = None, com: float = None):
+        if span is not None:
+            com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.weighted = math.nan
+        self.old_weight = 1.0
+
+    def push(self, value: float) -> float:
+        """Add the newest value and return the current mean."""
+        if self.weighted == self.weighted:
+            self.old_weight *= 1.0 - self.alpha
+            if value == value:
+                # As pandas: leave constant series untouched
+                if self.weighted != value:
+                    self.weighted = (self.old_weight * self.weighted + self.alpha * value) \
+                        / (self.old_weight + self.alpha)
+                self.old_weight = 1.0
+        elif value == value:
+            self.weighted = value
+        return self.weighted
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    """True range like indicators.true_range(); high - low on the first bar."""
+    if prev_close != prev_close:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class AverageTrueRange:
+    """TR and ATR updated like indicators.calculate_atr()."""
+
+    def __init__(self, period: int = 14):
+        self.mean = RollingMean(period)
+        self.prev_close = math.nan
+
+    def push(self, high: float, low: float, close: float) -> tuple:
+        """Add the newest bar and return (TR, ATR)."""
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_close = close
+        return tr, self.mean.push(tr)
+
+
+class DirectionalMovement:
+    """PDI, MDI, ADX and ADXR updated like indicators.calculate_dmi()."""
+
+    def __init__(self, n: int = 14, m: int = 6):
+        self.tr_sum = RollingSum(n)
+        self.plus_sum = RollingSum(n)
+        self.minus_sum = RollingSum(n)
+        self.adx = RollingMean(m)
+        self.adx_history = deque(maxlen=m + 1)
+        self.prev_high = self.prev_low = self.prev_close = math.nan
+
+    def push(self, high: float, low: float, close: float) -> tuple:
+        """Add the newest bar and return (PDI, MDI, ADX, ADXR)."""
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        tr = _true_range(high, low, self.prev_close)
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        # NaN moves of the first bar compare False and count as 0
+        plus = up_move if up_move > 0 and up_move > down_move else 0.0
+        minus = down_move if down_move > 0 and down_move > up_move else 0.0
+        tr_sum = self.tr_sum.push(tr)
+        pdi = _divide(self.plus_sum.push(plus) * 100, tr_sum)
+        mdi = _divide(self.minus_sum.push(minus) * 100, tr_sum)
+
+        adx = self.adx.push(_divide(abs(mdi - pdi), mdi + pdi) * 100)
+        self.adx_history.append(adx)
+        if len(self.adx_history) == self.adx_history.maxlen:
+            adxr = (adx + self.adx_history[0]) / 2
+        else:
+            adxr = math.nan
+        return pdi, mdi, adx, adxr
+
+
+class ParabolicSAR:
+    """SAR and its trend (1 up, -1 down) updated like indicators.parabolic_sar()."""
+
+    def __init__(self, step: float = 0.02, maximum: float = 0.2):
+        self.step = step
+        self.maximum = maximum
+        self.highs = deque(maxlen=2)
+        self.lows = deque(maxlen=2)
+        self.up = True
+        self.sar = self.ep = math.nan
+        self.af = step
+
+    def push(self, high: float, low: float) -> tuple:
+        """Add the newest bar and return (SAR, trend); NaN on the first bar."""
+        seen = len(self.highs)
+        if seen == 0:
+            result = (math.nan, math.nan)
+        elif math.isnan(self.sar):
+            prev_high, prev_low = self.highs[-1], self.lows[-1]
+            self.up = high - prev_high >= prev_low - low
+            if self.up:
+                self.sar, self.ep = prev_low, max(prev_high, high)
+            else:
+                self.sar, self.ep = prev_high, min(prev_low, low)
+            result = (self.sar, 1.0 if self.up else -1.0)
+        else:
+            sar = self.sar + self.af * (self.ep - self.sar)
+            if self.up:
+                sar = min(sar, self.lows[0], self.lows[1])
+                if low < sar:
+                    self.up, sar, self.ep, self.af = \
+                        False, max(self.ep, high, self.highs[1]), low, self.step
+                elif high > self.ep:
+                    self.ep, self.af = high, min(self.af + self.step, self.maximum)
+            else:
+                sar = max(sar, self.highs[0], self.highs[1])
+                if high > sar:
+                    self.up, sar, self.ep, self.af = \
+                        True, min(self.ep, low, self.lows[1]), high, self.step
+                elif low < self.ep:
+                    self.ep, self.af = low, min(self.af + self.step, self.maximum)
+            self.sar = sar
+            result = (sar, 1.0 if self.up else -1.0)
+
+        self.highs.append(high)
+        self.lows.append(low)
+        return result
+
+
+class IncrementalIndicators:
+    """
+    Indicator state of one symbol, updated one bar at a time.
+
+    Computes the STREAM_COLUMNS with the default parameters of
+    indicators.py; every update costs O(1) and the last `capacity` rows are
+    kept in a ring buffer for IndicatorSnapshot.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.rows = RingBuffer(capacity, len(STREAM_COLUMNS))
+        self.columns = {name: i for i, name in enumerate(STREAM_COLUMNS)}
+        self.ma = {period: RollingMean(period) for period in (5, 10, 20, 60)}
+        self.boll_std = RollingStd(20)
+        self.ema_fast = ExponentialMean(span=12)
+        self.ema_slow = ExponentialMean(span=26)
+        self.macd_dea = ExponentialMean(span=9)
+        self.rsi_gain = RollingMean(12)
+        self.rsi_loss = RollingMean(12)
+        self.kdj_low = RollingExtreme(9, maximum=False)
+        self.kdj_high = RollingExtreme(9, maximum=True)
+        self.kdj_k = ExponentialMean(com=3)
+        self.kdj_d = ExponentialMean(com=3)
+        self.vr_up = RollingSum(24)
+        self.vr_down = RollingSum(24)
+        self.closes = deque(maxlen=13)
+        self.obv = None
+        self.atr = AverageTrueRange(14)
+        self.dmi = DirectionalMovement(14, 6)
+        self.sar = ParabolicSAR()
+
+    @property
+    def count(self) -> int:
+        """Number of bars seen."""
+        return self.rows.count
+
+    def update(self, bar: Bar) -> dict:
+        """
+        Add one bar.
+
+        Returns:
+            Dictionary of STREAM_COLUMNS values of the new row
+        """
+        close, volume = bar.close, bar.volume
+        previous = self.closes[-1] if self.closes else math.nan
+        delta = close - previous
+        self.closes.append(close)
+        count = self.count + 1
+
+        row = {'open': bar.open, 'high': bar.high, 'low': bar.low,
+               'close': close, 'volume': volume}
+
+        for period, mean in self.ma.items():
+            row[f'MA{period}'] = mean.push(close)
+
+        std = self.boll_std.push(close)
+        row['BOLL_MID'] = row['MA20']
+        row['BOLL_STD'] = std
+        row['BOLL_UPPER'] = row['MA20'] + std * 2
+        row['BOLL_LOWER'] = row['MA20'] - std * 2
+
+        fast = self.ema_fast.push(close)
+        slow = self.ema_slow.push(close)
+        dif = fast - slow
+        dea = self.macd_dea.push(dif)
+        row.update(EMA_FAST=fast, EMA_SLOW=slow, MACD_DIF=dif, MACD_DEA=dea,
+                   MACD_BAR=dif - dea)
+
+        # delta.where(delta > 0, 0) and -delta.where(delta < 0, 0)
+        gain = self.rsi_gain.push(delta if delta > 0 else 0.0)
+        loss = self.rsi_loss.push(-(delta if delta < 0 else 0.0))
+        row['RSI12'] = (100 - (100 / (1 + _divide(gain, loss)))
+                        if count >= 13 else math.nan)
+
+        low_min = self.kdj_low.push(bar.low)
+        high_max = self.kdj_high.push(bar.high)
+        rsv = _divide(close - low_min, high_max - low_min) * 100
+        k = self.kdj_k.push(rsv)
+        d = self.kdj_d.push(k)
+        row.update(KDJ_K=k, KDJ_D=d, KDJ_J=3 * k - 2 * d)
+
+        row['MOM'] = close - self.closes[-11] if len(self.closes) >= 11 else math.nan
+        if len(self.closes) >= 13:
+            row['ROC'] = _divide(close - self.closes[0], self.closes[0]) * 100
+        else:
+            row['ROC'] = math.nan
+
+        flow = volume if delta > 0 else -volume
+        self.obv = flow if self.obv is None else self.obv + flow
+        row['OBV'] = self.obv
+
+        up = self.vr_up.push(volume if delta > 0 else 0.0)
+        down = self.vr_down.push(volume if delta < 0 else 0.0)
+        ratio = _divide(up, down)
+        row['VR'] = (0.0 if math.isinf(ratio) else ratio) * 100
+
+        row['TR'], row['ATR'] = self.atr.push(bar.high, bar.low, close)
+        row['PDI'], row['MDI'], row['ADX'], row['ADXR'] = self.dmi.push(bar.high, bar.low, close)
+        row['SAR'], row['SAR_TREND'] = self.sar.push(bar.high, bar.low)
+
+        self.rows.append([row[name] for name in STREAM_COLUMNS])
+        return row
+
+    def snapshot(self, money_flow_lookback: int = 20, sentiment_lookback: int = 10):
+        """IndicatorSnapshot of the latest row, as from_frame() would build it."""
+        from scoring import IndicatorSnapshot
+
+        window = self.rows.window()
+
+        def column(name):
+            index = self.columns.get(name)
+            return None if index is None else window[:, index]
+
+        return IndicatorSnapshot.from_columns(
+            column, np.array([len(window) - 1]), np.array([self.count]),
+            money_flow_lookback, sentiment_lookback)[0]
+
+
+class StreamingScorer:
+    """
+    Turns a stream of ticks and bars into per-symbol score updates.
+
+    Call process() for every event and idle() when the source has nothing
+    new; both return the score records of the bars completed meanwhile.
+    """
+
+    def __init__(self, scorer, bar_seconds: int = 60, max_delay: float = 2.0,
+                 capacity: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            scorer: Configured StockScorer
+            bar_seconds: Length of the bars built from ticks
+            max_delay: Seconds after the end of its interval a bar is
+                completed even if no later tick arrived
+            capacity: Rows kept per symbol, at least the longest scoring window
+        """
+        self.scorer = scorer
+        self.aggregator = TickAggregator(bar_seconds)
+        self.max_delay = max_delay
+        self.capacity = capacity
+        self.symbols = {}
+        self.last_bar_times = {}
+        self.stream_time = None
+        self.stream_wall = None
+
+    def _clock(self, when: datetime):
+        """Advance the stream clock to an event time."""
+        seconds = (when - EPOCH).total_seconds()
+        if self.stream_time is None or seconds > self.stream_time:
+            self.stream_time = seconds
+        self.stream_wall = time.monotonic()
+
+    def now(self) -> float:
+        """Stream time in seconds since the epoch, running on while idle."""
+        if self.stream_time is None:
+            return -math.inf
+        return self.stream_time + (time.monotonic() - self.stream_wall)
+
+    def on_bar(self, bar: Bar, received: float) -> dict:
+        """Update the bar's symbol and score it."""
+        state = self.symbols.get(bar.symbol)
+        if state is None:
+            state = self.symbols[bar.symbol] = IncrementalIndicators(self.capacity)
+
+        state.update(bar)
+        self.last_bar_times[bar.symbol] = bar.time
+        result = self.scorer.score_snapshot(state.snapshot())
+        return {
+            'symbol': bar.symbol,
+            'time': bar.time.isoformat(),
+            'bars': state.count,
+            'close': bar.close,
+            'total_score': result['total_score'],
+            'trend_score': result['trend_score'],
+            'momentum_score': result['momentum_score'],
+            'money_flow_score': result['money_flow_score'],
+            'sentiment_score': result['sentiment_score'],
+            'level': result['level'],
+            'latency_ms': (time.perf_counter() - received) * 1000,
+        }
+
+    def process(self, event) -> list:
+        """
+        Handle one Tick or Bar (or None when the source is idle).
+
+        Returns:
+            List of score records of the bars completed by this event. A bar
+            not later than the symbol's last completed bar is counted in
+            late_ticks and dropped.
+        """
+        if event is None:
+            return self.idle()
+
+        received = time.perf_counter()
+        self._clock(event.time)
+        if isinstance(event, Bar):
+            last = self.last_bar_times.get(event.symbol)
+            if last is not None and event.time <= last:
+                self.aggregator.late_ticks += 1
+                bars = []
+            else:
+                bars = [event]
+        else:
+            bars = self.aggregator.add(event)
+        bars += self.aggregator.flush_due(self.now(), self.max_delay)
+        return [self.on_bar(bar, received) for bar in bars]
+
+    def idle(self) -> list:
+        """Complete the bars that are overdue while no events arrive."""
+        received = time.perf_counter()
+        return [self.on_bar(bar, received)
+                for bar in self.aggregator.flush_due(self.now(), self.max_delay)]
+
+    def close(self) -> list:
+        """Complete all open bars at the end of the stream."""
+        received = time.perf_counter()
+        return [self.on_bar(bar, received) for bar in self.aggregator.flush()]
+
+
+def print_record(record: dict):
+    print(f"📊 {record['symbol']} {record['time']}  close {record['close']:.2f}  "
+          f"score {record['total_score']:5.1f} {record['level']}  "
+          f"({record['latency_ms']:.2f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score symbols continuously from a stream of ticks or bars",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--source',
+        type=str,
+        default=None,
+        help="JSON lines file, '-' for stdin, or tcp://host:port"
+    )
+
+    parser.add_argument(
+        '--replay',
+        type=str,
+        default=None,
+        help='Replay a directory of OHLCV CSV files as a bar stream instead'
+    )
+
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep reading the source file as it grows'
+    )
+
+    parser.add_argument(
+        '--bar-seconds',
+        type=int,
+        default=60,
+        help='Length of bars built from ticks in seconds (default: 60)'
+    )
+
+    parser.add_argument(
+        '--max-delay',
+        type=float,
+        default=2.0,
+        help='Seconds after its interval a bar is completed without a later tick (default: 2)'
+    )
+
+    parser.add_argument(
+        '--capacity',
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f'Rows kept per symbol (default: {DEFAULT_CAPACITY})'
+    )
+
+    parser.add_argument(
+        '--weights',
+        type=str,
+        default=None,
+        help='Custom weights (format: trend:0.4,momentum:0.3,money_flow:0.2,sentiment:0.1)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Append score records to a JSON lines file'
+    )
+
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Do not print score updates'
+    )
+
+    args = parser.parse_args()
+
+    if (args.source is None) == (args.replay is None):
+        print("❌ Error: Give exactly one of --source or --replay")
+        sys.exit(1)
+
+    from scoring import SCORE_WINDOW, StockScorer, parse_weights
+
+    # Imported up front, so the first score update does not pay for it
+    import pandas  # noqa: F401
+
+    if args.capacity < SCORE_WINDOW:
+        print(f"❌ Error: --capacity must be at least {SCORE_WINDOW}")
+        sys.exit(1)
+
+    if args.replay:
+        from panel import universe_files
+
+        if not os.path.isdir(args.replay):
+            print(f"❌ Error: Input directory not found: {args.replay}")
+            sys.exit(1)
+        events = replay_bars(universe_files(args.replay))
+    elif args.source != '-' and not args.source.startswith('tcp://') \
+            and not os.path.exists(args.source):
+        print(f"❌ Error: Source file not found: {args.source}")
+        sys.exit(1)
+    else:
+        events = open_source(args.source, follow=args.follow)
+
+    weights = parse_weights(args.weights)
+    scorer = StockScorer(
+        trend_weight=weights['trend'],
+        momentum_weight=weights['momentum'],
+        money_flow_weight=weights['money_flow'],
+        sentiment_weight=weights['sentiment']
+    )
+    stream = StreamingScorer(scorer, bar_seconds=args.bar_seconds,
+                             max_delay=args.max_delay, capacity=args.capacity)
+
+    output = open(args.output, 'a', encoding='utf-8') if args.output else None
+    updates = 0
+    latencies = []
+    start = time.perf_counter()
+
+    def emit(records):
+        nonlocal updates
+        for record in records:
+            updates += 1
+            latencies.append(record['latency_ms'])
+            if output:
+                output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if not args.quiet:
+                print_record(record)
+        if output and records:
+            output.flush()
+
+    try:
+        for event in events:
+            emit(stream.process(event))
+        emit(stream.close())
+    except KeyboardInterrupt:
+        emit(stream.close())
+    except OSError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    finally:
+        if output:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {updates:,} score updates for {len(stream.symbols)} symbols in {elapsed:.2f}s")
+    if latencies:
+        latencies.sort()
+        print(f"   Latency per bar: median {latencies[len(latencies) // 2]:.2f} ms, "
+              f"max {latencies[-1]:.2f} ms")
+    if stream.aggregator.late_ticks:
+        print(f"⚠️  Dropped {stream.aggregator.late_ticks} out-of-order ticks and bars")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
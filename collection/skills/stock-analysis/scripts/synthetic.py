@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Synthetic Market Data for Stock Analysis
+
+Generates deterministic random-walk OHLCV histories for benchmarks and
+offline experiments, since no market data is checked in. Symbols, history
+length, volatility and trading suspensions (runs of missing days, as in
+A-share data) are configurable; the same seed always produces the same
+data.
+
+Also provides a local stand-in for the AkShare API, so fetch_data.py can be
+exercised without network access, and can split the bars into a stream of
+trade ticks for streaming.py.
+
+Usage:
+    python synthetic.py --symbols 50 --years 5 --output data/
+    python synthetic.py --symbols 500 --years 10 --volatility 0.03 --suspensions 0.002
+    python synthetic.py --symbols 20 --ticks 50 --output data/
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+
+# Trading days per year on the A-share market
+TRADING_DAYS_PER_YEAR = 244
+
+
+def make_ohlcv(bars: int, seed: int = 0, volatility: float = 0.02,
+               suspension_rate: float = 0.0, start: str = '2000-01-03') -> pd.DataFrame:
+    """
+    Generate a deterministic random-walk OHLCV DataFrame.
+
+    Args:
+        bars: Number of business days to simulate
+        seed: Random seed (or numpy SeedSequence)
+        volatility: Standard deviation of daily close-to-close log returns
+        suspension_rate: Daily probability that trading is suspended; a
+            suspension lasts 1-20 days and its rows are left out, so the
+            price gaps when trading resumes
+        start: First business day
+
+    Returns:
+        DataFrame with date, open, high, low, close and volume columns
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, bars)))
+    open_ = close * (1 + rng.normal(0, volatility / 4, bars))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, volatility / 2, bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, volatility / 2, bars)))
+
+    df = pd.DataFrame({
+        'date': pd.bdate_range(start, periods=bars),
+        'open': open_.round(2),
+        'high': high.round(2),
+        'low': low.round(2),
+        'close': close.round(2),
+        'volume': rng.integers(100_000, 1_000_000, bars).astype(float),
+    })
+
+    if suspension_rate > 0:
+        suspended = np.zeros(bars, dtype=bool)
+        for day in np.flatnonzero(rng.random(bars) < suspension_rate):
+            suspended[day:day + rng.integers(1, 21)] = True
+        df = df[~suspended].reset_index(drop=True)
+
+    return df
+
+
+def symbol_codes(count: int) -> list:
+    """Six-digit codes: Shanghai 600000.. first, then Shenzhen 000001.."""
+    half = (count + 1) // 2
+    return ([f'{600000 + i:06d}' for i in range(half)]
+            + [f'{1 + i:06d}' for i in range(count - half)])
+
+
+def make_universe(symbols: int = 10, years: float = 1, volatility: float = 0.02,
+                  suspension_rate: float = 0.0, seed: int = 0) -> dict:
+    """
+    Generate a {symbol: OHLCV DataFrame} universe.
+
+    Every symbol gets an independent random stream derived from seed, and a
+    volatility between 0.5x and 1.5x the given one.
+
+    Returns:
+        Dictionary of symbol code -> DataFrame (see make_ohlcv)
+    """
+    bars = int(round(years * TRADING_DAYS_PER_YEAR))
+    streams = np.random.SeedSequence(seed).spawn(symbols)
+    scales = np.random.default_rng(seed).uniform(0.5, 1.5, symbols)
+
+    return {
+        code: make_ohlcv(bars, seed=stream, volatility=volatility * scale,
+                         suspension_rate=suspension_rate)
+        for code, stream, scale in zip(symbol_codes(symbols), streams, scales)
+    }
+
+
+def make_ticks(df: pd.DataFrame, ticks_per_bar: int = 20, seed: int = 0,
+               session: str = '09:30', session_seconds: int = 14400) -> pd.DataFrame:
+    """
+    Split daily OHLCV bars into trade ticks that aggregate back to them.
+
+    The first tick of a day trades at the open and the last at the close;
+    the high and low are each hit once in between, and the volume is split
+    into whole shares over the ticks.
+
+    Args:
+        df: OHLCV DataFrame (see make_ohlcv)
+        ticks_per_bar: Ticks per day, at least 4
+        seed: Random seed
+        session: Time of day of the first tick
+        session_seconds: Length of the trading session the ticks spread over
+
+    Returns:
+        DataFrame with time, price and volume columns, sorted by time
+    """
+    if ticks_per_bar < 4:
+        raise ValueError("ticks_per_bar must be at least 4")
+
+    rng = np.random.default_rng(seed)
+    bars = len(df)
+    low = df['low'].to_numpy()[:, None]
+    high = df['high'].to_numpy()[:, None]
+
+    prices = (low + (high - low) * rng.random((bars, ticks_per_bar))).round(2)
+    prices = np.clip(prices, low, high)
+    prices[:, 0] = df['open'].to_numpy()
+    prices[:, -1] = df['close'].to_numpy()
+    # Distinct interior positions for the high and the low of each day
+    extremes = np.argsort(rng.random((bars, ticks_per_bar - 2)), axis=1)[:, :2] + 1
+    rows = np.arange(bars)
+    prices[rows, extremes[:, 0]] = df['high'].to_numpy()
+    prices[rows, extremes[:, 1]] = df['low'].to_numpy()
+
+    volume = np.stack([rng.multinomial(int(v), np.full(ticks_per_bar, 1 / ticks_per_bar))
+                       for v in df['volume'].to_numpy()])
+
+    offsets = pd.to_timedelta(np.arange(ticks_per_bar) * (session_seconds // ticks_per_bar), unit='s')
+    start = df['date'].to_numpy()[:, None] + pd.Timedelta(session + ':00').to_timedelta64()
+    times = start + offsets.to_numpy()[None, :]
+
+    return pd.DataFrame({
+        'time': times.ravel(),
+        'price': prices.ravel(),
+        'volume': volume.ravel().astype(float),
+    })
+
+
+def write_ticks(universe: dict, path: str, ticks_per_bar: int = 20, seed: int = 0) -> int:
+    """
+    Write the ticks of a universe as JSON lines in time order, the event
+    format read by streaming.py.
+
+    Returns:
+        Number of ticks written
+    """
+    frames = [make_ticks(df, ticks_per_bar, seed=seed + i).assign(symbol=code)
+              for i, (code, df) in enumerate(universe.items())]
+    ticks = pd.concat(frames, ignore_index=True).sort_values('time', kind='stable')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        for symbol, when, price, volume in zip(ticks['symbol'], ticks['time'],
+                                               ticks['price'], ticks['volume']):
+            f.write(json.dumps({'symbol': symbol, 'time': when.isoformat(),
+                                'price': price, 'volume': volume}) + '\n')
+    return len(ticks)
+
+
+def to_akshare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert an OHLCV DataFrame to the column layout of ak.stock_zh_a_hist()."""
+    prev_close = df['close'].shift(1).fillna(df['open'])
+    return pd.DataFrame({
+        '日期': df['date'].dt.strftime('%Y-%m-%d'),
+        '开盘': df['open'],
+        '收盘': df['close'],
+        '最高': df['high'],
+        '最低': df['low'],
+        '成交量': df['volume'],
+        '成交额': (df['close'] * df['volume']).round(2),
+        '振幅': ((df['high'] - df['low']) / prev_close * 100).round(2),
+        '涨跌幅': ((df['close'] / prev_close - 1) * 100).round(2),
+        '涨跌额': (df['close'] - prev_close).round(2),
+        '换手率': (df['volume'] / 1e7).round(2),
+    })
+
+
+@contextlib.contextmanager
+def local_akshare(universe: dict):
+    """
+    Serve a synthetic universe through a stand-in 'akshare' module.
+
+    While the context is active, `import akshare` (as done by
+    fetch_data.fetch_stock_data) returns a module whose stock_zh_a_hist()
+    answers from the universe instead of the network.
+    """
+    def stock_zh_a_hist(symbol: str, period: str = 'daily', start_date: str = None,
+                        end_date: str = None, adjust: str = ''):
+        df = universe.get(symbol.split('.')[-1])
+        if df is None:
+            return pd.DataFrame()
+        if start_date:
+            df = df[df['date'] >= pd.Timestamp(start_date)]
+        if end_date:
+            df = df[df['date'] <= pd.Timestamp(end_date)]
+        return to_akshare_frame(df)
+
+    module = types.ModuleType('akshare')
+    module.stock_zh_a_hist = stock_zh_a_hist
+
+    previous = sys.modules.get('akshare')
+    sys.modules['akshare'] = module
+    try:
+        yield module
+    finally:
+        if previous is None:
+            sys.modules.pop('akshare', None)
+        else:
+            sys.modules['akshare'] = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic OHLCV data",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--symbols',
+        type=int,
+        default=10,
+        help='Number of symbols (default: 10)'
+    )
+
+    parser.add_argument(
+        '--years',
+        type=float,
+        default=1,
+        help='Years of daily history per symbol (default: 1)'
+    )
+
+    parser.add_argument(
+        '--volatility',
+        type=float,
+        default=0.02,
+        help='Daily return volatility (default: 0.02)'
+    )
+
+    parser.add_argument(
+        '--suspensions',
+        type=float,
+        default=0.0,
+        help='Daily probability of a trading suspension (default: 0)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+        help='Random seed (default: 0)'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='.',
+        help='Output directory, one stock_data_<code>.csv per symbol (default: .)'
+    )
+
+    parser.add_argument(
+        '--ticks',
+        type=int,
+        default=0,
+        help='Also write ticks.jsonl with this many ticks per bar, at least 4 (default: none)'
+    )
+
+    args = parser.parse_args()
+
+    if args.ticks and args.ticks < 4:
+        print("❌ Error: --ticks must be at least 4")
+        sys.exit(1)
+
+    universe = make_universe(symbols=args.symbols, years=args.years,
+                             volatility=args.volatility,
+                             suspension_rate=args.suspensions, seed=args.seed)
+
+    os.makedirs(args.output, exist_ok=True)
+    for code, df in universe.items():
+        df.to_csv(os.path.join(args.output, f'stock_data_{code}.csv'), index=False)
+
+    bars = sum(len(df) for df in universe.values())
+    print(f"✅ {len(universe)} symbols ({bars:,} bars) saved to: {args.output}")
+
+    if args.ticks:
+        path = os.path.join(args.output, 'ticks.jsonl')
+        count = write_ticks(universe, path, args.ticks, seed=args.seed)
+        print(f"✅ {count:,} ticks saved to: {path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Renderer for Stock Analysis
+
+Draws small price thumbnails (close sparkline or candlesticks, moving
+averages and volume) for screening reports without matplotlib. Every
+primitive is rasterized with NumPy straight into a palette-indexed pixel
+buffer, which is then encoded as PNG with zlib. Colours come from the
+StockVisualizer themes.
+
+Usage:
+    python thumbnail.py --input-dir indicators/ --output thumbs/
+    python thumbnail.py --input-dir indicators/ --style candle --bars 120
+    python thumbnail.py --input-dir indicators/ --width 240 --height 80 --theme dark
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from downsample import bucket_starts
+from panel import load_universe
+from visualize import MA_COLORS, THEMES
+
+# Share of the thumbnail height used by the volume bars
+VOLUME_RATIO = 0.25
+
+# Opacity of the volume bars, as in the full-size charts
+VOLUME_ALPHA = 0.5
+
+# zlib level for PNG data: level 1 is several times faster than the default
+# and flat-coloured thumbnails barely compress further
+PNG_COMPRESSION = 1
+
+
+def hex_to_rgb(color: str) -> tuple:
+    """'#rrggbb' -> (r, g, b)"""
+    color = color.lstrip('#')
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def encode_png(pixels: np.ndarray, palette: list) -> bytes:
+    """
+    Encode a palette-indexed pixel buffer as PNG.
+
+    Args:
+        pixels: (height, width) uint8 array of palette indices
+        palette: List of (r, g, b) tuples, at most 256
+
+    Returns:
+        PNG file contents
+    """
+    height, width = pixels.shape
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data)))
+
+    # Every scanline starts with filter type 0 (none)
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels
+
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)),
+        chunk(b'PLTE', bytes(np.asarray(palette, dtype=np.uint8).ravel())),
+        chunk(b'IDAT', zlib.compress(raw.tobytes(), PNG_COMPRESSION)),
+        chunk(b'IEND', b''),
+    ])
+
+
+class ThumbnailRenderer:
+    """Direct raster thumbnails of price, moving averages and volume."""
+
+    def __init__(self, theme='light', width=160, height=60,
+                 ma_columns=('MA5', 'MA20'), volume=True):
+        """
+        Initialize renderer.
+
+        Args:
+            theme: 'light' or 'dark'
+            width, height: Thumbnail size in pixels
+            ma_columns: Moving average columns drawn over the price
+            volume: Draw volume bars below the price
+        """
+        self.theme = theme
+        self.width = width
+        self.height = height
+        self.ma_columns = [c for c in ma_columns if c in MA_COLORS]
+        self.volume = volume
+
+        colors = THEMES['dark'] if theme == 'dark' else THEMES['light']
+        bg = np.array(hex_to_rgb(colors['bg']), dtype=float)
+        volume_rgb = (VOLUME_ALPHA * np.array(hex_to_rgb(colors['up']))
+                      + (1 - VOLUME_ALPHA) * bg)
+
+        # Palette indices: 0 background, 1 grid, 2 close line, 3 up, 4 down,
+        # 5 volume, then one per moving average
+        self.palette = [hex_to_rgb(colors['bg']), hex_to_rgb(colors['grid']),
+                        hex_to_rgb(colors['text']), hex_to_rgb(colors['up']),
+                        hex_to_rgb(colors['down']),
+                        tuple(int(round(v)) for v in volume_rgb)]
+        self.palette += [hex_to_rgb(MA_COLORS[c]) for c in self.ma_columns]
+
+        # Price area on top, a one-pixel separator, volume area below
+        if volume:
+            self.volume_height = max(2, int(height * VOLUME_RATIO))
+            self.price_height = height - self.volume_height - 1
+        else:
+            self.volume_height = 0
+            self.price_height = height
+
+        self._rows = np.arange(height, dtype=float)[:, None]
+
+    def _fill(self, pixels: np.ndarray, top, bottom, color):
+        """
+        Fill one vertical span per column.
+
+        Args:
+            pixels: Pixel buffer to draw into
+            top, bottom: Per-column first and last row (NaN skips a column)
+            color: Palette index, scalar or per column
+        """
+        mask = (self._rows >= top) & (self._rows <= bottom)
+        np.copyto(pixels, np.broadcast_to(np.asarray(color, dtype=np.uint8),
+                                          (self.width,)), where=mask)
+
+    def _to_rows(self, values, lo: float, hi: float) -> np.ndarray:
+        """Map values in [lo, hi] to pixel rows of the price area."""
+        if hi <= lo:
+            return np.full(np.shape(values), (self.price_height - 1) / 2)
+        return np.round((hi - np.asarray(values)) / (hi - lo) * (self.price_height - 1))
+
+    def _line_spans(self, values: np.ndarray) -> tuple:
+        """
+        Per-column (min, max) of a line, joined to the previous column so
+        the drawn line has no gaps.
+        """
+        n = len(values)
+        if n <= self.width:
+            x = np.linspace(0, n - 1, self.width)
+            y = np.interp(x, np.arange(n), values)
+            low = high = last = y
+        else:
+            starts = bucket_starts(n, self.width)
+            low = np.fmin.reduceat(values, starts)
+            high = np.fmax.reduceat(values, starts)
+            last = values[np.append(starts[1:], n) - 1]
+
+        previous = np.concatenate([[np.nan], last[:-1]])
+        return np.fmin(low, previous), np.fmax(high, previous)
+
+    def _slots(self, n: int, min_width: int) -> tuple:
+        """
+        Group n bars into slots at least min_width pixels wide.
+
+        Returns:
+            Tuple of (bucket starts into the bars, slot index of every column)
+        """
+        n_slots = max(1, min(n, self.width // min_width))
+        starts = bucket_starts(n, n_slots)
+        column_slot = np.arange(self.width) * len(starts) // self.width
+        return starts, column_slot
+
+    def _draw_line(self, pixels, values, lo, hi, color):
+        top, bottom = self._line_spans(values)
+        self._fill(pixels, self._to_rows(bottom, lo, hi), self._to_rows(top, lo, hi), color)
+
+    def _draw_candles(self, pixels, open_, high, low, close, lo, hi):
+        """Candlesticks, aggregated so every candle is at least 3 px wide."""
+        n = len(close)
+        starts, column_slot = self._slots(n, 3)
+        ends = np.append(starts[1:], n) - 1
+
+        slot_open, slot_close = open_[starts], close[ends]
+        slot_high = np.fmax.reduceat(high, starts)[column_slot]
+        slot_low = np.fmin.reduceat(low, starts)[column_slot]
+        color = np.where(slot_close >= slot_open, 3, 4)[column_slot]
+
+        # Body fills the slot except its last column; the wick runs through
+        # the middle of the body
+        slot_start = np.searchsorted(column_slot, np.arange(len(starts)))
+        slot_end = np.append(slot_start[1:], self.width) - 1
+        columns = np.arange(self.width)
+        is_body = columns < slot_end[column_slot]
+        is_wick = columns == (slot_start + slot_end - 1)[column_slot] // 2
+
+        body_top = np.fmax(slot_open, slot_close)[column_slot]
+        body_bottom = np.fmin(slot_open, slot_close)[column_slot]
+        self._fill(pixels,
+                   self._to_rows(np.where(is_body, body_top, np.nan), lo, hi),
+                   self._to_rows(np.where(is_body, body_bottom, np.nan), lo, hi),
+                   color)
+        self._fill(pixels,
+                   self._to_rows(np.where(is_wick, slot_high, np.nan), lo, hi),
+                   self._to_rows(np.where(is_wick, slot_low, np.nan), lo, hi),
+                   color)
+
+    def _draw_volume(self, pixels, volume, top_volume: float = None):
+        """Volume bars (peak per column) in the bottom area, scaled to top_volume."""
+        n = len(volume)
+        starts, column_slot = self._slots(n, 1)
+        peak = np.fmax.reduceat(volume, starts)[column_slot]
+        if top_volume is None:
+            top_volume = np.nanmax(peak) if np.isfinite(peak).any() else 0
+        if not top_volume > 0:
+            return
+
+        bottom = self.height - 1
+        bar_height = np.round(peak / top_volume * (self.volume_height - 1))
+        self._fill(pixels, bottom - bar_height, np.where(peak > 0, bottom, np.nan), 5)
+
+    def rasterize(self, df, style: str = 'line', price_range: tuple = None,
+                  volume_max: float = None) -> np.ndarray:
+        """
+        Draw the thumbnail of df into a palette-indexed pixel buffer.
+
+        Args:
+            df: DataFrame with close (and open, high, low for candles),
+                volume and moving average columns, sorted by date
+            style: 'line' (close sparkline) or 'candle'
+            price_range: (lo, hi) of the price axis (default: the extent of df)
+            volume_max: Volume of a full-height volume bar (default: the
+                largest in df)
+
+        Returns:
+            (height, width) uint8 array of palette indices
+        """
+        pixels = np.zeros((self.height, self.width), dtype=np.uint8)
+        if len(df) == 0:
+            return pixels
+
+        close = df['close'].to_numpy(dtype=float)
+        if style == 'candle':
+            prices = [df[c].to_numpy(dtype=float) for c in ('open', 'high', 'low')]
+            extent = [prices[1], prices[2]]
+        else:
+            prices = []
+            extent = [close]
+
+        if price_range is None:
+            ma_values = [df[c].to_numpy(dtype=float) for c in self.ma_columns if c in df.columns]
+            finite = np.concatenate(extent + ma_values)
+            finite = finite[np.isfinite(finite)]
+            if len(finite) == 0:
+                return pixels
+            lo, hi = finite.min(), finite.max()
+        else:
+            lo, hi = price_range
+
+        if style == 'candle':
+            self._draw_candles(pixels, prices[0], prices[1], prices[2], close, lo, hi)
+        else:
+            self._draw_line(pixels, close, lo, hi, 2)
+
+        for i, column in enumerate(self.ma_columns):
+            if column in df.columns:
+                self._draw_line(pixels, df[column].to_numpy(dtype=float), lo, hi, 6 + i)
+
+        if self.volume:
+            pixels[self.price_height] = 1
+            if 'volume' in df.columns:
+                self._draw_volume(pixels, df['volume'].to_numpy(dtype=float), volume_max)
+
+        return pixels
+
+    def render(self, df, style: str = 'line', price_range: tuple = None,
+               volume_max: float = None) -> bytes:
+        """Render the thumbnail of df as PNG bytes (see rasterize() for the scales)."""
+        return encode_png(self.rasterize(df, style, price_range, volume_max), self.palette)
+
+    def save(self, df, output_path: str, style: str = 'line') -> str:
+        """Render the thumbnail of df to a PNG file."""
+        with open(output_path, 'wb') as f:
+            f.write(self.render(df, style))
+        return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render price thumbnails for a universe of symbols",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of indicator CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='thumbnails',
+        help='Output directory, one <symbol>.png each (default: thumbnails/)'
+    )
+
+    parser.add_argument(
+        '--style',
+        type=str,
+        default='line',
+        choices=['line', 'candle'],
+        help='Close sparkline or candlesticks (default: line)'
+    )
+
+    parser.add_argument(
+        '--bars',
+        type=int,
+        default=None,
+        help='Only draw the most recent N bars (default: all)'
+    )
+
+    parser.add_argument(
+        '--theme',
+        type=str,
+        default='light',
+        choices=['light', 'dark'],
+        help='Thumbnail theme (default: light)'
+    )
+
+    parser.add_argument(
+        '--width',
+        type=int,
+        default=160,
+        help='Thumbnail width in pixels (default: 160)'
+    )
+
+    parser.add_argument(
+        '--height',
+        type=int,
+        default=60,
+        help='Thumbnail height in pixels (default: 60)'
+    )
+
+    parser.add_argument(
+        '--no-volume',
+        action='store_true',
+        help='Leave out the volume bars'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    print(f"📥 Loading universe from {args.input_dir}")
+    universe = load_universe(args.input_dir)
+    if not universe:
+        print("❌ Error: No data files found")
+        sys.exit(1)
+    print(f"✅ Loaded {len(universe)} symbols")
+
+    os.makedirs(args.output, exist_ok=True)
+    renderer = ThumbnailRenderer(
+        theme=args.theme,
+        width=args.width,
+        height=args.height,
+        volume=not args.no_volume
+    )
+
+    start = time.perf_counter()
+    for symbol, df in universe.items():
+        if args.bars:
+            df = df.tail(args.bars)
+        renderer.save(df, os.path.join(args.output, f'{symbol}.png'), style=args.style)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {len(universe)} thumbnails saved to: {args.output} "
+          f"({len(universe) / max(elapsed, 1e-9):,.0f}/s)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+Chart Tile Server for Stock Analysis
+
+Serves zoomable K-line charts of long histories as a pyramid of fixed-size
+PNG tiles over localhost. Level 0 draws TILE_BARS bars per tile and every
+level above halves the resolution, until one tile covers the whole
+history. Tiles are aligned to the first bar, and all tiles share one price
+and volume scale, so adjacent tiles join into one chart. The scale is the
+extent of the whole history rounded out to a coarse log grid (SCALE_STEPS
+steps per doubling), so a new high, low or volume peak only moves it, and
+re-renders every tile, when it crosses a grid step; other new bars only
+change the rightmost tile of each level.
+
+Tiles are pre-rendered into a disk cache (tracked in a tile manifest per
+symbol, like the chart manifest of visualize.py) and the most recently
+served ones are also kept in memory. When a symbol's indicator CSV
+changes, only tiles whose bars changed are re-rendered.
+
+Endpoints:
+    /                              JSON list of symbols
+    /<symbol>/meta.json            Levels, tile counts and date range
+    /<symbol>/<level>/<x>.png      One tile
+
+Usage:
+    python tile_server.py --input-dir indicators/
+    python tile_server.py --input-dir indicators/ --cache-dir tiles/ --port 8765
+    python tile_server.py --input-dir indicators/ --build-only
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from panel import load_symbol, universe_files
+from thumbnail import ThumbnailRenderer
+
+# Bars per tile at the most detailed level
+TILE_BARS = 64
+
+# Tile width and height in pixels
+TILE_SIZE = 256
+
+TILE_MANIFEST = '.tile_manifest.json'
+
+# Steps per doubling of the log grid the shared price and volume scale is rounded
+# out to: the scale has at most 2 ** (1 / SCALE_STEPS) - 1 (about 19%) headroom
+SCALE_STEPS = 4
+
+TILE_PATTERN = re.compile(r'^/(?P<symbol>[^/]+)/(?P<level>\d+)/(?P<x>\d+)\.png$')
+META_PATTERN = re.compile(r'^/(?P<symbol>[^/]+)/meta\.json$')
+
+
+class TileCache:
+    """Thread-safe LRU of rendered tiles."""
+
+    def __init__(self, max_tiles: int = 1024):
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached tile for key, or None."""
+        with self._lock:
+            if key not in self._tiles:
+                return None
+            self._tiles.move_to_end(key)
+            return self._tiles[key]
+
+    def put(self, key, tile):
+        """Cache a tile, evicting the least recently used ones."""
+        with self._lock:
+            self._tiles[key] = tile
+            self._tiles.move_to_end(key)
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+
+    def discard(self, key):
+        """Drop key from the cache, if present."""
+        with self._lock:
+            self._tiles.pop(key, None)
+
+
+class TilePyramid:
+    """Multi-resolution tile pyramid of one symbol, cached on disk."""
+
+    VERSION = 2
+
+    def __init__(self, tile_dir: str, renderer: ThumbnailRenderer,
+                 tile_bars: int = TILE_BARS):
+        """
+        Load the tile manifest of tile_dir, if there is one.
+
+        Args:
+            tile_dir: Directory holding this symbol's tiles
+            renderer: Renderer drawing each tile
+            tile_bars: Bars per tile at level 0
+        """
+        self.tile_dir = tile_dir
+        self.renderer = renderer
+        self.tile_bars = tile_bars
+        self.path = os.path.join(tile_dir, TILE_MANIFEST)
+        self.settings = {
+            'theme': renderer.theme,
+            'size': [renderer.width, renderer.height],
+            'ma_columns': list(renderer.ma_columns),
+            'tile_bars': tile_bars,
+        }
+        self.df = None
+        self.scale = None
+        self.tiles = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Ignoring unreadable tile manifest {self.path}: {e}")
+                return
+
+            if state.get('version') == self.VERSION and state.get('settings') == self.settings:
+                self.tiles = state.get('tiles', {})
+
+    def bars_per_tile(self, level: int) -> int:
+        return self.tile_bars << level
+
+    def levels(self) -> int:
+        """Number of levels; the top level fits the whole history in one tile."""
+        level = 0
+        while self.df is not None and self.bars_per_tile(level) < len(self.df):
+            level += 1
+        return level + 1
+
+    def tile_count(self, level: int) -> int:
+        span = self.bars_per_tile(level)
+        return -(-len(self.df) // span) if self.df is not None else 0
+
+    def tile_path(self, level: int, x: int) -> str:
+        return os.path.join(self.tile_dir, str(level), f'{x}.png')
+
+    @staticmethod
+    def _round_out(value: float, up: bool) -> float:
+        """Round value away from the data (up or down) to the SCALE_STEPS log grid."""
+        if value == 0:
+            return 0.0
+        magnitude = abs(value)
+        # Rounding the magnitude up widens the range for positive highs and negative lows
+        outward = up == (value > 0)
+        steps = np.log2(magnitude) * SCALE_STEPS
+        steps = np.ceil(steps) if outward else np.floor(steps)
+        return float(np.copysign(2.0 ** (steps / SCALE_STEPS), value))
+
+    def _scale(self, df: pd.DataFrame) -> dict:
+        """
+        Price range and top volume of the whole history, rounded out to the
+        log grid, shared by all tiles.
+        """
+        columns = [c for c in ['high', 'low'] + list(self.renderer.ma_columns) if c in df.columns]
+        prices = df[columns].to_numpy(dtype=float)
+        prices = prices[np.isfinite(prices)]
+        volume = df['volume'].to_numpy(dtype=float) if 'volume' in df.columns else np.array([])
+        volume = volume[np.isfinite(volume)]
+        return {
+            'price_range': ([self._round_out(prices.min(), up=False),
+                             self._round_out(prices.max(), up=True)] if len(prices) else None),
+            'volume_max': self._round_out(volume.max(), up=True) if len(volume) else None,
+        }
+
+    def _fingerprints(self, df: pd.DataFrame) -> dict:
+        """Fingerprint of the bars and scale behind every tile, keyed '<level>/<x>'."""
+        columns = [c for c in ['date', 'open', 'high', 'low', 'close', 'volume']
+                   + list(self.renderer.ma_columns) if c in df.columns]
+        hashed = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        key = json.dumps({'columns': columns, 'settings': self.settings, 'scale': self.scale},
+                         sort_keys=True).encode('utf-8')
+
+        fingerprints = {}
+        level = 0
+        while True:
+            span = self.bars_per_tile(level)
+            for x in range(-(-len(df) // span)):
+                rows = hashed[x * span:(x + 1) * span]
+                fingerprints[f'{level}/{x}'] = hashlib.sha1(key + rows.tobytes()).hexdigest()
+            if span >= len(df):
+                return fingerprints
+            level += 1
+
+    def update(self, df: pd.DataFrame) -> list:
+        """
+        Bring the pyramid up to date with df, re-rendering changed tiles.
+
+        Returns:
+            List of (level, x) of every tile that was re-rendered or removed
+        """
+        self.df = df.reset_index(drop=True)
+        self.scale = self._scale(self.df) if len(self.df) else None
+        fingerprints = self._fingerprints(self.df) if len(self.df) else {}
+        changed = []
+
+        for key in set(self.tiles) - set(fingerprints):
+            level, x = map(int, key.split('/'))
+            if os.path.exists(self.tile_path(level, x)):
+                os.remove(self.tile_path(level, x))
+            del self.tiles[key]
+            changed.append((level, x))
+
+        for key, fingerprint in fingerprints.items():
+            level, x = map(int, key.split('/'))
+            if (self.tiles.get(key) == fingerprint
+                    and os.path.exists(self.tile_path(level, x))):
+                continue
+            self._write_tile(level, x)
+            self.tiles[key] = fingerprint
+            changed.append((level, x))
+
+        self.save()
+        return changed
+
+    def render_tile(self, level: int, x: int) -> bytes:
+        """
+        Render one tile. Bars are placed at fixed positions and drawn on
+        the pyramid's shared scale, so every tile (including the partly
+        filled rightmost one) lines up with its neighbours.
+        """
+        span = self.bars_per_tile(level)
+        bars = self.df.iloc[x * span:(x + 1) * span].reset_index(drop=True)
+        price_range = self.scale['price_range'] if self.scale else None
+        volume_max = self.scale['volume_max'] if self.scale else None
+        return self.renderer.render(bars.reindex(range(span)), style='candle',
+                                    price_range=price_range, volume_max=volume_max)
+
+    def _write_tile(self, level: int, x: int) -> bytes:
+        tile = self.render_tile(level, x)
+        path = self.tile_path(level, x)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(tile)
+        return tile
+
+    def read_tile(self, level: int, x: int) -> bytes:
+        """Tile from the disk cache (rendered if missing), or None if out of range."""
+        if self.df is None or level >= self.levels() or x >= self.tile_count(level):
+            return None
+
+        path = self.tile_path(level, x)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                return f.read()
+        return self._write_tile(level, x)
+
+    def meta(self) -> dict:
+        """Levels, tile counts and date range of the pyramid."""
+        dates = pd.to_datetime(self.df['date'])
+        return {
+            'bars': len(self.df),
+            'first_date': dates.iloc[0].strftime('%Y-%m-%d') if len(dates) else None,
+            'last_date': dates.iloc[-1].strftime('%Y-%m-%d') if len(dates) else None,
+            'tile_size': [self.renderer.width, self.renderer.height],
+            'levels': [{'level': level, 'bars_per_tile': self.bars_per_tile(level),
+                        'tiles': self.tile_count(level)}
+                       for level in range(self.levels())],
+        }
+
+    def save(self):
+        """Write the tile manifest next to the tiles."""
+        os.makedirs(self.tile_dir, exist_ok=True)
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'settings': self.settings,
+                       'tiles': self.tiles}, f, indent=1)
+        os.replace(tmp_file, self.path)
+
+
+class TileStore:
+    """Tile pyramids of every symbol in a directory of indicator CSVs."""
+
+    def __init__(self, input_dir: str, cache_dir: str, renderer: ThumbnailRenderer,
+                 tile_bars: int = TILE_BARS, max_tiles: int = 1024):
+        self.input_dir = input_dir
+        self.cache_dir = cache_dir
+        self.renderer = renderer
+        self.tile_bars = tile_bars
+        self.cache = TileCache(max_tiles)
+        self.pyramids = {}
+        self._mtimes = {}
+        self._lock = threading.Lock()
+
+        self.sources = universe_files(input_dir)
+
+    def refresh(self, symbol: str) -> TilePyramid:
+        """
+        Reload a symbol whose CSV changed since it was last loaded and
+        re-render its stale tiles.
+
+        Returns:
+            The symbol's pyramid, or None for unknown symbols
+        """
+        path = self.sources.get(symbol)
+        if path is None:
+            return None
+
+        with self._lock:
+            mtime = os.stat(path).st_mtime_ns
+            pyramid = self.pyramids.get(symbol)
+            if pyramid is not None and self._mtimes.get(symbol) == mtime:
+                return pyramid
+
+            try:
+                df = load_symbol(path)
+            except Exception as e:
+                print(f"⚠️  Warning: Skipping {path}: {e}")
+                return pyramid
+
+            if pyramid is None:
+                pyramid = TilePyramid(os.path.join(self.cache_dir, symbol),
+                                      self.renderer, self.tile_bars)
+                self.pyramids[symbol] = pyramid
+
+            for level, x in pyramid.update(df):
+                self.cache.discard((symbol, level, x))
+            self._mtimes[symbol] = mtime
+            return pyramid
+
+    def build(self) -> int:
+        """Pre-render the pyramids of all symbols; returns the number of symbols."""
+        for symbol in self.sources:
+            self.refresh(symbol)
+        return len(self.pyramids)
+
+    def get_tile(self, symbol: str, level: int, x: int) -> tuple:
+        """
+        Return (PNG bytes, fingerprint) of one tile, or (None, None) if the
+        symbol or tile does not exist.
+        """
+        pyramid = self.refresh(symbol)
+        if pyramid is None:
+            return None, None
+
+        key = (symbol, level, x)
+        fingerprint = pyramid.tiles.get(f'{level}/{x}')
+        tile = self.cache.get(key)
+        if tile is None:
+            with self._lock:
+                tile = pyramid.read_tile(level, x)
+            if tile is None:
+                return None, None
+            self.cache.put(key, tile)
+        return tile, fingerprint
+
+
+class TileRequestHandler(BaseHTTPRequestHandler):
+    """Serves the tiles of the server's TileStore."""
+
+    def _send(self, status: int, body: bytes, content_type: str, etag: str = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        if etag:
+            self.send_header('ETag', f'"{etag}"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, status: int = 200):
+        self._send(status, json.dumps(data).encode('utf-8'), 'application/json')
+
+    def do_GET(self):
+        store = self.server.store
+        path = self.path.split('?', 1)[0]
+
+        if path == '/':
+            self._send_json(sorted(store.sources))
+            return
+
+        match = META_PATTERN.match(path)
+        if match:
+            pyramid = store.refresh(match['symbol'])
+            if pyramid is None:
+                self._send_json({'error': 'unknown symbol'}, 404)
+            else:
+                self._send_json(pyramid.meta())
+            return
+
+        match = TILE_PATTERN.match(path)
+        if match:
+            tile, fingerprint = store.get_tile(match['symbol'], int(match['level']),
+                                               int(match['x']))
+            if tile is None:
+                self._send_json({'error': 'tile not found'}, 404)
+            elif fingerprint and self.headers.get('If-None-Match') == f'"{fingerprint}"':
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self._send(200, tile, 'image/png', etag=fingerprint)
+            return
+
+        self._send_json({'error': 'not found'}, 404)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve zoomable chart tiles over localhost",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument(
+        '--input-dir',
+        type=str,
+        required=True,
+        help='Directory of indicator CSV files, one per symbol'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default='tiles',
+        help='Directory for pre-rendered tiles (default: tiles/)'
+    )
+
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Address to listen on (default: 127.0.0.1)'
+    )
+
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8765,
+        help='Port to listen on (default: 8765)'
+    )
+
+    parser.add_argument(
+        '--theme',
+        type=str,
+        default='light',
+        choices=['light', 'dark'],
+        help='Tile theme (default: light)'
+    )
+
+    parser.add_argument(
+        '--tile-size',
+        type=int,
+        default=TILE_SIZE,
+        help=f'Tile width and height in pixels (default: {TILE_SIZE})'
+    )
+
+    parser.add_argument(
+        '--tile-bars',
+        type=int,
+        default=TILE_BARS,
+        help=f'Bars per tile at the most detailed level (default: {TILE_BARS})'
+    )
+
+    parser.add_argument(
+        '--memory-tiles',
+        type=int,
+        default=1024,
+        help='Number of hot tiles kept in memory (default: 1024)'
+    )
+
+    parser.add_argument(
+        '--build-only',
+        action='store_true',
+        help='Pre-render all tile pyramids and exit'
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ Error: Input directory not found: {args.input_dir}")
+        sys.exit(1)
+
+    renderer = ThumbnailRenderer(
+        theme=args.theme,
+        width=args.tile_size,
+        height=args.tile_size,
+        ma_columns=('MA5', 'MA10', 'MA20', 'MA60')
+    )
+    store = TileStore(args.input_dir, args.cache_dir, renderer,
+                      tile_bars=args.tile_bars, max_tiles=args.memory_tiles)
+    if not store.sources:
+        print("❌ Error: No data files found")
+        sys.exit(1)
+
+    print(f"📊 Building tile pyramids for {len(store.sources)} symbols")
+    store.build()
+    print(f"✅ Tiles cached in: {args.cache_dir}")
+
+    if args.build_only:
+        return 0
+
+    server = ThreadingHTTPServer((args.host, args.port), TileRequestHandler)
+    server.store = store
+    print(f"🌐 Serving tiles at http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
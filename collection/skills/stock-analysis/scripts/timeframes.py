@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Bar Timeframes for Stock Analysis
+
+Derives weekly, monthly and N-day bars from daily bars locally, so only
+daily data has to be fetched and every timeframe is consistent with it.
+Bars are built with NumPy reductions over contiguous row groups (one pass,
+no per-bar Python loop) and work on a single symbol or a symbol/date
+panel.
+
+A resampled bar is dated by its last trading day and only contains days up
+to that date; the latest bar is partial until its period ends.
+
+Timeframes:
+    daily      The daily bars unchanged
+    weekly     Monday to Sunday calendar weeks
+    monthly    Calendar months
+    Nd         Every N trading days (e.g. 3d), counted from each symbol's first bar
+
+Usage:
+    from timeframes import resample_bars
+    weekly = resample_bars(daily_df, 'weekly')
+"""
+
+from __future__ import annotations
+
+import re
+
+from lazy import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+TIMEFRAMES = ['daily', 'weekly', 'monthly']
+
+# Approximate trading days per bar, for sizing fetch date ranges
+TRADING_DAYS = {'daily': 1, 'weekly': 5, 'monthly': 21}
+
+# Column -> reduction of its daily values within a bar
+AGGREGATIONS = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum',
+    'amount': 'sum',
+    'turnover': 'sum',
+}
+
+N_DAY_PATTERN = re.compile(r'^(\d+)d$')
+
+
+def parse_timeframe(spec: str) -> str:
+    """
+    Normalize a timeframe name ('daily', 'weekly', 'monthly' or 'Nd').
+
+    Raises:
+        ValueError: If the timeframe is unknown
+    """
+    timeframe = (spec or 'daily').strip().lower()
+    match = N_DAY_PATTERN.match(timeframe)
+    if match:
+        days = int(match.group(1))
+        if days < 1:
+            raise ValueError(f"Invalid timeframe: {spec} (N-day bars need N >= 1)")
+        return 'daily' if days == 1 else f'{days}d'
+    if timeframe not in TIMEFRAMES:
+        raise ValueError(f"Invalid timeframe: {spec} (use {', '.join(TIMEFRAMES)} or Nd, e.g. 3d)")
+    return timeframe
+
+
+def trading_days(timeframe: str) -> int:
+    """Approximate number of trading days in one bar of a timeframe."""
+    timeframe = parse_timeframe(timeframe)
+    match = N_DAY_PATTERN.match(timeframe)
+    return int(match.group(1)) if match else TRADING_DAYS[timeframe]
+
+
+def _bar_starts(df: pd.DataFrame, timeframe: str):
+    """Boolean array marking the first daily row of every bar."""
+    n = len(df)
+    if 'symbol' in df.columns:
+        symbols = df['symbol'].to_numpy()
+        symbol_start = np.r_[True, symbols[1:] != symbols[:-1]]
+    else:
+        symbol_start = np.arange(n) == 0
+
+    match = N_DAY_PATTERN.match(timeframe)
+    if match:
+        rows = np.arange(n)
+        position = rows - np.maximum.accumulate(np.where(symbol_start, rows, 0))
+        return symbol_start | (position % int(match.group(1)) == 0)
+
+    dates = pd.to_datetime(df['date']).to_numpy()
+    if timeframe == 'weekly':
+        # 1970-01-01 was a Thursday, so (days + 3) // 7 changes every Monday
+        keys = (dates.astype('datetime64[D]').astype(np.int64) + 3) // 7
+    else:
+        keys = dates.astype('datetime64[M]').astype(np.int64)
+    return symbol_start | np.r_[True, keys[1:] != keys[:-1]]
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """
+    Build bars of a timeframe from daily bars.
+
+    Args:
+        df: Daily OHLCV data of one symbol, or a symbol/date panel, sorted
+            by date (within each symbol)
+        timeframe: 'daily', 'weekly', 'monthly' or 'Nd'
+
+    Returns:
+        DataFrame with one row per bar: date (last trading day of the bar),
+        the columns of AGGREGATIONS present in df, and change_pct,
+        change_amount and amplitude recomputed if df has them. Other
+        columns (e.g. indicators) are dropped.
+
+    Raises:
+        ValueError: If the timeframe is unknown
+    """
+    timeframe = parse_timeframe(timeframe)
+    if timeframe == 'daily' or df.empty:
+        return df
+
+    starts = np.flatnonzero(_bar_starts(df, timeframe))
+    ends = np.r_[starts[1:] - 1, len(df) - 1]
+
+    bars = {}
+    if 'symbol' in df.columns:
+        bars['symbol'] = df['symbol'].to_numpy()[starts]
+    bars['date'] = df['date'].to_numpy()[ends]
+
+    for name, how in AGGREGATIONS.items():
+        if name not in df.columns:
+            continue
+        values = df[name].to_numpy(dtype=float)
+        if how == 'first':
+            bars[name] = values[starts]
+        elif how == 'last':
+            bars[name] = values[ends]
+        elif how == 'max':
+            bars[name] = np.fmax.reduceat(values, starts)
+        elif how == 'min':
+            bars[name] = np.fmin.reduceat(values, starts)
+        else:
+            bars[name] = np.add.reduceat(np.nan_to_num(values), starts)
+
+    result = pd.DataFrame(bars)
+
+    # Change columns relative to the previous bar of the same symbol
+    close = result['close'].to_numpy()
+    prev_close = np.r_[np.nan, close[:-1]]
+    if 'symbol' in result.columns:
+        symbols = result['symbol'].to_numpy()
+        prev_close[np.r_[True, symbols[1:] != symbols[:-1]]] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if 'change_amount' in df.columns:
+            result['change_amount'] = close - prev_close
+        if 'change_pct' in df.columns:
+            result['change_pct'] = (close / prev_close - 1) * 100
+        if 'amplitude' in df.columns:
+            result['amplitude'] = (result['high'] - result['low']).to_numpy() / prev_close * 100
+
+    return result
@@ -7,92 +7,290 @@ Generates various charts including K-line, indicators, and composite dashboards.
 Usage:
     python visualize.py --input indicators.csv --charts kline,macd,kdj
     python visualize.py --input indicators.csv --output charts/ --theme light
+    python visualize.py --input indicators/*.csv --output charts/ --workers 4
 """
 
+from __future__ import annotations
+
 import argparse
+import contextlib
+import hashlib
+import io
+import json
 import os
 import sys
 from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-try:
-    import matplotlib.dates as mdates
-    import matplotlib.pyplot as plt
-    import pandas as pd
-    from matplotlib.font_manager import FontProperties
+from lazy import lazy_import
 
-    # Set Chinese font
-    plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-    plt.rcParams['axes.unicode_minus'] = False
+try:
+    np = lazy_import('numpy')
+    pd = lazy_import('pandas')
 except ImportError as e:
     print(f"❌ Error: Required library not installed: {e}")
-    print("   Run: pip install pandas matplotlib")
+    print("   Run: pip install numpy pandas matplotlib")
     sys.exit(1)
 
+from downsample import bar_buckets, lttb_indices, ohlc_buckets
+from panel import symbol_from_path
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Charts with more bars than this are downsampled to about one point per pixel
+DOWNSAMPLE_THRESHOLD = 2500
+
+# Theme colours, shared with the other chart renderers
+THEMES = {
+    'light': {
+        'bg': '#ffffff',
+        'grid': '#e0e0e0',
+        'text': '#333333',
+        'up': '#00aa00',
+        'down': '#cc0000',
+    },
+    'dark': {
+        'bg': '#1e1e1e',
+        'grid': '#333333',
+        'text': '#ffffff',
+        'up': '#00cc44',
+        'down': '#ff3333',
+    },
+}
+
+# Moving average line colours
+MA_COLORS = {
+    'MA5': '#ff6b6b',
+    'MA10': '#4ecdc4',
+    'MA20': '#f1c40f',
+    'MA60': '#3498db',
+}
+
+
+@lru_cache(maxsize=None)
+def setup_matplotlib():
+    """
+    Import matplotlib and select fonts that can render Chinese labels.
+
+    Runs once, when the first figure is created, so --help and runs where
+    every chart is up to date skip the matplotlib import and font cache.
+    """
+    try:
+        import matplotlib
+    except ImportError as e:
+        print(f"❌ Error: Required library not installed: {e}")
+        print("   Run: pip install numpy pandas matplotlib")
+        sys.exit(1)
+
+    # Set Chinese font
+    matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
 
 class StockVisualizer:
     """Stock data visualization."""
 
-    def __init__(self, theme='light', width=1200, height=600):
-        """Initialize visualizer."""
+    def __init__(self, theme='light', width=1200, height=600,
+                 downsample_threshold=DOWNSAMPLE_THRESHOLD):
+        """
+        Initialize visualizer.
+
+        Args:
+            theme: 'light' or 'dark'
+            width, height: Chart size in pixels
+            downsample_threshold: Downsample charts with more bars than
+                this (None or 0 always plots every bar)
+        """
         self.theme = theme
         self.width = width
         self.height = height
+        self.downsample_threshold = downsample_threshold
 
         # Set theme colors
-        if theme == 'dark':
-            self.bg_color = '#1e1e1e'
-            self.grid_color = '#333333'
-            self.text_color = '#ffffff'
-            self.up_color = '#00cc44'
-            self.down_color = '#ff3333'
-        else:  # light theme
-            self.bg_color = '#ffffff'
-            self.grid_color = '#e0e0e0'
-            self.text_color = '#333333'
-            self.up_color = '#00aa00'
-            self.down_color = '#cc0000'
-
-    def plot_kline_with_ma(self, df: pd.DataFrame, output_path: str):
+        colors = THEMES['dark'] if theme == 'dark' else THEMES['light']
+        self.bg_color = colors['bg']
+        self.grid_color = colors['grid']
+        self.text_color = colors['text']
+        self.up_color = colors['up']
+        self.down_color = colors['down']
+
+    def _new_figure(self, height_scale: float = 1) -> Figure:
+        """
+        Create a standalone Figure drawn by the non-interactive Agg canvas.
+
+        Figures are not registered with pyplot, so nothing is shared between
+        charts and they are freed as soon as they go out of scope.
+        """
+        setup_matplotlib()
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(self.width/100, self.height/100*height_scale))
+        FigureCanvasAgg(fig)
+        fig.patch.set_facecolor(self.bg_color)
+        return fig
+
+    def _downsample_to(self, df: pd.DataFrame):
+        """Number of points to reduce df to, or None to plot every bar."""
+        if not self.downsample_threshold or len(df) <= self.downsample_threshold:
+            return None
+        return self.width
+
+    def _line_points(self, df: pd.DataFrame, column: str) -> tuple:
+        """Dates and values of one column, LTTB-downsampled for long histories."""
+        import matplotlib.dates as mdates
+
+        dates = pd.to_datetime(df['date']).to_numpy()
+        values = df[column].to_numpy(dtype=float)
+        n_points = self._downsample_to(df)
+        if n_points is not None:
+            index = lttb_indices(mdates.date2num(dates), values, n_points)
+            dates, values = dates[index], values[index]
+        return dates, values
+
+    def _plot_line(self, ax, df: pd.DataFrame, column: str, **kwargs):
+        """Plot one column against date, LTTB-downsampled for long histories."""
+        if self._downsample_to(df) is None:
+            ax.plot(df['date'], df[column], **kwargs)
+        else:
+            ax.plot(*self._line_points(df, column), **kwargs)
+
+    def _candle_geometry(self, df: pd.DataFrame) -> tuple:
+        """
+        Wick segments, body polygons and colours of the candlesticks in df.
+
+        Long histories are first aggregated into one OHLC candle per pixel.
+
+        Returns:
+            Tuple of (segments, verts, colors) arrays for a LineCollection
+            (wicks) and a PolyCollection (bodies)
+        """
+        import matplotlib.dates as mdates
+
+        df = df[df['open'].notna()]
+        n_buckets = self._downsample_to(df)
+        if n_buckets is not None:
+            df = ohlc_buckets(df, n_buckets)
+            end_dates = df['date_end']
+        else:
+            end_dates = df['date']
+
+        x_start = mdates.date2num(pd.to_datetime(df['date']).to_numpy())
+        x_end = mdates.date2num(pd.to_datetime(end_dates).to_numpy())
+        open_price = df['open'].to_numpy(dtype=float)
+        close_price = df['close'].to_numpy(dtype=float)
+        high_price = df['high'].to_numpy(dtype=float)
+        low_price = df['low'].to_numpy(dtype=float)
+
+        colors = np.where(close_price >= open_price, self.up_color, self.down_color)
+
+        x = (x_start + x_end) / 2
+        segments = np.stack([np.column_stack([x, low_price]),
+                             np.column_stack([x, high_price])], axis=1)
+
+        # Bodies are 1 day wide, centred on the date like ax.bar(width=1)
+        bottom = np.minimum(open_price, close_price)
+        top = np.maximum(open_price, close_price)
+        left, right = x_start - 0.5, x_end + 0.5
+        verts = np.stack([np.column_stack([left, bottom]), np.column_stack([left, top]),
+                          np.column_stack([right, top]), np.column_stack([right, bottom])],
+                         axis=1)
+        return segments, verts, colors
+
+    def _draw_candles(self, ax, df: pd.DataFrame, wicks: bool = False):
+        """
+        Draw candlestick bodies (and optionally wicks) as two collections.
+
+        One PolyCollection holds every body and one LineCollection every
+        wick, built from NumPy arrays, instead of one artist per candle.
+        """
+        from matplotlib.collections import LineCollection, PolyCollection
+
+        segments, verts, colors = self._candle_geometry(df)
+        if wicks:
+            ax.add_collection(LineCollection(segments, colors=colors, linewidths=1),
+                              autolim=True)
+        ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors='none',
+                                         alpha=0.8), autolim=True)
+
+        ax.xaxis_date()
+        ax.autoscale_view()
+
+    def _bar_geometry(self, df: pd.DataFrame, column: str, colors=None,
+                      width: float = 0.8, how: str = 'max') -> tuple:
+        """
+        Polygons and colours of a bar series drawn from 0.
+
+        Args:
+            colors: Bar colour, or None to colour by sign (up/down colours)
+            how: Bucket aggregation for long histories, 'max' for volume or
+                'extreme' for oscillator histograms (see bar_buckets())
+
+        Returns:
+            Tuple of (verts, colors) arrays for a PolyCollection
+        """
+        import matplotlib.dates as mdates
+
+        x = mdates.date2num(pd.to_datetime(df['date']).to_numpy())
+        values = df[column].to_numpy(dtype=float)
+        x_start = x_end = x
+
+        n_buckets = self._downsample_to(df)
+        if n_buckets is not None:
+            x_start, x_end, values = bar_buckets(x, values, n_buckets, how=how)
+
+        valid = ~np.isnan(values)
+        x_start, x_end, heights = x_start[valid], x_end[valid], values[valid]
+        if colors is None:
+            colors = np.where(heights >= 0, self.up_color, self.down_color)
+        else:
+            colors = np.broadcast_to(np.asarray(colors), values.shape)[valid]
+
+        zeros = np.zeros_like(heights)
+        left, right = x_start - width / 2, x_end + width / 2
+        verts = np.stack([np.column_stack([left, zeros]), np.column_stack([left, heights]),
+                          np.column_stack([right, heights]), np.column_stack([right, zeros])],
+                         axis=1)
+        return verts, colors
+
+    def _draw_bars(self, ax, df: pd.DataFrame, column: str, colors=None,
+                   alpha: float = 1.0, width: float = 0.8, how: str = 'max'):
+        """Draw a bar series from 0 as one PolyCollection (like ax.bar)."""
+        from matplotlib.collections import PolyCollection
+
+        verts, colors = self._bar_geometry(df, column, colors, width=width, how=how)
+        bars = PolyCollection(verts, facecolors=colors, edgecolors='none', alpha=alpha)
+        bars.sticky_edges.y.append(0)
+        ax.add_collection(bars, autolim=True)
+
+        ax.xaxis_date()
+        ax.autoscale_view()
+
+    def plot_kline_with_ma(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot K-line with moving averages."""
         print(f"📊 Generating K-line with MA chart...")
 
         if len(df) < 10:
             print("⚠️  Warning: Insufficient data for K-line chart")
-            return
+            return False
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(self.width/100, self.height/100*2),
-                                          gridspec_kw={'height_ratios': [3, 1]})
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure(height_scale=2)
+        ax1, ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
 
         # Plot K-line (candlestick)
-        for i in range(len(df)):
-            if pd.isna(df.iloc[i]['open']):
-                continue
-
-            date = pd.to_datetime(df.iloc[i]['date'])
-            open_price = df.iloc[i]['open']
-            close_price = df.iloc[i]['close']
-            high_price = df.iloc[i]['high']
-            low_price = df.iloc[i]['low']
-
-            color = self.up_color if close_price >= open_price else self.down_color
-
-            # Draw candlestick
-            ax1.vlines(x=date, ymin=low_price, ymax=high_price,
-                        colors=color, linewidth=1)
-            ax1.bar(x=date, height=abs(close_price - open_price),
-                     bottom=min(open_price, close_price),
-                     width=1, color=color, alpha=0.8)
+        self._draw_candles(ax1, df, wicks=True)
 
         # Plot MA lines
-        ax1.plot(df['date'], df['MA5'], label='MA5', color='#ff6b6b',
-                 linewidth=1.5, alpha=0.8)
-        ax1.plot(df['date'], df['MA10'], label='MA10', color='#4ecdc4',
-                 linewidth=1.5, alpha=0.8)
-        ax1.plot(df['date'], df['MA20'], label='MA20', color='#f1c40f',
-                 linewidth=1.5, alpha=0.8)
-        ax1.plot(df['date'], df['MA60'], label='MA60', color='#3498db',
-                 linewidth=1.5, alpha=0.8)
+        self._plot_line(ax1, df, 'MA5', label='MA5', color=MA_COLORS['MA5'],
+                        linewidth=1.5, alpha=0.8)
+        self._plot_line(ax1, df, 'MA10', label='MA10', color=MA_COLORS['MA10'],
+                        linewidth=1.5, alpha=0.8)
+        self._plot_line(ax1, df, 'MA20', label='MA20', color=MA_COLORS['MA20'],
+                        linewidth=1.5, alpha=0.8)
+        self._plot_line(ax1, df, 'MA60', label='MA60', color=MA_COLORS['MA60'],
+                        linewidth=1.5, alpha=0.8)
 
         ax1.set_ylabel('Price', color=self.text_color)
         ax1.set_title('K-Line with Moving Averages', color=self.text_color)
@@ -101,39 +299,37 @@ class StockVisualizer:
         ax1.tick_params(colors=self.text_color)
 
         # Plot volume
-        ax2.bar(df['date'], df['volume'], color=self.up_color, alpha=0.5)
+        self._draw_bars(ax2, df, 'volume', self.up_color, alpha=0.5)
         ax2.set_ylabel('Volume', color=self.text_color)
         ax2.grid(True, color=self.grid_color, alpha=0.3)
         ax2.tick_params(colors=self.text_color)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ K-line chart saved: {output_path}")
+        return True
 
-    def plot_macd(self, df: pd.DataFrame, output_path: str):
+    def plot_macd(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot MACD indicator."""
         print(f"📊 Generating MACD chart...")
 
         if len(df) < 12:
             print("⚠️  Warning: Insufficient data for MACD")
-            return
+            return False
 
-        fig, ax = plt.subplots(figsize=(self.width/100, self.height/100))
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure()
+        ax = fig.subplots()
 
         # Plot MACD lines
-        ax.plot(df['date'], df['MACD_DIF'], label='DIF',
-                 color='#ff6b6b', linewidth=1.5)
-        ax.plot(df['date'], df['MACD_DEA'], label='DEA',
-                 color='#4ecdc4', linewidth=1.5)
+        self._plot_line(ax, df, 'MACD_DIF', label='DIF',
+                        color='#ff6b6b', linewidth=1.5)
+        self._plot_line(ax, df, 'MACD_DEA', label='DEA',
+                        color='#4ecdc4', linewidth=1.5)
 
         # Plot histogram
-        colors = [self.up_color if x >= 0 else self.down_color
-                  for x in df['MACD_BAR']]
-        ax.bar(df['date'], df['MACD_BAR'], color=colors, alpha=0.5)
+        self._draw_bars(ax, df, 'MACD_BAR', alpha=0.5, how='extreme')
 
         ax.set_ylabel('MACD', color=self.text_color)
         ax.set_title('MACD (12, 26, 9)', color=self.text_color)
@@ -142,31 +338,31 @@ class StockVisualizer:
         ax.grid(True, color=self.grid_color, alpha=0.3)
         ax.tick_params(colors=self.text_color)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ MACD chart saved: {output_path}")
+        return True
 
-    def plot_kdj(self, df: pd.DataFrame, output_path: str):
+    def plot_kdj(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot KDJ indicator."""
         print(f"📊 Generating KDJ chart...")
 
         if len(df) < 9:
             print("⚠️  Warning: Insufficient data for KDJ")
-            return
+            return False
 
-        fig, ax = plt.subplots(figsize=(self.width/100, self.height/100))
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure()
+        ax = fig.subplots()
 
         # Plot KDJ lines
-        ax.plot(df['date'], df['KDJ_K'], label='K',
-                 color='#f1c40f', linewidth=1.5)
-        ax.plot(df['date'], df['KDJ_D'], label='D',
-                 color='#3498db', linewidth=1.5)
-        ax.plot(df['date'], df['KDJ_J'], label='J',
-                 color='#e74c3c', linewidth=1.5)
+        self._plot_line(ax, df, 'KDJ_K', label='K',
+                        color='#f1c40f', linewidth=1.5)
+        self._plot_line(ax, df, 'KDJ_D', label='D',
+                        color='#3498db', linewidth=1.5)
+        self._plot_line(ax, df, 'KDJ_J', label='J',
+                        color='#e74c3c', linewidth=1.5)
 
         # Add overbought/oversold zones
         ax.axhline(y=80, color=self.down_color, linestyle='--',
@@ -180,31 +376,31 @@ class StockVisualizer:
         ax.grid(True, color=self.grid_color, alpha=0.3)
         ax.tick_params(colors=self.text_color)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ KDJ chart saved: {output_path}")
+        return True
 
-    def plot_rsi(self, df: pd.DataFrame, output_path: str):
+    def plot_rsi(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot RSI indicator."""
         print(f"📊 Generating RSI chart...")
 
         if len(df) < 6:
             print("⚠️  Warning: Insufficient data for RSI")
-            return
+            return False
 
-        fig, ax = plt.subplots(figsize=(self.width/100, self.height/100))
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure()
+        ax = fig.subplots()
 
         # Plot RSI lines
-        ax.plot(df['date'], df['RSI6'], label='RSI6',
-                 color='#f1c40f', linewidth=1.5, alpha=0.7)
-        ax.plot(df['date'], df['RSI12'], label='RSI12',
-                 color='#3498db', linewidth=1.5)
-        ax.plot(df['date'], df['RSI24'], label='RSI24',
-                 color='#00aa00', linewidth=1.5, alpha=0.7)
+        self._plot_line(ax, df, 'RSI6', label='RSI6',
+                        color='#f1c40f', linewidth=1.5, alpha=0.7)
+        self._plot_line(ax, df, 'RSI12', label='RSI12',
+                        color='#3498db', linewidth=1.5)
+        self._plot_line(ax, df, 'RSI24', label='RSI24',
+                        color='#00aa00', linewidth=1.5, alpha=0.7)
 
         # Add overbought/oversold zones
         ax.axhspan(ymin=70, ymax=100, color=self.down_color, alpha=0.1)
@@ -221,48 +417,34 @@ class StockVisualizer:
         ax.grid(True, color=self.grid_color, alpha=0.3)
         ax.tick_params(colors=self.text_color)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ RSI chart saved: {output_path}")
+        return True
 
-    def plot_boll(self, df: pd.DataFrame, output_path: str):
+    def plot_boll(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot Bollinger Bands."""
         print(f"📊 Generating Bollinger Bands chart...")
 
         if len(df) < 20:
             print("⚠️  Warning: Insufficient data for BOLL")
-            return
+            return False
 
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(self.width/100, self.height/100*2),
-                                          gridspec_kw={'height_ratios': [3, 1]})
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure(height_scale=2)
+        ax1, ax2 = fig.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
 
         # Plot K-line
-        for i in range(len(df)):
-            if pd.isna(df.iloc[i]['open']):
-                continue
-
-            date = pd.to_datetime(df.iloc[i]['date'])
-            open_price = df.iloc[i]['open']
-            close_price = df.iloc[i]['close']
-            high_price = df.iloc[i]['high']
-            low_price = df.iloc[i]['low']
-
-            color = self.up_color if close_price >= open_price else self.down_color
-            ax1.bar(x=date, height=abs(close_price - open_price),
-                     bottom=min(open_price, close_price),
-                     width=1, color=color, alpha=0.8)
+        self._draw_candles(ax1, df)
 
         # Plot Bollinger Bands
-        ax1.plot(df['date'], df['BOLL_UPPER'], label='BOLL Upper',
-                 color='#e74c3c', linewidth=1.5, alpha=0.6)
-        ax1.plot(df['date'], df['BOLL_MID'], label='BOLL Mid',
-                 color='#3498db', linewidth=1.5, alpha=0.6)
-        ax1.plot(df['date'], df['BOLL_LOWER'], label='BOLL Lower',
-                 color='#00aa00', linewidth=1.5, alpha=0.6)
+        self._plot_line(ax1, df, 'BOLL_UPPER', label='BOLL Upper',
+                        color='#e74c3c', linewidth=1.5, alpha=0.6)
+        self._plot_line(ax1, df, 'BOLL_MID', label='BOLL Mid',
+                        color='#3498db', linewidth=1.5, alpha=0.6)
+        self._plot_line(ax1, df, 'BOLL_LOWER', label='BOLL Lower',
+                        color='#00aa00', linewidth=1.5, alpha=0.6)
 
         ax1.set_ylabel('Price', color=self.text_color)
         ax1.set_title('K-Line with Bollinger Bands (20, 2)',
@@ -272,28 +454,27 @@ class StockVisualizer:
         ax1.tick_params(colors=self.text_color)
 
         # Plot volume
-        ax2.bar(df['date'], df['volume'], color=self.up_color, alpha=0.5)
+        self._draw_bars(ax2, df, 'volume', self.up_color, alpha=0.5)
         ax2.set_ylabel('Volume', color=self.text_color)
         ax2.grid(True, color=self.grid_color, alpha=0.3)
         ax2.tick_params(colors=self.text_color)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ Bollinger Bands chart saved: {output_path}")
+        return True
 
-    def plot_composite(self, df: pd.DataFrame, output_path: str):
+    def plot_composite(self, df: pd.DataFrame, output_path: str) -> bool:
         """Plot composite dashboard with multiple panels."""
         print(f"📊 Generating composite dashboard...")
 
         if len(df) < 30:
             print("⚠️  Warning: Insufficient data for composite chart")
-            return
+            return False
 
-        fig = plt.figure(figsize=(self.width/100, self.height/100*2))
-        fig.patch.set_facecolor(self.bg_color)
+        fig = self._new_figure(height_scale=2)
 
         # Create subplots
         gs = fig.add_gridspec(3, 2, hspace=0.3, wspace=0.2)
@@ -305,35 +486,22 @@ class StockVisualizer:
         ax5 = fig.add_subplot(gs[2, 1])  # Volume
 
         # Plot K-line
-        for i in range(len(df)):
-            if pd.isna(df.iloc[i]['open']):
-                continue
-
-            date = pd.to_datetime(df.iloc[i]['date'])
-            open_price = df.iloc[i]['open']
-            close_price = df.iloc[i]['close']
-            high_price = df.iloc[i]['high']
-            low_price = df.iloc[i]['low']
-
-            color = self.up_color if close_price >= open_price else self.down_color
-            ax1.bar(x=date, height=abs(close_price - open_price),
-                     bottom=min(open_price, close_price),
-                     width=1, color=color, alpha=0.8)
-
-        ax1.plot(df['date'], df['MA20'], label='MA20',
-                 color='#f1c40f', linewidth=1.5)
-        ax1.plot(df['date'], df['MA60'], label='MA60',
-                 color='#3498db', linewidth=1.5)
+        self._draw_candles(ax1, df)
+
+        self._plot_line(ax1, df, 'MA20', label='MA20',
+                        color='#f1c40f', linewidth=1.5)
+        self._plot_line(ax1, df, 'MA60', label='MA60',
+                        color='#3498db', linewidth=1.5)
         ax1.set_title('K-Line with MA', color=self.text_color)
         ax1.legend(loc='upper left', fontsize=8)
         ax1.grid(True, color=self.grid_color, alpha=0.3)
         ax1.tick_params(colors=self.text_color, labelsize=8)
 
         # Plot MACD
-        ax2.plot(df['date'], df['MACD_DIF'], label='DIF',
-                 color='#ff6b6b', linewidth=1.5)
-        ax2.plot(df['date'], df['MACD_DEA'], label='DEA',
-                 color='#4ecdc4', linewidth=1.5)
+        self._plot_line(ax2, df, 'MACD_DIF', label='DIF',
+                        color='#ff6b6b', linewidth=1.5)
+        self._plot_line(ax2, df, 'MACD_DEA', label='DEA',
+                        color='#4ecdc4', linewidth=1.5)
         ax2.axhline(y=0, color=self.grid_color, linestyle='--', alpha=0.5)
         ax2.set_title('MACD', color=self.text_color)
         ax2.legend(loc='upper left', fontsize=8)
@@ -341,10 +509,10 @@ class StockVisualizer:
         ax2.tick_params(colors=self.text_color, labelsize=8)
 
         # Plot KDJ
-        ax3.plot(df['date'], df['KDJ_K'], label='K',
-                 color='#f1c40f', linewidth=1.5)
-        ax3.plot(df['date'], df['KDJ_J'], label='J',
-                 color='#e74c3c', linewidth=1.5)
+        self._plot_line(ax3, df, 'KDJ_K', label='K',
+                        color='#f1c40f', linewidth=1.5)
+        self._plot_line(ax3, df, 'KDJ_J', label='J',
+                        color='#e74c3c', linewidth=1.5)
         ax3.axhline(y=80, color=self.down_color, linestyle='--', alpha=0.3)
         ax3.axhline(y=20, color=self.up_color, linestyle='--', alpha=0.3)
         ax3.set_title('KDJ', color=self.text_color)
@@ -353,8 +521,8 @@ class StockVisualizer:
         ax3.tick_params(colors=self.text_color, labelsize=8)
 
         # Plot RSI
-        ax4.plot(df['date'], df['RSI12'], label='RSI12',
-                 color='#3498db', linewidth=1.5)
+        self._plot_line(ax4, df, 'RSI12', label='RSI12',
+                        color='#3498db', linewidth=1.5)
         ax4.axhspan(ymin=70, ymax=100, color=self.down_color, alpha=0.1)
         ax4.axhline(y=70, color=self.down_color, linestyle='--', alpha=0.3)
         ax4.axhspan(ymin=0, ymax=30, color=self.up_color, alpha=0.1)
@@ -366,17 +534,17 @@ class StockVisualizer:
         ax4.tick_params(colors=self.text_color, labelsize=8)
 
         # Plot volume
-        ax5.bar(df['date'], df['volume'], color=self.up_color, alpha=0.5)
+        self._draw_bars(ax5, df, 'volume', self.up_color, alpha=0.5)
         ax5.set_title('Volume', color=self.text_color)
         ax5.grid(True, color=self.grid_color, alpha=0.3)
         ax5.tick_params(colors=self.text_color, labelsize=8)
 
-        plt.tight_layout()
-        plt.savefig(output_path, facecolor=self.bg_color, dpi=150,
+        fig.tight_layout()
+        fig.savefig(output_path, facecolor=self.bg_color, dpi=150,
                     bbox_inches='tight')
-        plt.close()
 
         print(f"✅ Composite dashboard saved: {output_path}")
+        return True
 
 
 def load_data(input_file: str) -> pd.DataFrame:
@@ -397,6 +565,162 @@ def load_data(input_file: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+# Chart type -> (StockVisualizer method name, output file name)
+CHART_TYPES = {
+    'kline_ma': ('plot_kline_with_ma', 'kline_ma.png'),
+    'macd': ('plot_macd', 'macd.png'),
+    'kdj': ('plot_kdj', 'kdj.png'),
+    'rsi': ('plot_rsi', 'rsi.png'),
+    'boll': ('plot_boll', 'boll.png'),
+    'composite': ('plot_composite', 'composite.png'),
+}
+
+# Chart type -> data columns the chart reads
+CHART_COLUMNS = {
+    'kline_ma': ['date', 'open', 'high', 'low', 'close', 'volume',
+                 'MA5', 'MA10', 'MA20', 'MA60'],
+    'macd': ['date', 'MACD_DIF', 'MACD_DEA', 'MACD_BAR'],
+    'kdj': ['date', 'KDJ_K', 'KDJ_D', 'KDJ_J'],
+    'rsi': ['date', 'RSI6', 'RSI12', 'RSI24'],
+    'boll': ['date', 'open', 'high', 'low', 'close', 'volume',
+             'BOLL_UPPER', 'BOLL_MID', 'BOLL_LOWER'],
+    'composite': ['date', 'open', 'high', 'low', 'close', 'volume', 'MA20', 'MA60',
+                  'MACD_DIF', 'MACD_DEA', 'KDJ_K', 'KDJ_J', 'RSI12'],
+}
+
+MANIFEST_FILE = '.chart_manifest.json'
+
+
+class ChartManifest:
+    """
+    Fingerprints of the charts rendered into one output directory.
+
+    A chart is up to date when its file exists and the fingerprint of its
+    data columns, chart type and visualizer settings (theme, size,
+    downsampling) matches the one recorded when it was last rendered.
+    """
+
+    VERSION = 1
+
+    def __init__(self, output_dir: str):
+        """Load the manifest of output_dir, if there is one."""
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.charts = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Ignoring unreadable chart manifest {self.path}: {e}")
+                return
+
+            if state.get('version') == self.VERSION:
+                self.charts = state.get('charts', {})
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame, chart_type: str, settings: dict) -> str:
+        """Fingerprint of everything that determines one chart's output."""
+        columns = [c for c in CHART_COLUMNS[chart_type] if c in df.columns]
+        hashed = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+        key = json.dumps({'chart': chart_type, 'columns': columns, 'settings': settings},
+                         sort_keys=True)
+        return hashlib.sha1(key.encode('utf-8') + hashed.tobytes()).hexdigest()
+
+    def is_current(self, chart_type: str, fingerprint: str) -> bool:
+        """Whether the chart file exists and was rendered from the same inputs."""
+        filename = CHART_TYPES[chart_type][1]
+        return (self.charts.get(filename) == fingerprint
+                and os.path.exists(os.path.join(self.output_dir, filename)))
+
+    def record(self, chart_type: str, fingerprint: str):
+        """Remember the fingerprint of a freshly rendered chart."""
+        self.charts[CHART_TYPES[chart_type][1]] = fingerprint
+
+    def save(self):
+        """Write the manifest next to the charts."""
+        if not os.path.isdir(self.output_dir):
+            return
+
+        tmp_file = f"{self.path}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'charts': self.charts}, f, indent=1)
+        os.replace(tmp_file, self.path)
+
+
+def render_chart(visualizer: StockVisualizer, chart_type: str, df: pd.DataFrame,
+                 output_dir: str) -> str:
+    """
+    Render one chart type into output_dir.
+
+    Returns: Path of the chart file, or None if the type is unknown or
+    the chart was not written (too little data, or rendering failed)
+    """
+    if chart_type not in CHART_TYPES:
+        print(f"⚠️  Unknown chart type: {chart_type}")
+        return None
+
+    method_name, filename = CHART_TYPES[chart_type]
+    output_path = f"{output_dir}/{filename}"
+    try:
+        written = getattr(visualizer, method_name)(df, output_path)
+    except Exception as e:
+        print(f"❌ Error generating {chart_type}: {e}")
+        return None
+
+    return output_path if written else None
+
+
+def _render_job(job: tuple) -> tuple:
+    """
+    Process-pool worker: render one (df, chart_type, output_dir, settings) job.
+
+    Returns: (chart path or None, captured console output)
+    """
+    df, chart_type, output_dir, settings = job
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        visualizer = StockVisualizer(**settings)
+        path = render_chart(visualizer, chart_type, df, output_dir)
+    return path, log.getvalue()
+
+
+def render_jobs(jobs: list, settings: dict, workers: int = 1) -> list:
+    """
+    Render (df, chart_type, output_dir) jobs, optionally in a process pool.
+
+    Workers are spawned (not forked) interpreters that each draw on their own
+    Agg Figures, so they share no state and write the same files as serial
+    rendering. Their console output is printed in job order.
+
+    Args:
+        jobs: List of (DataFrame, chart type, output directory) tuples
+        settings: StockVisualizer keyword arguments (theme, width, height)
+        workers: Number of worker processes; 1 renders in this process
+
+    Returns:
+        List of chart paths (None for failed charts), in job order
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        visualizer = StockVisualizer(**settings)
+        return [render_chart(visualizer, chart_type, df, output_dir)
+                for df, chart_type, output_dir in jobs]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks = [(df, chart_type, output_dir, settings) for df, chart_type, output_dir in jobs]
+    paths = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for path, log in pool.map(_render_job, tasks):
+            print(log, end='')
+            paths.append(path)
+
+    return paths
+
+
 def ensure_output_dir(output_path: str):
     """Ensure output directory exists."""
     output_dir = os.path.dirname(output_path)
@@ -414,8 +738,10 @@ def main():
     parser.add_argument(
         '--input',
         type=str,
+        nargs='+',
         required=True,
-        help='Input CSV file with indicators'
+        help='Input CSV file(s) with indicators; several files get one '
+             'output subdirectory per symbol'
     )
 
     parser.add_argument(
@@ -454,6 +780,27 @@ def main():
         help='Chart height in pixels (default: 600)'
     )
 
+    parser.add_argument(
+        '--downsample',
+        type=int,
+        default=DOWNSAMPLE_THRESHOLD,
+        help=f'Downsample charts with more bars than this, 0 to disable '
+             f'(default: {DOWNSAMPLE_THRESHOLD})'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Render charts in N parallel processes (default: 1)'
+    )
+
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Redraw all charts, even those that are already up to date'
+    )
+
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -462,75 +809,77 @@ def main():
 
     args = parser.parse_args()
 
-    # Validate input file
-    try:
-        open(args.input, 'r')
-    except FileNotFoundError:
-        print(f"❌ Error: Input file not found: {args.input}")
-        sys.exit(1)
-
-    # Load data
-    df = load_data(args.input)
-
-    if df.empty:
-        sys.exit(1)
+    # Validate input files
+    for input_file in args.input:
+        if not os.path.exists(input_file):
+            print(f"❌ Error: Input file not found: {input_file}")
+            sys.exit(1)
 
-    # Initialize visualizer
-    visualizer = StockVisualizer(
-        theme=args.theme,
-        width=args.width,
-        height=args.height
-    )
+    settings = {
+        'theme': args.theme,
+        'width': args.width,
+        'height': args.height,
+        'downsample_threshold': args.downsample
+    }
 
     # Ensure output directory
     ensure_output_dir(args.output)
 
     # Determine which charts to generate
     if args.charts == 'all':
-        charts = ['kline_ma', 'macd', 'kdj', 'rsi', 'boll', 'composite']
+        charts = list(CHART_TYPES)
     else:
         charts = [c.strip() for c in args.charts.split(',')]
 
+    # Load data; several inputs are rendered into one subdirectory per symbol.
+    # Charts whose inputs match the output directory's manifest are skipped.
+    jobs = []
+    fingerprints = []
+    manifests = []
+    skipped = 0
+    for input_file in args.input:
+        df = load_data(input_file)
+        if df.empty:
+            if len(args.input) == 1:
+                sys.exit(1)
+            continue
+
+        output_dir = args.output
+        if len(args.input) > 1:
+            output_dir = os.path.join(args.output, symbol_from_path(input_file))
+            os.makedirs(output_dir, exist_ok=True)
+
+        manifest = ChartManifest(output_dir)
+        manifests.append(manifest)
+        for chart_type in charts:
+            fingerprint = None
+            if chart_type in CHART_TYPES:
+                fingerprint = ChartManifest.fingerprint(df, chart_type, settings)
+                if not args.force and manifest.is_current(chart_type, fingerprint):
+                    skipped += 1
+                    continue
+
+            jobs.append((df, chart_type, output_dir))
+            fingerprints.append((manifest, chart_type, fingerprint))
+
     # Generate charts
     print("\n" + "="*50)
     print("📊 GENERATING CHARTS")
     print("="*50 + "\n")
 
-    for chart_type in charts:
-        try:
-            if chart_type == 'kline_ma':
-                output_path = f"{args.output}/kline_ma.png"
-                visualizer.plot_kline_with_ma(df, output_path)
-
-            elif chart_type == 'macd':
-                output_path = f"{args.output}/macd.png"
-                visualizer.plot_macd(df, output_path)
-
-            elif chart_type == 'kdj':
-                output_path = f"{args.output}/kdj.png"
-                visualizer.plot_kdj(df, output_path)
-
-            elif chart_type == 'rsi':
-                output_path = f"{args.output}/rsi.png"
-                visualizer.plot_rsi(df, output_path)
-
-            elif chart_type == 'boll':
-                output_path = f"{args.output}/boll.png"
-                visualizer.plot_boll(df, output_path)
-
-            elif chart_type == 'composite':
-                output_path = f"{args.output}/composite.png"
-                visualizer.plot_composite(df, output_path)
-
-            else:
-                print(f"⚠️  Unknown chart type: {chart_type}")
+    paths = render_jobs(jobs, settings, workers=args.workers)
 
-        except Exception as e:
-            print(f"❌ Error generating {chart_type}: {e}")
+    for path, (manifest, chart_type, fingerprint) in zip(paths, fingerprints):
+        if path is not None:
+            manifest.record(chart_type, fingerprint)
+    for manifest in manifests:
+        manifest.save()
 
     print("\n✅ Chart generation complete!")
     print(f"   Output directory: {args.output}")
-    print(f"   Charts generated: {len(charts)}")
+    print(f"   Charts generated: {sum(path is not None for path in paths)}")
+    if skipped:
+        print(f"   Charts up to date: {skipped} (use --force to redraw)")
 
     return 0
 
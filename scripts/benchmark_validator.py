@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+SkillValidator Benchmark
+
+Compares the single-pass SkillIndex checks of validate_skill.py with the
+original implementation, which searched the whole SKILL.md once per check,
+on a synthetic corpus of skill directories. Both must report exactly the
+same messages for every file; the corpus includes the edge cases of the
+original regexes (bare '##' headers, '-' items continued on the next line,
+CRLF line endings, titles not at the start of a line).
+
+Usage:
+    python benchmark_validator.py                  # 10,000 synthetic skills
+    python benchmark_validator.py --skills 2000 --seed 7
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from validate_skill import OPTIONAL_SECTIONS, REQUIRED_SECTIONS, SkillValidator
+
+KEYWORDS = [
+    "analyze stock", "股票分析", "technical indicators", "K线图", "help",
+    "render chart", "validate skill", "生成报告", "get", "market scan",
+]
+
+TOOLS = ["exec", "read", "write", "bash", "web_fetch", "grep", "browser", "memory"]
+
+FILLER = [
+    "Run the script from the skill directory.",
+    "参数可以通过命令行传入。",
+    "See the examples below for typical sessions.",
+    "Results are cached between runs. " * 5,
+    "`python scripts/run.py --input data/ --output out/`",
+]
+
+
+class LegacySkillValidator(SkillValidator):
+    """The checks as they were before SkillIndex, one content scan each."""
+
+    def validate_content(self, content: str) -> bool:
+        self._check_sections(content)
+        self._check_format(content)
+        self._check_activation_keywords(content)
+        self._check_tools(content)
+        self._check_examples(content)
+        return len(self.errors) == 0
+
+    def _check_sections(self, content: str) -> None:
+        found_sections = set(re.findall(r'^#{1,3}\s+(.+)$', content, re.MULTILINE))
+        for required in REQUIRED_SECTIONS:
+            required_pattern = required.replace("# ", "").replace("## ", "")
+            if not any(required_pattern.lower() in h.lower() for h in found_sections):
+                self.errors.append(f"Missing required section: {required}")
+        for optional in OPTIONAL_SECTIONS:
+            optional_pattern = optional.replace("## ", "")
+            if any(optional_pattern.lower() in h.lower() for h in found_sections):
+                self.info.append(f"Has optional section: {optional}")
+
+    def _check_format(self, content: str) -> None:
+        for i, line in enumerate(content.split('\n'), 1):
+            if len(line) > 120:
+                self.warnings.append(f"Line {i} exceeds 120 characters ({len(line)} chars)")
+        if not re.findall(r'```(\w*)', content):
+            self.warnings.append("No code blocks found - examples may need code blocks")
+
+    def _check_activation_keywords(self, content: str) -> None:
+        match = re.search(r'## Activation Keywords\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+        if not match:
+            return
+        keywords = re.findall(r'^-\s*(.+)$', match.group(1), re.MULTILINE)
+        if len(keywords) < 3:
+            self.warnings.append(f"Only {len(keywords)} activation keywords - recommend 5-10")
+        for kw in keywords:
+            if kw.strip().lower() in ["help", "do", "make", "create", "get"]:
+                self.errors.append(f"Too generic keyword: '{kw}' - use specific phrases")
+        if len(keywords) > 0:
+            has_chinese = any(re.search(r'[\u4e00-\u9fff]', kw) for kw in keywords)
+            has_english = any(re.search(r'[a-zA-Z]', kw) for kw in keywords)
+            if not has_chinese and not has_english:
+                self.warnings.append("Consider adding both Chinese and English keywords")
+
+    def _check_tools(self, content: str) -> None:
+        match = re.search(r'## Tools Used\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+        if not match:
+            return
+        tools = re.findall(r'^-\s*(\w+)', match.group(1), re.MULTILINE)
+        if len(tools) == 0:
+            self.errors.append("No tools listed in Tools Used section")
+        valid_tools = [
+            "exec", "read", "write", "edit", "glob", "grep",
+            "memory", "web_search", "web_fetch", "bash"
+        ]
+        for tool in tools:
+            if tool.lower() not in [v.lower() for v in valid_tools]:
+                self.warnings.append(f"Uncommon tool: '{tool}' - verify it's valid")
+
+    def _check_examples(self, content: str) -> None:
+        match = re.search(r'## Examples\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+        if not match:
+            return
+        text = match.group(1)
+        has_user = "User:" in text or "用户" in text
+        has_agent = "Agent:" in text or "代理" in text
+        if not (has_user and has_agent):
+            self.warnings.append("Examples should show User: and Agent: interactions")
+
+
+def make_skill_md(rng: random.Random, name: str) -> str:
+    """Random SKILL.md; sections may be missing, reordered or malformed."""
+    def paragraph():
+        return "\n".join(rng.choice(FILLER) for _ in range(rng.randint(1, 6)))
+
+    def items(pool):
+        lines = []
+        for value in rng.sample(pool, rng.randint(0, len(pool))):
+            style = rng.random()
+            if style < 0.05:
+                lines.append(f"-\n  {value}")      # item continued on the next line
+            elif style < 0.1:
+                lines.append(f"-{value}")
+            else:
+                lines.append(f"- {value}")
+        return "\n".join(lines)
+
+    sections = [
+        ("## Description", paragraph),
+        ("## Activation Keywords", lambda: items(KEYWORDS)),
+        ("## Tools Used", lambda: items(TOOLS)),
+        ("## Instructions for Agents", paragraph),
+        ("## Examples", lambda: rng.choice(["User: analyze 600000\nAgent: ...",
+                                            "用户: 分析\n代理: ...", paragraph()])),
+    ]
+    sections += [(title, paragraph) for title in rng.sample(OPTIONAL_SECTIONS, 4)]
+    rng.shuffle(sections)
+
+    parts = [rng.choice([f"# Skill Name: {name}", f"# {name}", "#\n" + name])]
+    for title, body in sections:
+        if rng.random() < 0.08:
+            continue
+        roll = rng.random()
+        if roll < 0.05:
+            title = "#" + title                    # demoted to ###
+        elif roll < 0.08:
+            title = "##\n" + title[3:]             # bare '##', title on the next line
+        elif roll < 0.1:
+            title = title + " (optional)"
+        parts.append(title + "\n" * rng.randint(1, 3) + body())
+        if rng.random() < 0.3:
+            parts.append(rng.choice(["```bash\npython run.py\n```", "```\n# not a header\n```"]))
+
+    content = "\n\n".join(parts) + rng.choice(["", "\n", "\n\n  "])
+    if rng.random() < 0.05:
+        content = content.replace("\n", "\r\n")
+    return content
+
+
+def make_corpus(root: Path, count: int, seed: int) -> list:
+    """Write count synthetic skill directories under root."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        skill_path = root / f"skill-{i:05d}"
+        skill_path.mkdir()
+        (skill_path / "SKILL.md").write_text(make_skill_md(rng, skill_path.name),
+                                             encoding="utf-8", newline="")
+        paths.append(skill_path)
+    return paths
+
+
+def run(validator_class, paths: list) -> tuple:
+    """Validate every path; returns (results, seconds)."""
+    start = time.perf_counter()
+    results = []
+    for path in paths:
+        validator = validator_class(path)
+        validator.validate()
+        results.append(validator.to_dict())
+    return results, time.perf_counter() - start
+
+
+def run_checks(validator_class, contents: list) -> float:
+    """Seconds to check every content already in memory."""
+    start = time.perf_counter()
+    for content in contents:
+        validator_class(Path()).validate_content(content)
+    return time.perf_counter() - start
+
+
+def report(label: str, count: int, legacy_time: float, indexed_time: float):
+    print(f"  {label}")
+    print(f"    legacy   {legacy_time:8.3f}s  {count / legacy_time:9,.0f} skills/s")
+    print(f"    indexed  {indexed_time:8.3f}s  {count / indexed_time:9,.0f} skills/s")
+    print(f"    speedup  x{legacy_time / indexed_time:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SkillValidator against the legacy checks")
+    parser.add_argument(
+        "--skills",
+        type=int,
+        default=10000,
+        help="Number of synthetic skills (default: 10000)"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed of the corpus (default: 0)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per measurement, best time is reported (default: 3)"
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"📝 Writing {args.skills:,} synthetic skills...")
+        paths = make_corpus(Path(tmp_dir), args.skills, args.seed)
+
+        # Warm the file cache so both runs read from memory
+        run(SkillValidator, paths)
+
+        legacy, legacy_time = run(LegacySkillValidator, paths)
+        indexed, indexed_time = run(SkillValidator, paths)
+        for _ in range(args.repeat - 1):
+            legacy_time = min(legacy_time, run(LegacySkillValidator, paths)[1])
+            indexed_time = min(indexed_time, run(SkillValidator, paths)[1])
+
+        contents = [(p / "SKILL.md").read_text(encoding="utf-8") for p in paths]
+
+    mismatches = [p.name for p, a, b in zip(paths, legacy, indexed) if a != b]
+
+    print(f"\n⏱️  {len(paths):,} skills, best of {args.repeat}")
+    report("validate() incl. file reads", len(paths), legacy_time, indexed_time)
+    report("checks only", len(contents),
+           min(run_checks(LegacySkillValidator, contents) for _ in range(args.repeat)),
+           min(run_checks(SkillValidator, contents) for _ in range(args.repeat)))
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} skills validated differently, e.g. {mismatches[:5]}")
+        sys.exit(1)
+
+    print("\n✅ Both implementations report identical results")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,30 @@ Usage:
     python validate_skill.py                    # Validate all skills
     python validate_skill.py --skill stock-analysis  # Validate specific skill
     python validate_skill.py --fix               # Auto-fix issues if possible
+    python validate_skill.py --jobs 8            # Validate in 8 processes
+    python validate_skill.py --json report.json  # Also write a JSON report for CI
+    python validate_skill.py --no-cache          # Re-validate every skill
+
+Results are cached in .skill_validation_cache.json at the repository root,
+keyed on the SHA-256 of each SKILL.md and of this script, so unchanged
+skills are not re-validated until the file or the validation rules change.
 """
 
 import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Default on-disk result cache, relative to the repository root
+CACHE_FILE = ".skill_validation_cache.json"
+
+# Cache entries are only reused if this script is unchanged
+VALIDATOR_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
 
 # Required sections for SKILL.md
 REQUIRED_SECTIONS = [
@@ -44,6 +61,111 @@ OPTIONAL_SECTIONS = [
 ]
 
 
+# Patterns of the checks. Their \s may run on into the following lines, e.g.
+# a bare "##" takes the next line as its title.
+HEADER_RE = re.compile(r'^#{1,3}\s+(.+)$', re.MULTILINE)
+KEYWORD_RE = re.compile(r'^-\s*(.+)$', re.MULTILINE)
+TOOL_RE = re.compile(r'^-\s*(\w+)', re.MULTILINE)
+
+# Longest line length without a warning
+MAX_LINE_LENGTH = 120
+
+# Newline before every line that may hold a header or is too long; starting
+# with a literal newline lets the regex engine skip other lines quickly
+CANDIDATE_RE = re.compile(r'\n(?=#|[^\n]{%d})' % (MAX_LINE_LENGTH + 1))
+
+# What may follow a section title before its body
+TITLE_END_RE = re.compile(r'\s*\n')
+
+# Sections whose body is indexed
+INDEXED_SECTIONS = ["## Activation Keywords", "## Tools Used", "## Examples"]
+
+
+class SkillIndex:
+    """
+    Index of a SKILL.md, built in one pass over the lines that start with
+    '#' or are too long.
+
+    Records headers, code fences, long lines and the body of each of
+    INDEXED_SECTIONS (located by literal search for the title), so that
+    every check reads from the index instead of scanning the whole content
+    again. Results are the same as those of the
+    original per-check regexes: headers as re.findall(r'^#{1,3}\\s+(.+)$'),
+    and section bodies as re.search(r'<title>\\s*\\n(.*?)(?=\\n##|\\Z)', re.DOTALL).
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.headers: List[str] = []
+        self.long_lines: List[Tuple[int, int]] = []
+        self.has_code_block = "```" in content
+        self.sections: Dict[str, Tuple[int, int]] = {}
+
+        starts = [m.end() for m in CANDIDATE_RE.finditer(content)]
+        if content[:1] == "#" or content.find("\n") > MAX_LINE_LENGTH or (
+            "\n" not in content and len(content) > MAX_LINE_LENGTH
+        ):
+            starts.insert(0, 0)
+
+        lineno = 1
+        previous = 0
+        header_end = 0
+        for start in starts:
+            # A header match may consume following lines; findall resumes
+            # after it
+            if start >= header_end and content.startswith("#", start):
+                match = HEADER_RE.match(content, start)
+                if match:
+                    self.headers.append(match.group(1))
+                    header_end = match.end()
+
+            end = content.find("\n", start)
+            length = (end if end >= 0 else len(content)) - start
+            if length > MAX_LINE_LENGTH:
+                lineno += content.count("\n", previous, start)
+                previous = start
+                self.long_lines.append((lineno, length))
+
+        for title in INDEXED_SECTIONS:
+            self._find_section(title)
+
+    def _find_section(self, title: str) -> None:
+        """Record the body span of the first title followed by whitespace and a newline."""
+        content = self.content
+        position = content.find(title)
+        while position >= 0:
+            match = TITLE_END_RE.match(content, position + len(title))
+            if match:
+                body_start = match.end()
+                body_end = content.find("\n##", body_start)
+                if body_end < 0:
+                    body_end = len(content)
+                self.sections[title] = (body_start, body_end)
+                return
+            position = content.find(title, position + 1)
+
+    def section_text(self, title: str) -> Optional[str]:
+        """Body of a section, or None if the section is missing."""
+        span = self.sections.get(title)
+        if span is None:
+            return None
+        return self.content[span[0]:span[1]]
+
+    def list_items(self, title: str, pattern: re.Pattern) -> Optional[List[str]]:
+        """
+        First group of every match of pattern in a section body, as
+        pattern.findall(section_text(title)) would return them.
+
+        Returns:
+            List of matches, or None if the section is missing
+        """
+        span = self.sections.get(title)
+        if span is None:
+            return None
+
+        return [m.group(1) for m in pattern.finditer(self.content, *span)]
+
+
 class SkillValidator:
     """Validator for SKILL.md files."""
 
@@ -60,70 +182,86 @@ class SkillValidator:
             self.errors.append(f"SKILL.md not found at {self.skill_md}")
             return False
 
-        content = self.skill_md.read_text(encoding="utf-8")
+        return self.validate_content(self.skill_md.read_text(encoding="utf-8"))
+
+    def validate_content(self, content: str) -> bool:
+        """Validate SKILL.md content. Returns True if valid."""
+        index = SkillIndex(content)
 
         # Check required sections
-        self._check_sections(content)
+        self._check_sections(index)
 
         # Check format
-        self._check_format(content)
+        self._check_format(index)
 
         # Check activation keywords
-        self._check_activation_keywords(content)
+        self._check_activation_keywords(index)
 
         # Check tools used
-        self._check_tools(content)
+        self._check_tools(index)
 
         # Check examples
-        self._check_examples(content)
+        self._check_examples(index)
 
         return len(self.errors) == 0
 
-    def _check_sections(self, content: str) -> None:
+    def content_hash(self) -> Optional[str]:
+        """SHA-256 of SKILL.md, or None if it does not exist."""
+        if not self.skill_md.exists():
+            return None
+        return hashlib.sha256(self.skill_md.read_bytes()).hexdigest()
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Validation messages as a JSON-serializable dict."""
+        return {
+            "errors": list(self.errors),
+            "warnings": list(self.warnings),
+            "info": list(self.info),
+        }
+
+    def load_dict(self, result: Dict[str, List[str]]) -> None:
+        """Restore validation messages from to_dict() output."""
+        self.errors = list(result.get("errors", []))
+        self.warnings = list(result.get("warnings", []))
+        self.info = list(result.get("info", []))
+
+    def _check_sections(self, index: SkillIndex) -> None:
         """Check for required sections."""
-        found_sections = set()
-
-        # Extract all headers
-        headers = re.findall(r'^#{1,3}\s+(.+)$', content, re.MULTILINE)
-        found_sections = set(headers)
+        # Headers never contain a newline, so one substring search over the
+        # joined headers tells whether any header contains a name
+        found_sections = "\n".join(index.headers).lower()
 
         # Check required sections
         for required in REQUIRED_SECTIONS:
             # Match loosely - just check if the section exists
-            required_pattern = required.replace("# ", "").replace("## ", "")
-            if not any(required_pattern.lower() in h.lower() for h in found_sections):
+            required_pattern = required.replace("# ", "").replace("## ", "").lower()
+            if required_pattern not in found_sections:
                 self.errors.append(f"Missing required section: {required}")
 
         # Report optional sections found
         for optional in OPTIONAL_SECTIONS:
-            optional_pattern = optional.replace("## ", "")
-            if any(optional_pattern.lower() in h.lower() for h in found_sections):
+            optional_pattern = optional.replace("## ", "").lower()
+            if optional_pattern in found_sections:
                 self.info.append(f"Has optional section: {optional}")
 
-    def _check_format(self, content: str) -> None:
+    def _check_format(self, index: SkillIndex) -> None:
         """Check format compliance."""
-        lines = content.split('\n')
-
         # Check for very long lines
-        for i, line in enumerate(lines, 1):
-            if len(line) > 120:
-                self.warnings.append(f"Line {i} exceeds 120 characters ({len(line)} chars)")
+        for i, length in index.long_lines:
+            self.warnings.append(
+                f"Line {i} exceeds {MAX_LINE_LENGTH} characters ({length} chars)"
+            )
 
         # Check for proper code blocks
-        code_blocks = re.findall(r'```(\w*)', content)
-        if not code_blocks:
+        if not index.has_code_block:
             self.warnings.append("No code blocks found - examples may need code blocks")
 
-    def _check_activation_keywords(self, content: str) -> None:
+    def _check_activation_keywords(self, index: SkillIndex) -> None:
         """Check activation keywords section."""
-        # Find Activation Keywords section
-        match = re.search(r'## Activation Keywords\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if not match:
+        keywords = index.list_items("## Activation Keywords", KEYWORD_RE)
+        if keywords is None:
             return
 
-        keywords_text = match.group(1)
-        keywords = re.findall(r'^-\s*(.+)$', keywords_text, re.MULTILINE)
-
         if len(keywords) < 3:
             self.warnings.append(f"Only {len(keywords)} activation keywords - recommend 5-10")
 
@@ -142,15 +280,12 @@ class SkillValidator:
             if not has_chinese and not has_english:
                 self.warnings.append("Consider adding both Chinese and English keywords")
 
-    def _check_tools(self, content: str) -> None:
+    def _check_tools(self, index: SkillIndex) -> None:
         """Check Tools Used section."""
-        match = re.search(r'## Tools Used\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if not match:
+        tools = index.list_items("## Tools Used", TOOL_RE)
+        if tools is None:
             return
 
-        tools_text = match.group(1)
-        tools = re.findall(r'^-\s*(\w+)', tools_text, re.MULTILINE)
-
         if len(tools) == 0:
             self.errors.append("No tools listed in Tools Used section")
 
@@ -163,14 +298,12 @@ class SkillValidator:
             if tool.lower() not in [v.lower() for v in valid_tools]:
                 self.warnings.append(f"Uncommon tool: '{tool}' - verify it's valid")
 
-    def _check_examples(self, content: str) -> None:
+    def _check_examples(self, index: SkillIndex) -> None:
         """Check Examples section."""
-        match = re.search(r'## Examples\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if not match:
+        examples_text = index.section_text("## Examples")
+        if examples_text is None:
             return
 
-        examples_text = match.group(1)
-
         # Check for example blocks
         has_user = "User:" in examples_text or "用户" in examples_text
         has_agent = "Agent:" in examples_text or "代理" in examples_text
@@ -205,25 +338,117 @@ class SkillValidator:
         return "\n".join(lines)
 
 
-def validate_all_skills(skills_dir: Path) -> Dict[str, SkillValidator]:
-    """Validate all skills in the collection."""
+def _validate_result(skill_path: Path) -> Dict[str, List[str]]:
+    """Validate one skill and return its messages (process pool worker)."""
+    validator = SkillValidator(skill_path)
+    validator.validate()
+    return validator.to_dict()
+
+
+def load_cache(cache_path: Optional[Path]) -> Dict[str, dict]:
+    """Load the result cache, discarding it if unreadable or from another validator version."""
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != VALIDATOR_VERSION:
+        return {}
+    return data.get("skills", {})
+
+
+def save_cache(cache_path: Path, entries: Dict[str, dict]) -> None:
+    """Write the result cache atomically."""
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"version": VALIDATOR_VERSION, "skills": entries}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def validate_all_skills(
+    skills_dir: Path, jobs: int = 1, cache_path: Optional[Path] = None
+) -> Dict[str, SkillValidator]:
+    """
+    Validate all skills in the collection.
+
+    Skills whose SKILL.md hash matches the cache are restored from it; the
+    rest are validated, in a process pool if jobs > 1.
+
+    Args:
+        skills_dir: Directory containing one directory per skill
+        jobs: Number of worker processes (1 = validate serially)
+        cache_path: Result cache file, or None to disable caching
+    """
     validators = {}
 
     if not skills_dir.exists():
         print(f"❌ Skills directory not found: {skills_dir}")
         return validators
 
-    for skill_path in skills_dir.iterdir():
+    cache = load_cache(cache_path)
+    entries = {}
+    pending = []
+
+    for skill_path in sorted(skills_dir.iterdir()):
         if not skill_path.is_dir():
             continue
 
         validator = SkillValidator(skill_path)
-        validator.validate()
         validators[skill_path.name] = validator
+        digest = validator.content_hash()
+        cached = cache.get(skill_path.name)
+        if digest is not None and cached and cached.get("hash") == digest:
+            validator.load_dict(cached["result"])
+            entries[skill_path.name] = cached
+        else:
+            pending.append((validator, digest))
+
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            results = executor.map(
+                _validate_result, [v.skill_path for v, _ in pending], chunksize=8
+            )
+            for (validator, _), result in zip(pending, results):
+                validator.load_dict(result)
+    else:
+        for validator, _ in pending:
+            validator.validate()
+
+    for validator, digest in pending:
+        if digest is not None:
+            entries[validator.skill_path.name] = {"hash": digest, "result": validator.to_dict()}
+
+    if cache_path is not None and (pending or len(entries) != len(cache)):
+        try:
+            save_cache(cache_path, entries)
+        except OSError as e:
+            print(f"⚠️  Could not write validation cache: {e}")
 
     return validators
 
 
+def write_json_report(validators: Dict[str, SkillValidator], output_path: str) -> None:
+    """Write validation results as JSON for CI (use '-' for stdout)."""
+    skills = {
+        name: {"valid": not v.errors, **v.to_dict()}
+        for name, v in sorted(validators.items())
+    }
+    report = {
+        "validator_version": VALIDATOR_VERSION,
+        "total": len(skills),
+        "valid": sum(1 for s in skills.values() if s["valid"]),
+        "skills": skills,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output_path == "-":
+        print(text)
+    else:
+        Path(output_path).write_text(text + "\n", encoding="utf-8")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Validate OpenClaw skills")
     parser.add_argument(
@@ -236,12 +461,32 @@ def main():
         action="store_true",
         help="Auto-fix issues if possible (experimental)"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for validating all skills, 0 = one per CPU (default: 1)"
+    )
+    parser.add_argument(
+        "--json",
+        type=str,
+        metavar="FILE",
+        help="Write a JSON report to FILE ('-' for stdout, replacing the text report)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Ignore and do not update the result cache ({CACHE_FILE})"
+    )
 
     args = parser.parse_args()
 
     # Find skills directory
     script_dir = Path(__file__).parent
     skills_dir = script_dir.parent / "collection" / "skills"
+    cache_path = None if args.no_cache else script_dir.parent / CACHE_FILE
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    quiet = args.json == "-"
 
     if args.skill:
         # Validate specific skill
@@ -252,12 +497,21 @@ def main():
 
         validator = SkillValidator(skill_path)
         validator.validate()
-        print(validator.report())
+        if args.json:
+            write_json_report({skill_path.name: validator}, args.json)
+        if not quiet:
+            print(validator.report())
         sys.exit(0 if len(validator.errors) == 0 else 1)
     else:
         # Validate all skills
-        print("🔍 Validating all skills...\n")
-        validators = validate_all_skills(skills_dir)
+        if not quiet:
+            print("🔍 Validating all skills...\n")
+        validators = validate_all_skills(skills_dir, jobs=jobs, cache_path=cache_path)
+
+        if args.json:
+            write_json_report(validators, args.json)
+        if quiet:
+            sys.exit(0 if all(not v.errors for v in validators.values()) else 1)
 
         # Print reports
         for name, validator in sorted(validators.items()):